@@ -0,0 +1,135 @@
+"""
+LEDマトリクス描画経路のベンチマーク
+
+adafruit_ht16k33 の1ピクセル単位の描画 (pixel() / __setitem__) と、
+ShadowMatrix8x8x2 の表示RAM一括操作 (fill / set_column / blit) の
+所要時間を同じフレーム内容で比較します。
+
+実機 (CIRCUITPY に games と benchmarks をコピーした状態) の REPL から実行します:
+    >>> from benchmarks import matrix_backend
+    >>> matrix_backend.main()
+"""
+
+import time
+
+ITERATIONS = 200  # 各ケースの繰り返し回数
+
+
+def _measure_us(func, iterations: int) -> float:
+    """funcを繰り返し実行し、1回あたりの平均所要時間 (マイクロ秒) を返す"""
+    start = time.monotonic_ns()
+    for _ in range(iterations):
+        func()
+    return (time.monotonic_ns() - start) / iterations / 1000
+
+
+def _cases(matrix):
+    """(ケース名, adafruit経由の描画, 一括描画) のリストを作成する"""
+    green = matrix.LED_GREEN
+    red = matrix.LED_RED
+
+    def fill_pixels():
+        for y in range(8):
+            for x in range(8):
+                matrix.pixel(x, y, green)
+
+    def fill_bulk():
+        matrix.fill(green)
+
+    def halves_pixels():
+        for x in range(0, 4):
+            for y in range(8):
+                matrix[x, y] = green
+        for x in range(4, 8):
+            for y in range(8):
+                matrix[x, y] = red
+
+    def halves_bulk():
+        for x in range(0, 4):
+            matrix.set_column(x, green)
+        for x in range(4, 8):
+            matrix.set_column(x, red)
+
+    def border_pixels():
+        for x in range(8):
+            matrix[x, 0] = red
+            matrix[x, 7] = red
+        for y in range(8):
+            matrix[0, y] = red
+            matrix[7, y] = red
+
+    def border_bulk():
+        for x in range(1, 7):
+            matrix.set_column(x, red, 0x81)
+        matrix.set_column(0, red)
+        matrix.set_column(7, red)
+
+    frame = bytes(matrix.ram)
+
+    def frame_pixels():
+        for x in range(8):
+            for y in range(8):
+                matrix[x, y] = (frame[2 * x] >> y & 0x01) << 1 | (
+                    frame[2 * x + 1] >> y & 0x01
+                )
+
+    def frame_bulk():
+        matrix.blit(frame)
+
+    return [
+        ("fill", fill_pixels, fill_bulk),
+        ("halves", halves_pixels, halves_bulk),
+        ("border", border_pixels, border_bulk),
+        ("frame", frame_pixels, frame_bulk),
+    ]
+
+
+def run(matrix, iterations: int = ITERATIONS):
+    """
+    ベンチマークを実行して結果を表示する
+
+    Args:
+        matrix: ShadowMatrix8x8x2 インスタンス
+        iterations: 各ケースの繰り返し回数
+
+    Returns:
+        list: (ケース名, adafruit経由の所要時間us, 一括描画の所要時間us) のリスト
+    """
+    results = []
+    for name, pixel_path, bulk_path in _cases(matrix):
+        pixel_us = _measure_us(pixel_path, iterations)
+        bulk_us = _measure_us(bulk_path, iterations)
+        results.append((name, pixel_us, bulk_us))
+
+    # I2C転送: フレーム全体の転送と、変化がない場合 (差分転送で省略) の比較
+    def show_full():
+        matrix.invalidate()
+        matrix.show()
+
+    results.append(
+        (
+            "show",
+            _measure_us(show_full, iterations),
+            _measure_us(matrix.show, iterations),
+        )
+    )
+
+    print(f"{'case':<8}{'adafruit[us]':>14}{'bulk[us]':>12}{'ratio':>8}")
+    for name, pixel_us, bulk_us in results:
+        ratio = pixel_us / bulk_us if bulk_us > 0 else 0.0
+        print(f"{name:<8}{pixel_us:>14.1f}{bulk_us:>12.1f}{ratio:>7.1f}x")
+
+    matrix.fill(matrix.LED_OFF)
+    matrix.show()
+    return results
+
+
+def main():
+    """実機のLEDマトリクスでベンチマークを実行する"""
+    from games.device_manager import DeviceManager
+
+    run(DeviceManager().matrix)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,62 +1,249 @@
+from games.clock import Clock
+
+BOOT_CLOCK = Clock()
+BOOT_START = BOOT_CLOCK.now()  # 起動時間の計測開始 (他のモジュールのインポート前)
+
+import gc
 import time
 
 import board
 import rotaryio
 
 from games.device_manager import DeviceManager
-from games.selector import GameSelector
+from games.fixed_timestep import FixedTimestep
+from games.selector import GameEntry, GameSelector
+from games.selector.game_registry import mem_free
 
-from games.bouncing_ball import BouncingBallGame
-from games.falling_dot import FallingDotGame
-from games.breakout import BreakoutGame
-from games.bomb_defuse import BombDefuseGame
-from games.jump_runner import JumpRunnerGame
-
-FPS = 50  # フレームレート
+FPS = 50  # フレームレート (ゲームロジックの1秒あたりのステップ数)
+MAX_CATCH_UP_STEPS = 5  # 処理落ち時に1フレームで進める最大ステップ数
+OVERRUN_REPORT_INTERVAL = 10  # 処理落ち回数を報告する間隔 (秒)
+I2C_STATS_REPORT_INTERVAL = 0  # I2Cバスの転送量を報告する間隔 (秒、0なら報告しない)
+FRAME_PROFILE_INTERVAL = 0  # フレームのフェーズ別所要時間を報告する間隔 (秒、0なら計測しない)
+GC_MIN_FREE_HEAP = 64 * 1024  # 空きヒープがこれを下回ったらフレームの待機時間にGCを行う (バイト、0なら行わない)
+INPUT_RECORD_EVENTS = 0  # 記録する入力イベント数の上限 (リングバッファ、0なら記録しない)
+INPUT_RECORD_FILE = "input.log"  # 終了時に入力ログを保存するファイル (書き込めなければシリアルに出力)
+INPUT_REPLAY_FILE = None  # 指定すると実際の入力の代わりにこの入力ログを再生する
+USE_KEYPAD_BUTTONS = True  # ボタンを keypad モジュールでバックグラウンドスキャンする (Falseなら Debouncer)
+ALLOC_DEBUG = False  # ゲームの更新処理での定常状態のヒープ確保を検出する (デバッグ用)
+ALLOC_DEBUG_STRICT = False  # ヒープ確保を検出したら AssertionError で停止する
 
 # ゲーム切り替え用変数
+# ゲームのモジュールは選択された時点でインポートされる
 GAME_LIST = [
-    BouncingBallGame,
-    FallingDotGame,
-    BreakoutGame,
-    BombDefuseGame,
-    JumpRunnerGame,
+    GameEntry("games.bouncing_ball", "BouncingBallGame", "Bouncing Ball"),
+    GameEntry("games.falling_dot", "FallingDotGame", "Falling Dot"),
+    GameEntry("games.breakout", "BreakoutGame", "Breakout"),
+    GameEntry("games.bomb_defuse", "BombDefuseGame", "Bomb Defuse"),
+    GameEntry("games.jump_runner", "JumpRunnerGame", "Jump Runner"),
 ]
 GAME_INDEX = 4
+UNLOAD_GAME_MODULES = False  # ゲームを破棄した時にそのゲームのモジュールをアンロードするか
+GAME_POOL_SIZE = 2  # 切り替え前のゲームを一時停止したまま保持する最大数
+GAME_POOL_MIN_FREE_HEAP = 32 * 1024  # 空きヒープがこれを下回ったらプールから破棄する (バイト)
+RANDOM_SEED = None  # ゲームの乱数のシード (指定すると同じ操作で同じプレイを再現できる)
+
+
+def _ignore_phase(phase):
+    return phase
+
+
+def _ignore_frame():
+    pass
+
+
+def _ignore_input_frame():
+    pass
 
 
 def main():
     """
     Raspberry Pi Pico用のLEDディスプレイゲームのメインループ
     このスクリプトは、ゲームの初期化、更新、描画を行い、フレームレートを制御します。
+
+    ゲームロジックは固定タイムステップで進め、処理落ちしたフレームでは
+    経過時間に応じて複数ステップを進めてから1回だけ描画します。
     """
 
     # デバイス (LED, 7セグ, ボタン等) を初期化
-    devices = DeviceManager()
+    # (I2Cバスの転送量は報告する場合のみ集計する)
+    devices = DeviceManager(USE_KEYPAD_BUTTONS, I2C_STATS_REPORT_INTERVAL > 0)
+
+    # フレームのフェーズ別所要時間の計測 (ゲームの初期化前に有効にする)
+    profiler = None
+    if FRAME_PROFILE_INTERVAL > 0:
+        from games.frame_profiler import FrameProfiler
+
+        profiler = FrameProfiler(1000000 // FPS)
+        devices.enable_profiler(profiler)
 
     # ゲーム選択のためのロータリーエンコーダー初期化
     encoder = rotaryio.IncrementalEncoder(board.GP10, board.GP11)
 
-    # GameSelectorを初期化
-    game_selector = GameSelector(devices, encoder, GAME_LIST)
-    game_selector.initialize()
+    # 入力の記録・再生 (ゲームの初期化前にボタンとエンコーダーを差し替える)
+    # 再生時にゲームの乱数列も同じになるよう、記録時のシードを入力ログに保存して使う
+    seed = RANDOM_SEED
+    input_log = None
+    end_input_frame = _ignore_input_frame
+    if INPUT_REPLAY_FILE:
+        from games.input_log import (
+            InputPlayer,
+            ReplayEncoder,
+            input_log_seed,
+            load_input_log,
+        )
+
+        data = load_input_log(INPUT_REPLAY_FILE)
+        seed = input_log_seed(data)
+        if seed is None:
+            raise ValueError(f"Input log has no random seed: {INPUT_REPLAY_FILE}")
+        input_player = InputPlayer(data)
+        devices.enable_input_replay(input_player)
+        encoder = ReplayEncoder(input_player)
+        end_input_frame = input_player.end_frame
+    elif INPUT_RECORD_EVENTS > 0:
+        from games.input_log import InputLog, RecordingEncoder
+
+        if seed is None:
+            import random
+
+            seed = random.randint(0, 0x3FFFFFFF)
+        input_log = InputLog(INPUT_RECORD_EVENTS, seed)
+        devices.enable_input_recording(input_log)
+        encoder = RecordingEncoder(encoder, input_log)
+        end_input_frame = input_log.end_frame
 
-    # 初期ゲームを設定 (必要に応じて)
-    if GAME_INDEX != 0:
-        game_selector.game_manager.change_game(GAME_INDEX)
+    # GameSelectorを初期化 (初期ゲームのモジュールだけをインポートする)
+    game_selector = GameSelector(
+        devices,
+        encoder,
+        GAME_LIST,
+        UNLOAD_GAME_MODULES,
+        GAME_POOL_SIZE,
+        GAME_POOL_MIN_FREE_HEAP,
+        seed=seed,
+    )
+    game_selector.initialize(GAME_INDEX)
+
+    # ゲームの更新処理のヒープ確保量の計測 (ゲーム開始直後の2秒間は数えない)
+    # フレームプロファイラ・I2C転送時間の計測自体もヒープを確保するため、同時には使わない
+    alloc_tracker = None
+    if ALLOC_DEBUG:
+        from games.alloc_tracker import AllocationTracker
+
+        alloc_tracker = AllocationTracker(FPS * 2, ALLOC_DEBUG_STRICT)
+        game_selector.game_manager.alloc_tracker = alloc_tracker
+
+    # ヒープが一杯になってゲームの更新処理中にGCが走らないよう、待機時間に回収する
+    gc_scheduler = None
+    if GC_MIN_FREE_HEAP > 0:
+        from games.gc_scheduler import GcScheduler
+
+        gc_scheduler = GcScheduler(GC_MIN_FREE_HEAP)
+        if not gc_scheduler.enabled:
+            gc_scheduler = None
+
+    # 起動時間と起動後の空きヒープ量を表示 (空きヒープはGC後の値、GCは起動時間に含めない)
+    boot_ms = BOOT_CLOCK.elapsed(BOOT_START)
+    gc.collect()
+    print(
+        f"Boot completed in {boot_ms} ms"
+        f" (free heap: {mem_free()} bytes, buttons: {devices.button_backend})"
+    )
+
+    # 固定タイムステップのフレームスケジューラ
+    timestep = FixedTimestep(FPS, MAX_CATCH_UP_STEPS)
+    report_frames = FPS * OVERRUN_REPORT_INTERVAL
+
+    # I2Cバスの転送量を報告する場合は show() の所要時間も計測する
+    bus_report_ms = I2C_STATS_REPORT_INTERVAL * 1000
+    if bus_report_ms > 0:
+        devices.set_bus_timer(time.monotonic_ns)
+
+    # フェーズの切り替え (計測しない場合は何もしない関数にする)
+    profile_report_frames = FPS * FRAME_PROFILE_INTERVAL
+    if profiler is not None:
+        from games.frame_profiler import (
+            PHASE_GC,
+            PHASE_OTHER,
+            PHASE_RENDER,
+            PHASE_SLACK,
+            PHASE_UPDATE,
+        )
+
+        switch_phase = profiler.switch
+        end_frame = profiler.end_frame
+        profiler.reset()
+    else:
+        # フェーズの値は使われないため、プロファイラのモジュールはインポートしない
+        PHASE_GC = PHASE_OTHER = PHASE_RENDER = PHASE_SLACK = PHASE_UPDATE = None
+        switch_phase = _ignore_phase
+        end_frame = _ignore_frame
 
     try:
         while True:
-            # ループ開始時刻を記録 (フレームレート制御用)
-            start_time = time.monotonic()
+            # 経過時間に応じた回数だけゲームロジックを進める (上限あり)
+            steps = timestep.advance()
+            switch_phase(PHASE_UPDATE)
+            for _ in range(steps):
+                # 入力はステップごとに1回だけ読み取り、ゲームはそのイベントを参照する
+                devices.input.poll()
+                game_selector.step(timestep.step_time)
+                end_input_frame()
+
+            # 描画はフレームごとに1回だけ行う (処理落ち時は途中のステップの描画を省略)
+            if steps > 0:
+                switch_phase(PHASE_RENDER)
+                game_selector.render()
+
+            # ゲームの更新処理でのヒープ確保量を1フレーム分締める
+            if alloc_tracker is not None:
+                alloc_tracker.end_frame(
+                    game_selector.game_manager.get_current_game_name()
+                )
+
+            # ディスプレイの輝度フェードを進める
+            switch_phase(PHASE_OTHER)
+            devices.update_effects()
+
+            # 処理落ちの発生状況を定期的に報告
+            if timestep.frame_count >= report_frames:
+                if timestep.overrun_count > 0:
+                    print(
+                        f"Frame overruns: {timestep.overrun_count}/{timestep.frame_count}"
+                        f" (dropped steps: {timestep.dropped_steps})"
+                    )
+                timestep.reset_stats()
+                if gc_scheduler is not None:
+                    if gc_scheduler.collections or gc_scheduler.forced:
+                        print(gc_scheduler.report())
+                    gc_scheduler.reset_stats()
+                if alloc_tracker is not None:
+                    alloc_report = alloc_tracker.report()
+                    if alloc_report:
+                        print(alloc_report)
+                    alloc_tracker.reset_stats()
+
+            # I2Cバスの転送量 (ゲームごとの内訳付き) を定期的に報告
+            if bus_report_ms > 0:
+                if devices.matrix_bus_stats.elapsed_ms() >= bus_report_ms:
+                    devices.print_bus_stats()
+                    devices.reset_bus_stats()
+
+            # フレームのフェーズ別所要時間を定期的に報告
+            if profiler is not None and profiler.frames >= profile_report_frames:
+                game_name = game_selector.game_manager.get_current_game_name()
+                print(profiler.report(game_name))
+                profiler.reset()
 
-            # GameSelectorの更新処理 (通常モードと選択モードの両方を処理)
-            game_selector.update()
+            # 待機時間に収まるようであればGCを行う
+            if gc_scheduler is not None:
+                switch_phase(PHASE_GC)
+                gc_scheduler.collect_if_due(timestep.remaining_ms())
 
-            # フレームレート維持のための待機時間計算
-            elapsed = time.monotonic() - start_time
-            sleep_time = max(0, (1.0 / FPS) - elapsed)
-            time.sleep(sleep_time)
+            # 次のステップの時刻まで待機
+            switch_phase(PHASE_SLACK)
+            timestep.sleep()
+            end_frame()
     except KeyboardInterrupt:
         # シリアルモニターからCtrl+C等で終了した場合の処理
         pass
@@ -64,6 +251,8 @@ def main():
         # ゲーム終了時の後処理 (画面クリア等)
         if game_selector.game_manager.current_game:
             game_selector.game_manager.current_game.finalize()
+        if input_log is not None:
+            input_log.save(INPUT_RECORD_FILE)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,106 @@
+import gc
+
+
+class AllocationTracker:
+    """
+    ゲームの更新処理でのヒープ確保量を gc.mem_alloc() の差分で記録するデバッグ用クラス
+
+    GameManager がゲームの step() / render() の前後で begin() / end() を呼び出し、
+    メインループが end_frame() で1フレーム分を締めます。ゲームの開始 (切り替え) 直後の
+    warmup_frames フレームは初期化の影響を除くため数えず、それ以降にヒープ確保が
+    あったフレームを「定常状態での確保」として記録します。strict が True の場合は
+    その時点で AssertionError を送出します。ゲームが状態遷移を出力したフレーム
+    (Game.log_event()) は skip_frame() で計測の対象から外します。
+
+    フレームプロファイラやI2C転送時間の計測と同時に有効にすると、
+    それらの計測処理によるヒープ確保も数えられるため、単独で使ってください。
+    """
+
+    def __init__(self, warmup_frames: int = 100, strict: bool = False, mem_alloc=None):
+        """
+        Args:
+            warmup_frames: ゲーム開始直後に記録しないフレーム数
+            strict: 定常状態でヒープ確保があった場合に AssertionError を送出する
+            mem_alloc: 確保済みヒープ量を返す関数 (省略時は gc.mem_alloc)
+        """
+        self.warmup_frames = warmup_frames
+        self.strict = strict
+        if mem_alloc is None:
+            mem_alloc = getattr(gc, "mem_alloc", None)
+            if mem_alloc is None:
+                raise RuntimeError("gc.mem_alloc() is not available")
+        self._mem_alloc = mem_alloc
+        self._start = 0
+        self._frame_bytes = 0
+        self._skip_frame = False
+        self._label = None
+        self._game_frames = 0
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        """報告用の集計をクリアする"""
+        self.frames = 0
+        self.event_frames = 0
+        self.allocating_frames = 0
+        self.total_bytes = 0
+        self.max_bytes = 0
+        self.allocating_label = None  # 最後にヒープ確保があったゲームの名前
+
+    def begin(self) -> None:
+        """計測区間の開始"""
+        self._start = self._mem_alloc()
+
+    def end(self) -> None:
+        """計測区間の終了 (区間内の確保量を現在のフレームに加算する)"""
+        delta = self._mem_alloc() - self._start
+        # 区間内でGCが走った場合は確保済み量が減るため、その区間は数えない
+        if delta > 0:
+            self._frame_bytes += delta
+
+    def skip_frame(self) -> None:
+        """現在のフレームを計測の対象から外す (ゲームの状態遷移があったフレーム)"""
+        self._skip_frame = True
+
+    def end_frame(self, label: str) -> None:
+        """
+        1フレーム分の計測を締める
+
+        Args:
+            label: 計測中のゲームの名前 (変わった時点で新しいゲームとして数え直す)
+        """
+        if label is not self._label:
+            self._label = label
+            self._game_frames = 0
+        self._game_frames += 1
+        allocated = self._frame_bytes
+        self._frame_bytes = 0
+        skip_frame = self._skip_frame
+        self._skip_frame = False
+        if self._game_frames <= self.warmup_frames:
+            return
+        if skip_frame:
+            self.event_frames += 1
+            return
+
+        self.frames += 1
+        if allocated > 0:
+            self.allocating_frames += 1
+            self.allocating_label = label
+            self.total_bytes += allocated
+            if allocated > self.max_bytes:
+                self.max_bytes = allocated
+            if self.strict:
+                raise AssertionError(
+                    f"{label} allocated {allocated} bytes in frame {self._game_frames}"
+                )
+
+    def report(self) -> str:
+        """集計結果を表示用の文字列にする (定常状態での確保がなければ空文字列)"""
+        if self.allocating_frames == 0:
+            return ""
+        return (
+            f"Steady-state allocation in {self.allocating_label}:"
+            f" {self.allocating_frames}/{self.frames} frames"
+            f" ({self.event_frames} event frames skipped),"
+            f" {self.total_bytes} bytes (max {self.max_bytes} bytes/frame)"
+        )
@@ -1,6 +1,5 @@
-import time
-import random
 from games.game_interface import Game
+from games.input_events import BUTTON_A, BUTTON_B
 
 
 class GameState:
@@ -13,74 +12,58 @@ class GameState:
 
 
 class BombDefuseGame(Game):
+    # 残り時間の1秒ごとのデバッグ出力 (出力する文字列を毎秒作成するため、既定では出力しない)
+    PRINT_COUNTDOWN = False
+
     class Timer:
         """
         高精度時間管理のための内部クラス
-        time.monotonic()を使用した正確な時間計測と一時停止・再開機能を提供
+        Clock の整数ティック値を使用した正確な時間計測を提供
+        (ゲームの一時停止中はゲーム内時間 (GameClock) が止まるため、タイマー側での補正は不要)
         """
 
-        def __init__(self, initial_time: float):
+        def __init__(self, initial_time: int, clock):
             """
             タイマーを初期化
 
             Args:
-                initial_time: 初期制限時間（秒）
+                initial_time: 初期制限時間（ミリ秒）
+                clock: 時刻の取得に使うクロック
             """
+            self.clock = clock
             self.initial_time = initial_time
             self.remaining_time = initial_time
             self.start_time = None
-            self.pause_time = None
             self.is_running = False
-            self.is_paused = False
 
         def start(self):
             """
             タイマーを開始
             現在時刻を記録してカウントダウンを開始
             """
-            self.start_time = time.monotonic()
+            self.start_time = self.clock.now()
             self.is_running = True
-            self.is_paused = False
-            self.pause_time = None
 
-        def pause(self):
-            """
-            タイマーを一時停止
-            現在の残り時間を保存して時間の進行を停止
+        def stop(self):
             """
-            if self.is_running and not self.is_paused:
-                current_time = time.monotonic()
-                elapsed = current_time - self.start_time
-                self.remaining_time = max(0, self.initial_time - elapsed)
-                self.is_paused = True
-                self.pause_time = current_time
-
-        def resume(self):
+            タイマーを停止
+            現在の残り時間を保存してカウントダウンを終了
             """
-            タイマーを再開
-            一時停止前の残り時間から再開
-            """
-            if self.is_running and self.is_paused:
-                # 新しい開始時刻を設定（残り時間を考慮）
-                current_time = time.monotonic()
-                self.start_time = current_time - (
-                    self.initial_time - self.remaining_time
-                )
-                self.is_paused = False
-                self.pause_time = None
+            if self.is_running:
+                self.update()
+                self.is_running = False
 
-        def update(self) -> float:
+        def update(self) -> int:
             """
             タイマーを更新して現在の残り時間を返す
 
             Returns:
-                float: 現在の残り時間（秒）、0以下の場合は0
+                int: 現在の残り時間（ミリ秒）、0以下の場合は0
             """
-            if not self.is_running or self.is_paused or self.start_time is None:
+            if not self.is_running or self.start_time is None:
                 return self.remaining_time
 
-            current_time = time.monotonic()
-            elapsed = current_time - self.start_time
+            elapsed = self.clock.elapsed(self.start_time)
             self.remaining_time = max(0, self.initial_time - elapsed)
             return self.remaining_time
 
@@ -93,19 +76,17 @@ class BombDefuseGame(Game):
             """
             return self.update() <= 0
 
-        def reset(self, new_time: float):
+        def reset(self, new_time: int):
             """
             タイマーを新しい時間でリセット
 
             Args:
-                new_time: 新しい制限時間（秒）
+                new_time: 新しい制限時間（ミリ秒）
             """
             self.initial_time = new_time
             self.remaining_time = new_time
             self.start_time = None
-            self.pause_time = None
             self.is_running = False
-            self.is_paused = False
 
     class VisualEffects:
         """
@@ -114,7 +95,8 @@ class BombDefuseGame(Game):
         """
 
         # 爆弾本体のパターン（導火線の燃え代 FUSE_TRAIL は含まない）
-        BOMB_BODY_PATTERN = [
+        # フレームキャッシュのキーとして使うため、パターンはすべてタプルで定義する
+        BOMB_BODY_PATTERN = (
             (3, 2),
             (4, 2),  # 導火線の付け根
             (2, 3),
@@ -131,77 +113,188 @@ class BombDefuseGame(Game):
             (5, 5),  # 爆弾本体下部
             (3, 6),
             (4, 6),  # 爆弾本体底部
-        ]
+        )
 
         # 導火線の燃え代（未燃焼部分）。手前(爆弾に近い側)から先端の順に並べる。
         # 残り時間の割合に応じて先端から燃え尽きて短くなっていく。
-        FUSE_TRAIL = [(4, 1), (4, 0)]
+        FUSE_TRAIL = ((4, 1), (4, 0))
+
+        # 爆発パターン（全画面に赤色で爆発を表現）
+        # 中央から外側に向かって爆発が広がるイメージ
+        EXPLOSION_PATTERN = (
+            # 中央部（最も明るい）
+            (3, 3),
+            (4, 3),
+            (3, 4),
+            (4, 4),
+            # 内側の爆発
+            (2, 2),
+            (5, 2),
+            (2, 5),
+            (5, 5),
+            (1, 3),
+            (6, 3),
+            (3, 1),
+            (4, 1),
+            (3, 6),
+            (4, 6),
+            # 外側の爆発
+            (0, 0),
+            (7, 0),
+            (0, 7),
+            (7, 7),
+            (1, 1),
+            (6, 1),
+            (1, 6),
+            (6, 6),
+            (0, 3),
+            (7, 3),
+            (0, 4),
+            (7, 4),
+            (3, 0),
+            (4, 0),
+            (3, 7),
+            (4, 7),
+        )
 
-        def __init__(self, matrix):
+        # 成功パターン（緑色でチェックマークや星を表現）
+        SUCCESS_PATTERN = (
+            # チェックマークの形
+            (2, 4),
+            (3, 5),
+            (4, 4),
+            (5, 3),
+            (6, 2),
+            # 周囲の装飾
+            (1, 1),
+            (6, 1),
+            (1, 6),
+            (6, 6),
+            (0, 3),
+            (7, 3),
+            (3, 0),
+            (4, 0),
+            (3, 7),
+            (4, 7),
+        )
+
+        # ワイヤーカラーヒントの左半分（Aボタン側）・右半分（Bボタン側）
+        WIRE_LEFT_PATTERN = tuple((x, y) for x in range(0, 4) for y in range(8))
+        WIRE_RIGHT_PATTERN = tuple((x, y) for x in range(4, 8) for y in range(8))
+
+        # 導火線の段階 (残り時間の割合で決まる)
+        FUSE_BURNT = 0  # 残り20%以下: 燃え尽きて爆弾本体ごと点滅
+        FUSE_SHORT = 1  # 残り50%以下: 先端の1本だけ速く点滅
+        FUSE_FULL = 2  # それ以上: 全部表示して先端がゆっくり点滅
+
+        def __init__(self, matrix, frame_cache, effects, clock, on_change=None):
             """
             VisualEffects を初期化
 
             Args:
                 matrix: LED マトリクスオブジェクト
+                frame_cache: 表示RAMイメージのキャッシュ (FrameCache)
+                effects: LED マトリクスのハードウェア点滅・輝度制御 (DisplayEffects)
+                clock: 導火線の先端の点滅タイマーを登録するゲーム内時間のクロック (GameClock)
+                on_change: 点滅状態が切り替わったときに引数なしで呼び出す関数 (再描画の要求用)
             """
             self.matrix = matrix
+            self.frame_cache = frame_cache
+            self.effects = effects
+            self.clock = clock
+            self.on_change = on_change
             self.blink_state = False
-            self.last_blink_time = 0
+            # 導火線の先端の点滅タイマー (爆弾の表示中だけ登録し、周期は残り時間の割合で変わる)
+            self.blink_timer = clock.timer(self._toggle_blink)
+
+            # フレームキャッシュのキーとなるレイヤーの組を事前に作成しておく
+            red = matrix.LED_RED
+            green = matrix.LED_GREEN
+            body = (self.BOMB_BODY_PATTERN, red)
+
+            # 爆弾の表示状態ごとのレイヤー: [導火線の残り本数][先端の点滅状態]
+            # 導火線が燃え尽きた後は爆弾本体のみ (点滅はハードウェアで行う)
+            self._bomb_layers = [((), (body,))]
+            for visible_trail in range(1, len(self.FUSE_TRAIL) + 1):
+                self._bomb_layers.append(
+                    (
+                        (body, (self.FUSE_TRAIL[: visible_trail - 1], matrix.LED_YELLOW)),
+                        (body, (self.FUSE_TRAIL[:visible_trail], matrix.LED_YELLOW)),
+                    )
+                )
+            self._explosion_layers = ((self.EXPLOSION_PATTERN, red),)
+            self._success_layers = ((self.SUCCESS_PATTERN, green),)
+            # ワイヤーのヒントのレイヤー: [左半分が緑かどうか]
+            self._wire_layers = tuple(
+                ((self.WIRE_LEFT_PATTERN, left), (self.WIRE_RIGHT_PATTERN, right))
+                for left, right in ((red, green), (green, red))
+            )
+
+        def _toggle_blink(self):
+            """導火線の先端の点滅状態を切り替える (blink_timer のコールバック)"""
+            self.blink_state = not self.blink_state
+            if self.on_change is not None:
+                self.on_change()
+
+        def _blit(self, layers):
+            """
+            キャッシュ済みの表示RAMイメージを1回で描画する (転送は呼び出し側がまとめて行う)
 
-        def show_bomb(self, remaining_fraction: float = 1.0):
+            Args:
+                layers: フレームキャッシュのキーとなるレイヤーの組
+            """
+            self.matrix.blit(self.frame_cache.get(layers))
+
+        def set_fuse_level(self, level: int):
+            """
+            導火線の段階を切り替え、点滅タイマーとハードウェア点滅を設定する
+
+            ゲームロジック (step() とタイマーのコールバック) から段階が変わったときに
+            呼び出す。show_bomb() は設定済みの状態を描画するだけにするため、
+            描画が省略されたフレームがあっても点滅の開始・周期の変更は遅れない。
+
+            Args:
+                level: FUSE_BURNT (燃え尽きた) / FUSE_SHORT (残り1本) / FUSE_FULL (全部)
+            """
+            if level == self.FUSE_BURNT:
+                # 導火線が燃え尽きた後は爆弾本体ごとハードウェアで高速点滅させる
+                self.blink_timer.cancel()
+                self.effects.start_blink(self.effects.BLINK_2HZ)
+                return
+            blink_interval = 250 if level == self.FUSE_SHORT else 600
+            # 点滅はタイマーのコールバックで切り替える (周期の変更は次の切り替えから反映される)
+            self.blink_timer.interval = blink_interval
+            if not self.blink_timer.active:
+                self.blink_timer.start(blink_interval, blink_interval)
+            self.effects.stop_blink()
+
+        def stop_fuse(self):
+            """導火線の点滅タイマーとハードウェア点滅を止める (爆弾以外を表示する前に呼び出す)"""
+            self.blink_timer.cancel()
+            self.effects.stop_blink()
+
+        def show_bomb(self, level: int):
             """
             爆弾の表示。残り時間の割合に応じて導火線が先端から燃え尽きて
             短くなっていき、燃え尽きた後は爆弾本体ごと高速点滅させることで
-            爆発直前の緊迫感を演出する。
+            爆発直前の緊迫感を演出する。燃え尽きた後の点滅はHT16K33の
+            ハードウェア点滅で行うため、点滅のための再描画・転送は発生しない。
+            点滅の設定は set_fuse_level() で済ませておき、ここでは描画だけを行う。
 
             Args:
-                remaining_fraction: このステージの残り時間の割合（1.0=開始直後、0.0=時間切れ直前）
+                level: 導火線の段階 (FUSE_BURNT / FUSE_SHORT / FUSE_FULL)
 
             Requirements: 4.1, 4.4
             - LED マトリクスに爆弾の状態を表示
             - 残り時間が少なくなるほど導火線を短くし、燃え尽きたら爆弾全体を点滅させて警告を示す
             """
-            # 残り時間の割合に応じて導火線の残り本数と点滅間隔を決定
-            # （ステージごとに制限時間が変わるため、絶対秒数ではなく割合で判定する）
-            if remaining_fraction <= 0.2:
-                visible_trail = 0  # 導火線は燃え尽きた
-                blink_interval = 0.1
-            elif remaining_fraction <= 0.5:
-                visible_trail = 1
-                blink_interval = 0.25
-            else:
-                visible_trail = len(self.FUSE_TRAIL)
-                blink_interval = 0.6
-
-            current_time = time.monotonic()
-            if current_time - self.last_blink_time >= blink_interval:
-                self.blink_state = not self.blink_state
-                self.last_blink_time = current_time
-
-            self.matrix.fill(self.matrix.LED_OFF)
-
-            if visible_trail == 0:
-                # 導火線が燃え尽きた後は爆弾本体ごと高速点滅させる
-                if self.blink_state:
-                    for x, y in self.BOMB_BODY_PATTERN:
-                        if 0 <= x < 8 and 0 <= y < 8:
-                            self.matrix[x, y] = self.matrix.LED_RED
-                self.matrix.show()
+            if level == self.FUSE_BURNT:
+                self._blit(self._bomb_layers[0][1])
                 return
+            visible_trail = 1 if level == self.FUSE_SHORT else len(self.FUSE_TRAIL)
 
-            # 爆弾本体は常に表示
-            for x, y in self.BOMB_BODY_PATTERN:
-                if 0 <= x < 8 and 0 <= y < 8:
-                    self.matrix[x, y] = self.matrix.LED_RED
-
-            # 導火線の燃え残りを描画。一番先端（火がついている場所）だけ点滅させる
-            for i in range(visible_trail):
-                x, y = self.FUSE_TRAIL[i]
-                is_tip = i == visible_trail - 1
-                if not is_tip or self.blink_state:
-                    self.matrix[x, y] = self.matrix.LED_YELLOW
-
-            self.matrix.show()
+            # 爆弾本体は常に表示し、導火線の燃え残りは一番先端（火がついている場所）だけ点滅させる
+            self._blit(self._bomb_layers[visible_trail][1 if self.blink_state else 0])
 
         def show_explosion(self):
             """
@@ -210,53 +303,7 @@ class BombDefuseGame(Game):
             Requirements: 3.3
             - ゲームオーバー時に爆発を示すビジュアルエフェクトを表示
             """
-            # 爆発パターン（全画面に赤色で爆発を表現）
-            # 中央から外側に向かって爆発が広がるイメージ
-            explosion_pattern = [
-                # 中央部（最も明るい）
-                (3, 3),
-                (4, 3),
-                (3, 4),
-                (4, 4),
-                # 内側の爆発
-                (2, 2),
-                (5, 2),
-                (2, 5),
-                (5, 5),
-                (1, 3),
-                (6, 3),
-                (3, 1),
-                (4, 1),
-                (3, 6),
-                (4, 6),
-                # 外側の爆発
-                (0, 0),
-                (7, 0),
-                (0, 7),
-                (7, 7),
-                (1, 1),
-                (6, 1),
-                (1, 6),
-                (6, 6),
-                (0, 3),
-                (7, 3),
-                (0, 4),
-                (7, 4),
-                (3, 0),
-                (4, 0),
-                (3, 7),
-                (4, 7),
-            ]
-
-            # 画面をクリア
-            self.matrix.fill(self.matrix.LED_OFF)
-
-            # 爆発パターンを描画（赤色）
-            for x, y in explosion_pattern:
-                if 0 <= x < 8 and 0 <= y < 8:
-                    self.matrix[x, y] = self.matrix.LED_RED
-
-            self.matrix.show()
+            self._blit(self._explosion_layers)
 
         def show_success(self):
             """
@@ -265,37 +312,18 @@ class BombDefuseGame(Game):
             Requirements: 2.3
             - 正解ボタン押下時に成功を示すビジュアルフィードバックを表示
             """
-            # 成功パターン（緑色でチェックマークや星を表現）
-            # チェックマーク風のパターン
-            success_pattern = [
-                # チェックマークの形
-                (2, 4),
-                (3, 5),
-                (4, 4),
-                (5, 3),
-                (6, 2),
-                # 周囲の装飾
-                (1, 1),
-                (6, 1),
-                (1, 6),
-                (6, 6),
-                (0, 3),
-                (7, 3),
-                (3, 0),
-                (4, 0),
-                (3, 7),
-                (4, 7),
-            ]
-
-            # 画面をクリア
-            self.matrix.fill(self.matrix.LED_OFF)
+            self._blit(self._success_layers)
+
+        def show_wire_hint(self, left_is_green: bool):
+            """
+            ワイヤーカラーヒントの表示
 
-            # 成功パターンを描画（緑色）
-            for x, y in success_pattern:
-                if 0 <= x < 8 and 0 <= y < 8:
-                    self.matrix[x, y] = self.matrix.LED_GREEN
+            マトリクスの左半分（Aボタン側）と右半分（Bボタン側）の一方を緑、もう一方を赤で表示する。
 
-            self.matrix.show()
+            Args:
+                left_is_green: 左半分を緑 (右半分を赤) にする場合True、逆ならFalse
+            """
+            self._blit(self._wire_layers[left_is_green])
 
         def clear(self):
             """
@@ -304,17 +332,20 @@ class BombDefuseGame(Game):
             Requirements: 6.1
             - LED マトリクスをクリア
             """
+            self.stop_fuse()
             self.matrix.fill(self.matrix.LED_OFF)
             self.matrix.show()
 
-    def __init__(self, devices):
+    def __init__(self, devices, clock=None, rng=None):
         """
         ゲームの初期化
 
         Args:
             devices: DeviceManager インスタンス
+            clock: 時間計測に使うクロック (省略時は Game の既定のクロック)
+            rng: 乱数生成器 (省略時は random モジュール)
         """
-        super().__init__(devices)
+        super().__init__(devices, clock, rng)
 
         # ゲーム状態の初期化
         self.state = GameState.PLAYING
@@ -323,36 +354,46 @@ class BombDefuseGame(Game):
         self.max_stage_reached = 1
 
         # タイマー関連の設定
-        self.base_time = 10.0  # 初期制限時間（秒）
-        self.min_time = 3.0  # 最小制限時間（秒）
-        self.time_reduction = 0.2  # ステージごとの時間短縮（秒）
+        self.base_time = 10000  # 初期制限時間（ミリ秒）
+        self.min_time = 3000  # 最小制限時間（ミリ秒）
+        self.time_reduction = 200  # ステージごとの時間短縮（ミリ秒）
         self.current_stage_time = self.base_time  # 現在のステージの制限時間（火花の点滅速度計算に使用）
 
         # Timer インスタンスを初期化
-        self.timer = self.Timer(self.base_time)
+        self.timer = self.Timer(self.base_time, self.clock)
+        # 時間切れを通知するタイマー (ステージ開始ごとに登録し直す)
+        self.time_up_timer = self.clock.timer(self._on_time_up)
 
         # VisualEffects インスタンスを初期化
-        self.visual_effects = self.VisualEffects(self.matrix)
+        self.visual_effects = self.VisualEffects(
+            self.matrix,
+            self._devices.frame_cache,
+            self._devices.matrix_effects,
+            self.clock,
+            self.invalidate,
+        )
 
         # 表示効果関連
-        self.effect_timer = 0.0
-        self.success_effect_duration = 1.0  # 成功エフェクト表示時間（秒）
-        self.explosion_effect_duration = 2.0  # 爆発エフェクト表示時間（秒）
+        # エフェクトの表示時間の終了を通知するタイマー (成功時は次のステージを開始する)
+        self.effect_timer = self.clock.timer(self._on_effect_end)
+        self.effect_active = False  # 成功・爆発エフェクトの表示時間中かどうか
+        self.success_effect_duration = 1000  # 成功エフェクト表示時間（ミリ秒）
+        self.explosion_effect_duration = 2000  # 爆発エフェクト表示時間（ミリ秒）
 
         # ボタン状態管理
         self.button_pressed = False
-        self.last_button_state_a = False
-        self.last_button_state_b = False
 
         # ボタン入力待機時間（ワイヤーカラーヒント表示）の設定
         # この間は正解ボタン側のワイヤーを緑、不正解側を赤で一瞬だけ表示し、
         # ボタン入力は無視する。表示は一瞬のフラッシュにして記憶を頼りに
         # 判断させることで緊張感を出す。ステージが進むほど表示時間を短くする。
-        self.reveal_base_time = 0.5  # ヒント表示時間の初期値（秒）
-        self.reveal_min_time = 0.15  # ヒント表示時間の最小値（秒）
-        self.reveal_reduction = 0.015  # ステージごとのヒント表示時間短縮（秒）
+        self.reveal_base_time = 500  # ヒント表示時間の初期値（ミリ秒）
+        self.reveal_min_time = 150  # ヒント表示時間の最小値（ミリ秒）
+        self.reveal_reduction = 15  # ステージごとのヒント表示時間短縮（ミリ秒）
         self.input_delay_duration = self.reveal_base_time
-        self.input_delay_start_time = 0.0  # 入力待機開始時刻
+        self.input_delay_active = False  # 入力待機時間中かどうか
+        # 入力待機時間の終了を通知するタイマー
+        self.input_delay_timer = self.clock.timer(self._on_input_delay_end)
 
         # フェイク点滅（ひっかけ）の設定
         # ヒント表示の前半を逆色（フェイク）にする回があり、後半は必ず正しい色を表示する。
@@ -360,6 +401,12 @@ class BombDefuseGame(Game):
         self.fake_flicker_max_chance = 0.6
         self.fake_flicker_chance_per_stage = 0.05
         self.hint_has_fake = False
+        self.showing_fake_hint = False  # ヒントを逆色（フェイク）で表示中かどうか
+        # 残り時間の表示状態 (step() とタイマーのコールバックが更新し、render() は描画するだけ)
+        self.display_seconds = -1  # 7セグメントに表示する残り秒数 (切り上げ、未設定なら-1)
+        self.fuse_level = -1  # 導火線の段階 (VisualEffects.FUSE_*、爆弾の非表示中は-1)
+        # フェイク表示（ヒント表示の前半）の終了を通知するタイマー
+        self.fake_hint_timer = self.clock.timer(self._on_fake_hint_end)
 
     def _start_new_stage(self):
         """
@@ -373,7 +420,7 @@ class BombDefuseGame(Game):
         - ステージ進行時の制限時間計算（0.2秒ずつ短縮、最小3秒）
         """
         # ランダムに正解ボタンを選択（AまたはB）
-        self.correct_button = random.choice(["A", "B"])
+        self.correct_button = self.rng.choice(["A", "B"])
 
         # ステージに応じた制限時間を計算
         # 基本時間からステージ数に応じて時間を短縮（最小時間まで）
@@ -387,6 +434,7 @@ class BombDefuseGame(Game):
         # タイマーをリセットして新しい時間で開始
         self.timer.reset(stage_time)
         self.timer.start()
+        self.time_up_timer.start(stage_time)
 
         # ボタン押下状態をリセット（重複入力防止のため）
         self.button_pressed = False
@@ -402,16 +450,22 @@ class BombDefuseGame(Game):
             self.fake_flicker_max_chance,
             (self.current_stage - 1) * self.fake_flicker_chance_per_stage,
         )
-        self.hint_has_fake = random.random() < fake_chance
+        self.hint_has_fake = self.rng.random() < fake_chance
 
         # ボタン入力待機時間（ヒント表示）を開始
-        self.input_delay_start_time = time.monotonic()
+        self._stop_fuse_display()
+        self.input_delay_active = True
+        self.input_delay_timer.start(self.input_delay_duration)
+        self.showing_fake_hint = self.hint_has_fake
+        if self.hint_has_fake:
+            self.fake_hint_timer.start(self.input_delay_duration // 2)
 
         # ゲーム状態をプレイ中に設定
         self.state = GameState.PLAYING
+        self.invalidate()
 
-        print(
-            f"Stage {self.current_stage} started - Correct button: {self.correct_button}, Time: {stage_time:.1f}s"
+        self.log_event(
+            f"Stage {self.current_stage} started - Correct button: {self.correct_button}, Time: {stage_time / 1000:.1f}s"
         )
 
     def _is_input_delay_active(self):
@@ -421,12 +475,57 @@ class BombDefuseGame(Game):
         Returns:
             bool: 入力待機時間中の場合True、そうでなければFalse
         """
-        if self.input_delay_start_time == 0.0:
-            return False
+        return self.input_delay_active
+
+    def _on_input_delay_end(self):
+        """入力待機時間の終了 (input_delay_timer のコールバック)"""
+        self.input_delay_active = False
+        # 爆弾の表示に切り替わるため、残り時間の表示状態をここで決める
+        self._update_countdown()
+        self.invalidate()
+
+    def _on_fake_hint_end(self):
+        """フェイク表示の終了 (fake_hint_timer のコールバック、以降は正しい色を表示する)"""
+        self.showing_fake_hint = False
+        self.invalidate()
+
+    def _on_effect_end(self):
+        """
+        エフェクトの表示時間の終了 (effect_timer のコールバック)
 
-        current_time = time.monotonic()
-        elapsed = current_time - self.input_delay_start_time
-        return elapsed < self.input_delay_duration
+        成功エフェクトの後は次のステージを開始する。爆発エフェクトの後は
+        ゲーム終了状態を維持し、ゲーム選択システムが finalize() を呼び出すまで待機する。
+        """
+        self.effect_active = False
+        if self.state == GameState.SUCCESS:
+            self._start_new_stage()
+
+    def _start_effect(self, duration: int):
+        """ステージのタイマーを止め、durationミリ秒のエフェクト表示を開始する"""
+        self.timer.stop()
+        self.time_up_timer.cancel()
+        self.input_delay_timer.cancel()
+        self.fake_hint_timer.cancel()
+        self._stop_fuse_display()
+        self.effect_active = True
+        self.effect_timer.start(duration)
+        self.invalidate()
+
+    def _apply_fuse_level(self):
+        """導火線の段階に合わせて点滅タイマーとハードウェア点滅 (マトリクス・7セグメント) を設定する"""
+        self.visual_effects.set_fuse_level(self.fuse_level)
+        # 警告中 (導火線が燃え尽きた後) は7セグメントディスプレイもハードウェア点滅させる
+        seg_effects = self._devices.seg_effects
+        if self.fuse_level == self.VisualEffects.FUSE_BURNT:
+            seg_effects.start_blink(seg_effects.BLINK_2HZ)
+        else:
+            seg_effects.stop_blink()
+
+    def _stop_fuse_display(self):
+        """導火線と7セグメントの点滅を止める (爆弾以外を表示する状態に移るときに呼び出す)"""
+        self.fuse_level = -1
+        self.visual_effects.stop_fuse()
+        self._devices.seg_effects.stop_blink()
 
     def initialize(self):
         """
@@ -446,11 +545,10 @@ class BombDefuseGame(Game):
 
         # ボタン状態をリセット
         self.button_pressed = False
-        self.last_button_state_a = False
-        self.last_button_state_b = False
 
-        # エフェクトタイマーをリセット
-        self.effect_timer = 0.0
+        # 登録中のタイマー（エフェクト・点滅など）を取り消す
+        self.clock.cancel_all()
+        self.effect_active = False
 
         # タイマーを初期状態にリセット
         self.timer.reset(self.base_time)
@@ -458,9 +556,6 @@ class BombDefuseGame(Game):
         # 7セグメントディスプレイをクリアしてから初期化
         self._devices.show_text()
 
-        # LEDマトリクスに初期爆弾表示
-        self.visual_effects.show_bomb(1.0)
-
         # 最初のステージを開始（タイマーもここで初期化される）
         self._start_new_stage()
 
@@ -489,7 +584,7 @@ class BombDefuseGame(Game):
         # ボタン押下フラグを設定（重複入力防止）
         self.button_pressed = True
 
-        print(f"Button {button} pressed - Correct: {self.correct_button}")
+        self.log_event(f"Button {button} pressed - Correct: {self.correct_button}")
 
         # 正解・不正解の判定
         if button == self.correct_button:
@@ -510,20 +605,15 @@ class BombDefuseGame(Game):
         # 成功状態に移行
         self.state = GameState.SUCCESS
 
-        # タイマーを停止
-        self.timer.pause()
-
-        # 成功エフェクトを表示
-        self.visual_effects.show_success()
-
-        # エフェクトタイマーを開始
-        self.effect_timer = time.monotonic()
+        # タイマーを停止してエフェクトを開始 (成功エフェクトはrender()で表示し、
+        # 表示時間が過ぎたら effect_timer のコールバックが次のステージを開始する)
+        self._start_effect(self.success_effect_duration)
 
         # ステージを進行
         self.current_stage += 1
         self.max_stage_reached = max(self.max_stage_reached, self.current_stage)
 
-        print(f"Correct! Advancing to stage {self.current_stage}")
+        self.log_event(f"Correct! Advancing to stage {self.current_stage}")
 
     def _handle_incorrect_answer(self):
         """
@@ -535,42 +625,51 @@ class BombDefuseGame(Game):
         # ゲームオーバー状態に移行
         self.state = GameState.GAME_OVER
 
-        # タイマーを停止
-        self.timer.pause()
+        # タイマーを停止してエフェクトを開始 (爆発エフェクトはrender()で表示)
+        self._start_effect(self.explosion_effect_duration)
 
-        # 爆発エフェクトを表示
-        self.visual_effects.show_explosion()
+        self.log_event(f"Wrong button! Game Over at stage {self.current_stage}")
+        self.log_event(f"Final Score: Stage {self.max_stage_reached}")
 
-        # エフェクトタイマーを開始
-        self.effect_timer = time.monotonic()
+    def step(self, dt):
+        """
+        ゲームロジックを1ステップ進める
 
-        print(f"Wrong button! Game Over at stage {self.current_stage}")
+        一時停止中は処理をスキップし、
+        ゲーム状態に応じて入力・状態遷移を処理します。時間切れ・入力待機時間や
+        エフェクトの終了は、ポーリングせずにタイマーのコールバックで処理します。
+        描画はrender()で行います。
 
-    def update(self):
+        Args:
+            dt (float): 1ステップの時間 (秒)
         """
-        メインゲームループ処理
+        # 一時停止中は更新処理をスキップ（フレームレート制御との連携）
+        if self.is_paused:
+            return
+
+        # ゲーム状態に応じた処理を実行
+        if self.state == GameState.PLAYING:
+            # ボタン入力処理（時間切れは step() の後に time_up_timer のコールバックで判定される）
+            self._check_button_input()
+            # 残り時間の表示が変わった場合だけ再描画させる
+            self._update_countdown()
+        elif self.state == GameState.GAME_OVER:
+            # ゲームオーバー時のボタン入力をチェック（リセット機能）
+            self._check_game_over_input()
 
-        一時停止中は更新処理をスキップし、
-        ゲーム状態に応じて適切な処理を実行します。
-        フレームレート制御との連携を考慮した設計。
+    def render(self):
+        """
+        現在のゲーム状態を描画する
 
         Requirements: 4.1, 4.2, 4.3
         - LEDマトリクスに爆弾の状態を表示
         - 7セグメントディスプレイに残り時間をカウントダウン表示
         - 現在のステージ数を何らかの方法で表示
         """
-        # 一時停止中は更新処理をスキップ（フレームレート制御との連携）
         if self.is_paused:
             return
 
-        # ゲーム状態に応じた処理を実行
         if self.state == GameState.PLAYING:
-            # プレイ中の処理順序：
-            # 1. ボタン入力処理（ユーザーインタラクション）
-            self._check_button_input()
-            # 2. タイマー更新と時間切れ判定（ゲームロジック）
-            self._check_timer()
-            # 3. ディスプレイ更新（視覚フィードバック）
             self._update_display()
         elif self.state == GameState.SUCCESS:
             # 成功エフェクト処理
@@ -579,51 +678,50 @@ class BombDefuseGame(Game):
             # ゲームオーバーエフェクト処理
             self._show_game_over_effect()
 
+    def redraw(self):
+        """
+        LEDマトリクスと7セグメントディスプレイを現在のゲーム状態で描き直す
+
+        ゲームオーバーのエフェクト表示時間が過ぎた後は render() が何も描画しないため、
+        爆発エフェクトと最終スコアをここで描画する。
+        """
+        if self.state == GameState.GAME_OVER:
+            self.visual_effects.show_explosion()
+            self._devices.seg_effects.stop_blink()
+            self._devices.show_number(self.max_stage_reached, 2)
+        elif self.state == GameState.PLAYING and self.fuse_level >= 0:
+            # 一時停止中に止めたハードウェア点滅を再開する
+            self._apply_fuse_level()
+        # LEDマトリクスは次のフレームで描画・転送させる
+        self.invalidate()
+
     def _check_button_input(self):
         """
         ボタン入力をチェックして処理する
 
-        重複入力を防止するため、ボタンの状態変化を監視し、
-        押下された瞬間のみを検出する。
+        重複入力を防止するため、ボタンの状態変化のイベントを使い、
+        ボタンを離した瞬間のみを1回の操作として検出する。
         一時停止中はボタン入力を無効化する。
 
         Requirements: 5.1, 5.2
         - 一時停止中のボタン入力無効化
         """
-        # 現在のボタン状態を取得
-        # ボタンの状態を更新（デバウンス処理）
-        self.btn_a.update()
-        self.btn_b.update()
-
-        current_button_a = not self.btn_a.value  # プルアップなので反転
-        current_button_b = not self.btn_b.value  # プルアップなので反転
-
         # 一時停止中はボタン入力を無効化（リセット以外）
         if self.is_paused:
-            # 前回の状態は更新して、再開時の誤検出を防ぐ
-            self.last_button_state_a = current_button_a
-            self.last_button_state_b = current_button_b
             return
 
         # ボタン入力待機時間中はボタン入力を無効化
         if self._is_input_delay_active():
-            # 前回の状態は更新して、待機時間終了後の誤検出を防ぐ
-            self.last_button_state_a = current_button_a
-            self.last_button_state_b = current_button_b
             return
 
-        # ボタンAの押下検出（立ち下がりエッジ検出）
-        if self.last_button_state_a and not current_button_a:
+        # ボタンAの操作検出（離した瞬間）
+        if self.input.released(BUTTON_A):
             self._handle_button_press("A")
 
-        # ボタンBの押下検出（立ち下がりエッジ検出）
-        if self.last_button_state_b and not current_button_b:
+        # ボタンBの操作検出（離した瞬間）
+        if self.input.released(BUTTON_B):
             self._handle_button_press("B")
 
-        # 前回の状態を更新
-        self.last_button_state_a = current_button_a
-        self.last_button_state_b = current_button_b
-
     def _check_game_over_input(self):
         """
         ゲームオーバー時のボタン入力をチェックする
@@ -631,45 +729,67 @@ class BombDefuseGame(Game):
         左右同時押しでゲームリセット機能を提供する。
         ゲームオーバー状態でのみ呼び出される。
         """
-        # ボタンの状態を更新（デバウンス処理）
-        self.btn_a.update()
-        self.btn_b.update()
+        # 左右同時押しが検出された瞬間にリセット実行
+        if self.input.both_pressed:
+            self.initialize()
 
-        current_button_a = not self.btn_a.value  # プルアップなので反転
-        current_button_b = not self.btn_b.value  # プルアップなので反転
+    def _update_countdown(self):
+        """
+        残り時間から表示状態（7セグメントの秒数、導火線の段階）を更新し、変わったら再描画させる
 
-        # 左右同時押しでリセット
-        if current_button_a and current_button_b:
-            if not (self.last_button_state_a and self.last_button_state_b):
-                # 同時押しが検出された瞬間にリセット実行
-                self.initialize()
+        残り時間は毎ステップ変わるが、表示が変わるのは秒数や導火線の段階が
+        変わったときだけのため、そのときだけ invalidate() する。導火線の点滅の
+        開始・周期の変更もここで行うため、描画が省略されたフレームがあっても遅れない。
+        """
+        if self.state != GameState.PLAYING or self.input_delay_active:
+            return
+        remaining_time = self.timer.update()
+        if remaining_time <= 0:
+            # 同じステップの後で time_up_timer のコールバックがゲームオーバーにする
+            return
+
+        # 残り時間の割合に応じて導火線の段階を決定
+        # （ステージごとに制限時間が変わるため、絶対秒数ではなく割合で判定する。
+        #   浮動小数点数を使わないよう、割合の比較は整数の掛け算で行う）
+        total_time = self.current_stage_time
+        if remaining_time * 5 <= total_time:
+            level = self.VisualEffects.FUSE_BURNT
+        elif remaining_time * 2 <= total_time:
+            level = self.VisualEffects.FUSE_SHORT
+        else:
+            level = self.VisualEffects.FUSE_FULL
+        if level != self.fuse_level:
+            self.fuse_level = level
+            self._apply_fuse_level()
+            self.invalidate()
 
-        # 前回の状態を更新
-        self.last_button_state_a = current_button_a
-        self.last_button_state_b = current_button_b
+        # 残り時間を整数秒で表示（小数点以下切り上げで直感的な表示）
+        seconds = (remaining_time + 999) // 1000
+        if seconds != self.display_seconds:
+            # デバッグ情報（開発時の確認用、最初の表示では出力しない）
+            if self.PRINT_COUNTDOWN and self.display_seconds >= 0:
+                print(
+                    f"Stage {self.current_stage} - Time: {seconds:02d}s"
+                    + (" [WARNING]" if level == self.VisualEffects.FUSE_BURNT else "")
+                )
+            self.display_seconds = seconds
+            self.invalidate()
 
-    def _check_timer(self):
+    def _on_time_up(self):
         """
-        タイマーの状態をチェックして時間切れ判定を行う
+        時間切れの処理 (time_up_timer のコールバック)
 
         Requirements: 3.2
         - 制限時間が0になった時にゲームオーバー状態に移行
         """
-        # タイマーが期限切れかチェック
-        if self.timer.is_expired():
-            # 時間切れでゲームオーバー
-            self.state = GameState.GAME_OVER
-
-            # タイマーを停止
-            self.timer.pause()
-
-            # 爆発エフェクトを表示
-            self.visual_effects.show_explosion()
+        # 時間切れでゲームオーバー
+        self.state = GameState.GAME_OVER
 
-            # エフェクトタイマーを開始
-            self.effect_timer = time.monotonic()
+        # タイマーを停止してエフェクトを開始 (爆発エフェクトはrender()で表示)
+        self._start_effect(self.explosion_effect_duration)
 
-            print(f"Time's up! Game Over at stage {self.current_stage}")
+        self.log_event(f"Time's up! Game Over at stage {self.current_stage}")
+        self.log_event(f"Final Score: Stage {self.max_stage_reached}")
 
     def _update_display(self):
         """
@@ -688,38 +808,12 @@ class BombDefuseGame(Game):
             self._show_input_delay_display()
             return
 
-        # 残り時間を取得（タイマーの更新も同時に行う）
-        remaining_time = self.timer.update()
-
-        # 残り時間の割合を計算（ステージごとに制限時間が異なるため割合で判定する）
-        remaining_fraction = (
-            remaining_time / self.current_stage_time
-            if self.current_stage_time > 0
-            else 0.0
-        )
-        is_warning = remaining_fraction <= 0.2
-
         # LEDマトリクスに爆弾の状態を表示
-        # 残り時間の割合に応じて火花の点滅速度・色が変化する
-        self.visual_effects.show_bomb(remaining_fraction)
-
-        # 7セグメントディスプレイに残り時間をカウントダウン表示
-        # 残り時間を整数秒で表示（小数点以下切り上げで直感的な表示）
-        display_time = max(0, int(remaining_time + 0.99))  # 切り上げ処理
-
-        # 7セグメントディスプレイをクリアして時間を表示
-        self._devices.show_text(f"{display_time:02d}")  # 2桁ゼロパディング形式で表示
+        # (導火線の段階と点滅は _update_countdown() とタイマーのコールバックで設定済み)
+        self.visual_effects.show_bomb(self.fuse_level)
 
-        # デバッグ情報（開発時の確認用）
-        if hasattr(self, "_last_display_time"):
-            if abs(display_time - self._last_display_time) >= 1:
-                print(
-                    f"Stage {self.current_stage} - Time: {display_time:02d}s"
-                    + (" [WARNING]" if is_warning else "")
-                )
-                self._last_display_time = display_time
-        else:
-            self._last_display_time = display_time
+        # 7セグメントディスプレイに残り時間をカウントダウン表示 (2桁ゼロパディング形式)
+        self._devices.show_number(self.display_seconds, 2)
 
     def _show_input_delay_display(self):
         """
@@ -734,31 +828,11 @@ class BombDefuseGame(Game):
         判断する必要があり、さらにステージが進むと前半だけ逆色の「フェイク」を
         混ぜることがある（最終的に表示される色は必ず正解を示す）。
         """
-        correct_is_a = self.correct_button == "A"
-        real_left_color = self.matrix.LED_GREEN if correct_is_a else self.matrix.LED_RED
-        real_right_color = self.matrix.LED_RED if correct_is_a else self.matrix.LED_GREEN
-
+        # 正解ボタン側 (Aなら左) を緑で表示する
         # フェイク発生時は表示前半だけ逆色にし、後半で正しい色に切り替える
-        show_fake = False
-        if self.hint_has_fake:
-            elapsed = time.monotonic() - self.input_delay_start_time
-            show_fake = elapsed < (self.input_delay_duration / 2)
-
-        if show_fake:
-            left_color = real_right_color
-            right_color = real_left_color
-        else:
-            left_color = real_left_color
-            right_color = real_right_color
-
-        self.matrix.fill(self.matrix.LED_OFF)
-        for x in range(0, 4):
-            for y in range(8):
-                self.matrix[x, y] = left_color
-        for x in range(4, 8):
-            for y in range(8):
-                self.matrix[x, y] = right_color
-        self.matrix.show()
+        # (切り替えは fake_hint_timer のコールバックで行う)
+        correct_is_a = self.correct_button == "A"
+        self.visual_effects.show_wire_hint(correct_is_a != self.showing_fake_hint)
 
         # 7セグメントディスプレイに待機中を示す表示
         self._devices.show_text("--")
@@ -770,14 +844,8 @@ class BombDefuseGame(Game):
         Requirements: 2.3
         - 正解ボタン押下時に成功を示すビジュアルフィードバックを表示
         """
-        # 成功エフェクトの表示時間を管理
-        current_time = time.monotonic()
-        effect_elapsed = current_time - self.effect_timer
-
-        # エフェクト表示時間
-        success_effect_duration = self.success_effect_duration
-
-        if effect_elapsed < success_effect_duration:
+        # 表示時間が過ぎると effect_timer のコールバックが次のステージを開始する
+        if self.effect_active:
             # 成功エフェクトを表示
             self.visual_effects.show_success()
 
@@ -785,10 +853,7 @@ class BombDefuseGame(Game):
             # ステージ数を2桁で表示（例：01, 02, 03, ...）
             stage_display = self.current_stage - 1  # 完了したステージ数
 
-            self._devices.show_text(f"{stage_display:02d}")
-        else:
-            # エフェクト終了後、次のステージを開始
-            self._start_new_stage()
+            self._devices.show_number(stage_display, 2)
 
     def _show_game_over_effect(self):
         """
@@ -798,27 +863,14 @@ class BombDefuseGame(Game):
         - 爆発を示すビジュアルエフェクトを表示
         - 最終スコア（到達ステージ）を表示
         """
-        # ゲームオーバー時のボタン入力をチェック（リセット機能）
-        self._check_game_over_input()
-
-        # ゲームオーバーエフェクトの表示時間を管理
-        current_time = time.monotonic()
-        effect_elapsed = current_time - self.effect_timer
-
-        # エフェクト表示時間
-        explosion_effect_duration = self.explosion_effect_duration
-
-        if effect_elapsed < explosion_effect_duration:
+        # 表示時間が過ぎると effect_timer のコールバックが effect_active を解除する
+        if self.effect_active:
             # 爆発エフェクトを表示
             self.visual_effects.show_explosion()
 
             # 7セグメントディスプレイに最終スコア（到達ステージ）を表示
             # 到達したステージ数を2桁で表示
-            final_score = self.max_stage_reached
-
-            self._devices.show_text(f"{final_score:02d}")
-
-            print(f"Final Score: Stage {final_score}")
+            self._devices.show_number(self.max_stage_reached, 2)
         else:
             # エフェクト終了後はゲーム終了状態を維持
             # ゲーム選択システムが finalize() を呼び出すまで待機
@@ -837,6 +889,7 @@ class BombDefuseGame(Game):
         self.visual_effects.clear()
 
         # 7セグメントディスプレイをクリア
+        self._devices.seg_effects.stop_blink()
         self._devices.show_text()
 
         # 全ての内部状態を完全にリセット
@@ -847,18 +900,21 @@ class BombDefuseGame(Game):
 
         # ボタン状態をリセット
         self.button_pressed = False
-        self.last_button_state_a = False
-        self.last_button_state_b = False
 
-        # エフェクトタイマーをリセット
-        self.effect_timer = 0.0
+        # 登録中のタイマー（エフェクト・点滅など）を取り消す
+        self.clock.cancel_all()
+        self.effect_active = False
+        self.input_delay_active = False
+        self.fuse_level = -1
+        self.display_seconds = -1
 
         # タイマーを完全にリセット
         if hasattr(self, "timer") and self.timer:
             self.timer.reset(self.base_time)
 
-        # 一時停止状態もリセット（基底クラスの状態）
-        self.is_paused = False
+        # 一時停止状態もリセット（基底クラスの状態とゲーム内時間）
+        self._is_paused = False
+        self.clock.resume()
 
         print("Bomb Defuse Game finalized")
 
@@ -870,15 +926,15 @@ class BombDefuseGame(Game):
         update()メソッドでの処理をスキップする。
 
         Requirements: 5.1, 5.2
-        - タイマーを停止
+        - タイマーを停止 (基底クラスがゲーム内時間を止める)
         - 現在の表示状態を維持
         """
         # 基底クラスの一時停止処理を呼び出し
         super().pause()
 
-        # タイマーを一時停止（プレイ中の場合のみ）
-        if self.state == GameState.PLAYING and hasattr(self, "timer") and self.timer:
-            self.timer.pause()
+        # 一時停止中 (ゲーム選択中) はハードウェア点滅を止める (再開後の表示更新で再開される)
+        self.visual_effects.effects.stop_blink()
+        self._devices.seg_effects.stop_blink()
 
         print("Bomb Defuse Game paused")
 
@@ -890,14 +946,10 @@ class BombDefuseGame(Game):
         update()メソッドでの処理を正常に実行する。
 
         Requirements: 5.3, 5.4
-        - タイマーを再開
+        - タイマーを再開 (基底クラスがゲーム内時間を止めた時刻から再開する)
         - 一時停止前の状態を復元
         """
         # 基底クラスの再開処理を呼び出し
         super().resume()
 
-        # タイマーを再開（プレイ中の場合のみ）
-        if self.state == GameState.PLAYING and hasattr(self, "timer") and self.timer:
-            self.timer.resume()
-
         print("Bomb Defuse Game resumed")
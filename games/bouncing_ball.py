@@ -1,4 +1,5 @@
 from games.game_interface import Game
+from games.input_events import BUTTON_A, BUTTON_B
 
 
 class BouncingBallGame(Game):
@@ -10,84 +11,118 @@ class BouncingBallGame(Game):
         """
         ボールのクラス
         ボールの位置と速度を管理し、重力の影響を受けて跳ねる動きを実装します。
+
+        位置と速度は1ピクセルをSCALEとする固定小数点の整数で持ち、
+        毎ステップの物理演算で浮動小数点数のヒープ確保が発生しないようにします。
         """
 
+        SCALE = 100  # 1ピクセルあたりの単位数
+        BOUNCE_VY = -SCALE  # 床で跳ね返った直後の速度 (1ステップに1ピクセル上昇)
+        GRAVITY = 8  # 1ステップごとの速度の変化 (0.08ピクセル/ステップ)
+
         def __init__(self, x, y, vx, width, height):
-            self.x = x
-            self.y = y
+            """
+            Args:
+                x, y: 初期位置 (ピクセル)
+                vx: 水平方向の速度 (1ステップあたりの単位数、SCALEで1ピクセル)
+                width, height: 画面の大きさ (ピクセル)
+            """
+            self.x = x * self.SCALE
+            self.y = y * self.SCALE
             self.vx = vx
-            self.vy = -1
-            self.g = 0.08
-            self.width = width
-            self.height = height
+            self.vy = self.BOUNCE_VY
+            self.max_x = (width - 1) * self.SCALE
+            self.max_y = (height - 1) * self.SCALE
+
+        @property
+        def pixel_x(self):
+            return self.x // self.SCALE
+
+        @property
+        def pixel_y(self):
+            return self.y // self.SCALE
 
         def update(self):
-            self.vy += self.g
+            self.vy += self.GRAVITY
             self.y += self.vy
             self.x += self.vx
-            if self.x >= self.width - 1:
-                self.x = self.width - 1
+            if self.x >= self.max_x:
+                self.x = self.max_x
                 self.vx = -self.vx
             elif self.x <= 0:
                 self.x = 0
                 self.vx = -self.vx
-            if self.y >= self.height - 1:
-                self.y = self.height - 1
-                self.vy = -1
+            if self.y >= self.max_y:
+                self.y = self.max_y
+                self.vy = self.BOUNCE_VY
 
-    def __init__(self, devices):
-        super().__init__(devices)
+    def __init__(self, devices, clock=None, rng=None):
+        super().__init__(devices, clock, rng)
 
     def initialize(self):
         self.ball = self.Ball(
             x=0,
             y=self.matrix_height - 1,
-            vx=0.2,
+            vx=20,  # 0.2ピクセル/ステップ
             width=self.matrix_width,
             height=self.matrix_height,
         )
-        self.prev_x = int(self.ball.x)
-        self.prev_y = int(self.ball.y)
+        self.prev_x = self.ball.pixel_x
+        self.prev_y = self.ball.pixel_y
         self.btn_a_toggle = True
         self.btn_b_toggle = True
 
-    def update(self):
+    def step(self, dt):
         # 一時停止中は更新処理をスキップ
         if self.is_paused:
             return
 
-        # 画面をクリア
-        self.matrix.fill(self.matrix.LED_OFF)
-
-        # 残像 (前回位置) を表示
-        self.matrix[self.prev_x, self.prev_y] = self.matrix.LED_YELLOW
+        # 残像表示用に移動前の位置を保存してからボールを移動
+        last_prev_x = self.prev_x
+        last_prev_y = self.prev_y
+        self.prev_x = self.ball.pixel_x
+        self.prev_y = self.ball.pixel_y
         self.ball.update()
 
-        # 現在位置を表示
-        self.matrix[int(self.ball.x), int(self.ball.y)] = self.matrix.LED_RED
-
-        # 前回位置を更新
-        self.prev_x = int(self.ball.x)
-        self.prev_y = int(self.ball.y)
-
-        # ボタンの状態表示
-        self.btn_a.update()
-        if self.btn_a.fell:
+        # ボールは1ステップに1ピクセル未満しか動かないため、残像と現在位置の
+        # どちらかのピクセルが変わった場合だけ再描画する
+        if (
+            self.prev_x != last_prev_x
+            or self.prev_y != last_prev_y
+            or self.ball.pixel_x != self.prev_x
+            or self.ball.pixel_y != self.prev_y
+        ):
+            self.invalidate()
+
+        # ボタンを押すたびに表示を切り替える
+        if self.input.pressed(BUTTON_A):
             self.btn_a_toggle = not self.btn_a_toggle
+            self.invalidate()
 
-        self.btn_b.update()
-        if self.btn_b.fell:
+        if self.input.pressed(BUTTON_B):
             self.btn_b_toggle = not self.btn_b_toggle
+            self.invalidate()
 
-        self.matrix[7, 0] = (
-            self.matrix.LED_GREEN if self.btn_a_toggle else self.matrix.LED_OFF
-        )
-        self.matrix[0, 0] = (
-            self.matrix.LED_GREEN if self.btn_b_toggle else self.matrix.LED_OFF
-        )
+    def render(self):
+        # 一時停止中は表示を維持
+        if self.is_paused:
+            return
 
-        # 表示更新
-        self.matrix.show()
+        # 座標のタプルを作らないよう、matrix[x, y] ではなく pixel() で描画する
+        m = self.matrix
+
+        # 画面をクリア
+        m.fill(m.LED_OFF)
+
+        # 残像 (前回位置) を表示
+        m.pixel(self.prev_x, self.prev_y, m.LED_YELLOW)
+
+        # 現在位置を表示
+        m.pixel(self.ball.pixel_x, self.ball.pixel_y, m.LED_RED)
+
+        # ボタンの状態表示
+        m.pixel(7, 0, m.LED_GREEN if self.btn_a_toggle else m.LED_OFF)
+        m.pixel(0, 0, m.LED_GREEN if self.btn_b_toggle else m.LED_OFF)
 
     def pause(self):
         """
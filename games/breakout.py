@@ -1,4 +1,5 @@
 from games.game_interface import Game
+from games.input_events import BUTTON_A, BUTTON_B
 
 
 class BreakoutGame(Game):
@@ -26,10 +27,10 @@ class BreakoutGame(Game):
             if self.x > 1:  # 右端制限 (3ドットパドルの右端が画面内に収まる)
                 self.x -= 1
 
-        def get_positions(self):
-            """パドルの3ドットの座標を取得 (最適化版)"""
-            # タプルを直接返すことでリスト作成のオーバーヘッドを削減
-            return ((self.x - 1, self.y), (self.x, self.y), (self.x + 1, self.y))
+        def get_mask(self):
+            """パドルの3ドットが占める列のビットマスク (ビットxが列xに対応)"""
+            # 座標のタプルを作らず整数で返すことで、描画ごとのヒープ確保をなくす
+            return 0x07 << (self.x - 1)
 
         def get_bounce_angle(self, ball_x):
             """ボール反射角度計算 - パドルの当たった位置による角度変化"""
@@ -85,27 +86,18 @@ class BreakoutGame(Game):
             """指定された位置にこのブロックが存在するかチェック"""
             return self.is_active and self.x == int(x) and self.y == int(y)
 
-    def __init__(self, devices):
-        super().__init__(devices)
-        # メモリ最適化: 事前に計算済みの値をキャッシュ
-        self._paddle_positions_cache = None
-        self._last_paddle_x = None
-
-        # 描画最適化フラグ
-        self._force_full_refresh = False
+    def __init__(self, devices, clock=None, rng=None):
+        super().__init__(devices, clock, rng)
 
     def initialize(self):
         """ゲーム初期化処理"""
         # ゲーム状態の初期化
         self.is_running = True
-        self.score_shown = False
         self.score = 0
         self.game_state = "playing"  # "playing", "game_over", "game_clear"
 
         # パドル初期配置 (画面下部中央、Y=7)
         self.paddle = self.Paddle()
-        self._last_paddle_x = self.paddle.x
-        self._paddle_positions_cache = None
 
         # ブロック配置システム (上部3行、Y=0,1,2に24個のブロック)
         # メモリ最適化: リスト内包表記を使用してメモリ効率を向上
@@ -115,29 +107,19 @@ class BreakoutGame(Game):
         self.ball = self.Ball()
         self.ball.reset_position(self.paddle.x)
 
-        # ゲームオーバー時のリセット判定 (両ボタン同時押し検出用)
-        self._both_pressed_prev = False
-
         # スコア表示初期化
         self._update_score_display()
 
-        # 初期画面描画
-        self._force_full_refresh = True
-        self.refresh()
+        # 次のフレームで初期画面を描画させる
+        self.invalidate()
 
-    def update(self):
-        """ゲームループ処理"""
+    def step(self, dt):
+        """ゲームロジック処理 (1ステップ)"""
         # 一時停止中は更新処理をスキップ
         if self.is_paused:
             return
 
         if not self.is_running:
-            # ゲーム終了時の処理
-            if not self.score_shown:
-                self.score_shown = True
-                # ゲーム終了表示を実装
-                self._show_game_end_display()
-
             # ゲーム再開始処理 - 両ボタン同時押し検出
             self._handle_restart_input()
             return
@@ -158,61 +140,59 @@ class BreakoutGame(Game):
         if collision_occurred:  # ブロック破壊時のみスコア更新
             self._update_score_display()
 
+        # ゲームが終了したステップで1回だけ結果を出力する (終了画面はrender()で描画)
+        if not self.is_running:
+            self._report_game_end()
+
         # 変化時のみ画面更新実行
         # オブジェクトの画面上の位置変化または衝突 (ブロック破壊等) 時に画面更新
-        if (
-            objects_moved
-            or collision_occurred
-            or button_input_processed
-            or self._force_full_refresh
-        ):
-            self.refresh()
-            self._force_full_refresh = False
+        if objects_moved or collision_occurred or button_input_processed:
+            self.invalidate()
+
+    def render(self):
+        """画面描画処理 (1フレームに1回)"""
+        # 一時停止中は表示を維持
+        if self.is_paused:
+            return
+
+        if not self.is_running:
+            # ゲーム終了表示
+            self._show_game_end_display()
+            return
+
+        self.refresh()
+
+    def redraw(self):
+        """スコア表示と画面全体の再描画"""
+        self._update_score_display()
+        self.invalidate()
 
     def _handle_paddle_input_optimized(self):
         """最適化されたパドル操作の入力処理 (応答性向上)"""
-        # ボタン状態を更新 (デバウンス処理)
-        self.btn_a.update()
-        self.btn_b.update()
-
         paddle_moved = False
         prev_x = self.paddle.x
 
         # ボタンA押下でパドル左移動 (画面端制限あり)
-        if self.btn_a.fell:
+        if self.input.pressed(BUTTON_A):
             self.paddle.move_left()
             paddle_moved = self.paddle.x != prev_x
 
         # ボタンB押下でパドル右移動 (画面端制限あり)
-        if self.btn_b.fell:
+        if self.input.pressed(BUTTON_B):
             self.paddle.move_right()
             paddle_moved = self.paddle.x != prev_x
 
-        # パドル位置キャッシュの更新
-        if paddle_moved:
-            self._last_paddle_x = self.paddle.x
-            self._paddle_positions_cache = None  # キャッシュを無効化
-
         return paddle_moved
 
     def _handle_restart_input(self):
         """
         ゲーム再開始の入力処理 (両ボタン同時押し検出)
 
-        fell同士 (押した瞬間) の一致で判定すると、両ボタンの押下が
-        同一フレームに揃わない限りリセットされずタイミングがシビアに
-        なるため、代わりに「両方押されている」状態への遷移で判定する。
+        both_pressed は「両方押されている」状態への遷移で成立するため、
+        両ボタンの押下が同一フレームに揃わなくてもリセットできる。
         """
-        # ボタン状態を更新
-        self.btn_a.update()
-        self.btn_b.update()
-
-        both_pressed = not self.btn_a.value and not self.btn_b.value
-        if both_pressed and not self._both_pressed_prev:
-            self._both_pressed_prev = both_pressed
+        if self.input.both_pressed:
             self._reset_game_state()
-            return
-        self._both_pressed_prev = both_pressed
 
     def _reset_game_state(self):
         """ゲーム状態リセット処理"""
@@ -320,43 +300,39 @@ class BreakoutGame(Game):
 
     def _update_score_display(self):
         """スコア表示更新処理 (7セグメントディスプレイ)"""
-        self._devices.show_text(str(self.score))
+        self._devices.show_number(self.score)
+
+    def _report_game_end(self):
+        """ゲーム終了時の結果出力と最終スコア表示 (終了したステップで1回だけ呼び出す)"""
+        if self.game_state == "game_clear":
+            self.log_event(f"Game Clear! Score: {self.score}")
+        elif self.game_state == "game_over":
+            self.log_event(f"Game Over! Score: {self.score}")
+
+        # 最終スコア表示 (7セグメントディスプレイ)
+        self._update_score_display()
 
     def _show_game_end_display(self):
-        """ゲーム終了表示処理"""
+        """ゲーム終了表示処理 (描画のみ)"""
         # 画面をクリア
         self.matrix.fill(self.matrix.LED_OFF)
 
         if self.game_state == "game_clear":
-            # ゲームクリア時の表示
-            print(f"Game Clear! Score: {self.score}")
             # クリア時は緑色で画面全体を点滅させる
             self._show_clear_pattern()
         elif self.game_state == "game_over":
-            # ゲームオーバー時の表示
-            print(f"Game Over! Score: {self.score}")
             # ゲームオーバー時は赤色で画面全体を点滅させる
             self._show_game_over_pattern()
 
-        # 最終スコア表示 (7セグメントディスプレイ)
-        self._update_score_display()
-
-        # 画面を更新
-        self.matrix.show()
-
     def _show_clear_pattern(self):
         """ゲームクリア時の画面表示パターン"""
         # 緑色で画面全体を点灯 (クリア表示)
-        for y in range(8):
-            for x in range(8):
-                self.matrix.pixel(x, y, self.matrix.LED_GREEN)
+        self.matrix.fill(self.matrix.LED_GREEN)
 
     def _show_game_over_pattern(self):
         """ゲームオーバー時の画面表示パターン"""
         # 赤色で画面全体を点灯 (ゲームオーバー表示)
-        for y in range(8):
-            for x in range(8):
-                self.matrix.pixel(x, y, self.matrix.LED_RED)
+        self.matrix.fill(self.matrix.LED_RED)
 
     def _move_objects_optimized(self):
         """最適化されたオブジェクト位置変化検出システム"""
@@ -395,55 +371,29 @@ class BreakoutGame(Game):
         return wall_collision or paddle_collision or block_collision
 
     def refresh(self):
-        """画面描画システム - 最適化されたオブジェクト描画"""
+        """画面描画システム - 最適化されたオブジェクト描画 (転送は呼び出し側がまとめて行う)"""
+        # 座標のタプルを作らないよう、matrix[x, y] ではなく pixel() で描画する
+        m = self.matrix
+
         # 画面をクリア
-        self.matrix.fill(self.matrix.LED_OFF)
+        m.fill(m.LED_OFF)
 
         # ブロック描画 (赤色1ドット)
         # 最適化: アクティブブロックのみを効率的に描画
-        led_red = self.matrix.LED_RED  # 定数の事前取得
+        led_red = m.LED_RED  # 定数の事前取得
         for block in self.blocks:
             if block.is_active:
-                self.matrix[block.x, block.y] = led_red
+                m.pixel(block.x, block.y, led_red)
 
         # パドル描画 (緑色3ドット)
-        # 最適化: キャッシュされた位置を使用
-        if self._paddle_positions_cache is None or self._last_paddle_x != self.paddle.x:
-            self._paddle_positions_cache = self.paddle.get_positions()
-            self._last_paddle_x = self.paddle.x
-
-        led_green = self.matrix.LED_GREEN  # 定数の事前取得
-        for x, y in self._paddle_positions_cache:
-            # パドルは常に画面内なので範囲チェック不要 (最適化)
-            self.matrix[x, y] = led_green
+        # パドルは常に画面内なので、列のビットマスクで1行分をまとめて描画する
+        m.set_row(self.paddle.y, m.LED_GREEN, self.paddle.get_mask())
 
         # ボール描画 (オレンジ色1ドット)
         ball_x = int(self.ball.x)  # round()よりint()が高速
         ball_y = int(self.ball.y)
         if 0 <= ball_x < 8 and 0 <= ball_y < 8:  # 画面範囲内チェック
-            self.matrix[ball_x, ball_y] = self.matrix.LED_YELLOW  # オレンジに最も近い色
-
-        # 画面更新
-        self.matrix.show()
-
-    def pause(self):
-        """
-        ゲームを一時停止
-
-        ボールの動きとゲームロジックを停止し、現在の表示状態を維持します。
-        """
-        super().pause()
-        # ボール、パドル、ブロックの状態を保持
-        # LEDマトリクスと7セグメントディスプレイの表示は維持される
-
-    def resume(self):
-        """
-        ゲームを再開
-
-        ボールの動きとゲームロジックを再開し、ゲーム状態を保持します。
-        """
-        super().resume()
-        # ゲーム状態 (スコア、ボール位置、パドル位置、ブロック状態) は保持される
+            m.pixel(ball_x, ball_y, m.LED_YELLOW)  # オレンジに最も近い色
 
     def finalize(self):
         """ゲーム終了処理"""
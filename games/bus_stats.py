@@ -0,0 +1,172 @@
+from games.clock import Clock
+
+
+class BusStats:
+    """
+    I2Cバス1本分の転送量の集計
+
+    トランザクション数・書き込みバイト数・show()内の所要時間を、バス全体と
+    呼び出し元 (ゲーム名など) ごとに集計します。呼び出し元は set_caller() で
+    切り替え、以降の転送はその呼び出し元の分として数えます。
+
+    show()の所要時間は timer_ns (ナノ秒を返す関数) が設定されている場合のみ計測します。
+    time.monotonic_ns() の戻り値は大きな整数でヒープ確保が発生するため、既定では計測しません。
+    """
+
+    def __init__(self, name: str, clock: Clock = None):
+        """
+        Args:
+            name: 表示用のバス名
+            clock: 集計期間の計測に使うクロック (省略時は Clock)
+        """
+        self.name = name
+        self.timer_ns = None
+        self._clock = clock if clock is not None else Clock()
+        self._caller = None
+        self._caller_counts = None
+        self.reset()
+
+    def reset(self) -> None:
+        """集計をクリアし、集計期間を現在時刻から始め直す"""
+        self.transactions = 0
+        self.bytes_written = 0
+        self.show_ns = 0
+        # 呼び出し元 -> [トランザクション数, 書き込みバイト数, show()の所要時間ns]
+        self._callers = {}
+        self._start = self._clock.now()
+        if self._caller is not None:
+            self.set_caller(self._caller)
+
+    @property
+    def caller(self):
+        """現在の呼び出し元"""
+        return self._caller
+
+    def set_caller(self, caller: str) -> None:
+        """以降の転送を集計する呼び出し元を切り替える"""
+        self._caller = caller
+        counts = self._callers.get(caller)
+        if counts is None:
+            counts = [0, 0, 0]
+            self._callers[caller] = counts
+        self._caller_counts = counts
+
+    def record_transfer(self, nbytes: int) -> None:
+        """I2Cトランザクション1回分を記録する"""
+        self.transactions += 1
+        self.bytes_written += nbytes
+        counts = self._caller_counts
+        if counts is not None:
+            counts[0] += 1
+            counts[1] += nbytes
+
+    def record_show(self, elapsed_ns: int) -> None:
+        """show() 1回分の所要時間を記録する"""
+        self.show_ns += elapsed_ns
+        counts = self._caller_counts
+        if counts is not None:
+            counts[2] += elapsed_ns
+
+    def elapsed_ms(self) -> int:
+        """集計期間の長さ (ミリ秒)"""
+        return self._clock.elapsed(self._start)
+
+    def callers(self) -> dict:
+        """呼び出し元ごとの集計 (呼び出し元 -> (トランザクション数, バイト数, show()の所要時間ns))"""
+        return {caller: tuple(counts) for caller, counts in self._callers.items()}
+
+    def report(self) -> str:
+        """集計結果を1秒あたりの値で表した複数行の文字列を返す"""
+        seconds = max(1, self.elapsed_ms()) / 1000
+        lines = [
+            self._format_line(
+                f"I2C {self.name}",
+                self.transactions,
+                self.bytes_written,
+                self.show_ns,
+                seconds,
+            )
+        ]
+        for caller, counts in self._callers.items():
+            if counts[0] > 0:
+                lines.append(
+                    self._format_line(f"  {caller}", *counts, seconds=seconds)
+                )
+        return "\n".join(lines)
+
+    def _format_line(self, label, transactions, nbytes, show_ns, seconds):
+        line = (
+            f"{label}: {transactions / seconds:.1f} tx/s,"
+            f" {nbytes / seconds:.0f} B/s"
+        )
+        if self.timer_ns is not None:
+            line += f", show {show_ns / 1000000 / seconds:.2f} ms/s"
+        return line
+
+
+class CountingI2C:
+    """
+    転送量を集計する busio.I2C のラッパー
+
+    adafruit_bus_device の I2CDevice が使うメソッドを元のバスに委譲し、
+    トランザクションごとに BusStats に記録します。
+    """
+
+    def __init__(self, bus, stats: BusStats):
+        """
+        Args:
+            bus: ラップする busio.I2C
+            stats: 転送量の記録先
+        """
+        self.bus = bus
+        self.stats = stats
+
+    def try_lock(self) -> bool:
+        return self.bus.try_lock()
+
+    def unlock(self) -> None:
+        self.bus.unlock()
+
+    def scan(self) -> list:
+        return self.bus.scan()
+
+    def deinit(self) -> None:
+        self.bus.deinit()
+
+    def writeto(self, address, buffer, *, start=0, end=None):
+        if end is None:
+            end = len(buffer)
+        self.bus.writeto(address, buffer, start=start, end=end)
+        self.stats.record_transfer(end - start)
+
+    def readfrom_into(self, address, buffer, *, start=0, end=None):
+        if end is None:
+            end = len(buffer)
+        self.bus.readfrom_into(address, buffer, start=start, end=end)
+        self.stats.record_transfer(0)
+
+    def writeto_then_readfrom(
+        self,
+        address,
+        buffer_out,
+        buffer_in,
+        *,
+        out_start=0,
+        out_end=None,
+        in_start=0,
+        in_end=None,
+    ):
+        if out_end is None:
+            out_end = len(buffer_out)
+        if in_end is None:
+            in_end = len(buffer_in)
+        self.bus.writeto_then_readfrom(
+            address,
+            buffer_out,
+            buffer_in,
+            out_start=out_start,
+            out_end=out_end,
+            in_start=in_start,
+            in_end=in_end,
+        )
+        self.stats.record_transfer(out_end - out_start)
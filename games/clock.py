@@ -0,0 +1,148 @@
+try:
+    from supervisor import ticks_ms as _ticks_ms
+except ImportError:
+    # CircuitPython以外 (PC上での動作確認など) では time.monotonic_ns() で代用する
+    import time
+
+    def _ticks_ms() -> int:
+        return (time.monotonic_ns() // 1000000) & TICKS_MAX
+
+
+# supervisor.ticks_ms() は 2**29 ミリ秒 (約6.2日) で0に戻る
+TICKS_PERIOD = 1 << 29
+TICKS_MAX = TICKS_PERIOD - 1
+TICKS_HALFPERIOD = TICKS_PERIOD // 2
+
+
+def ticks_add(ticks: int, delta: int) -> int:
+    """ティック値にミリ秒を加算する (周回を考慮)"""
+    return (ticks + delta) % TICKS_PERIOD
+
+
+def ticks_diff(end: int, start: int) -> int:
+    """
+    2つのティック値の差 (end - start) をミリ秒で返す (周回を考慮)
+
+    差が半周期 (約3.1日) 未満であれば、ティック値が0に戻った後でも正しい値になる。
+    """
+    diff = (end - start) & TICKS_MAX
+    return ((diff + TICKS_HALFPERIOD) & TICKS_MAX) - TICKS_HALFPERIOD
+
+
+class Clock:
+    """
+    ミリ秒単位の整数ティッククロック
+
+    supervisor.ticks_ms() を元に、周回を考慮した整数演算で経過時間を求めます。
+    time.monotonic() の浮動小数点数は起動から数時間で1ミリ秒未満の精度を失い、
+    引き算のたびにヒープ確保も発生しますが、ティック値は小さな整数のままなので
+    何日動かし続けても正確で、計算にヒープ確保も発生しません。
+
+    ゲームごとに差し替えられるよう、Game にはインスタンスとして渡します。
+    """
+
+    def now(self) -> int:
+        """現在のティック値 (ミリ秒)"""
+        return _ticks_ms()
+
+    def elapsed(self, since: int) -> int:
+        """ティック値sinceから現在までの経過時間 (ミリ秒)"""
+        return ticks_diff(self.now(), since)
+
+    @staticmethod
+    def add(ticks: int, delta: int) -> int:
+        """ティック値にミリ秒を加算する (周回を考慮)"""
+        return ticks_add(ticks, delta)
+
+    @staticmethod
+    def diff(end: int, start: int) -> int:
+        """2つのティック値の差 (end - start) をミリ秒で返す (周回を考慮)"""
+        return ticks_diff(end, start)
+
+
+class ManualClock(Clock):
+    """
+    呼び出し側が明示的に進めるクロック
+
+    実時間と無関係に時刻が決まるため、シミュレーションで実時間より速く進めたり、
+    同じ入力から同じ結果を再現したりする場合に使います。
+    """
+
+    def __init__(self, start: int = 0):
+        self._now = start & TICKS_MAX
+
+    def now(self) -> int:
+        return self._now
+
+    def advance(self, ms: int) -> None:
+        """時刻をmsミリ秒進める"""
+        self._now = ticks_add(self._now, ms)
+
+
+class GameClock(Clock):
+    """
+    一時停止できるゲーム内時間のクロック
+
+    元のクロックの時刻から一時停止していた時間の合計を差し引いた時刻を返します。
+    一時停止中は時刻が止まるため、ゲームの時刻 (ジャンプの開始時刻や落下タイマーなど) は
+    再開時に補正しなくても一時停止の前後で連続します。再開時の処理は
+    補正量を1つ更新するだけなので、ゲームのタイマーの数によらず一定です。
+
+    timer() / call_later() / call_every() で登録したタイマーはゲーム内時間の
+    タイマーホイール (TimerWheel) で管理され、期限が来た後の run_due() で
+    コールバックが呼び出されます (一時停止中は呼び出されません)。
+    """
+
+    def __init__(self, clock: Clock):
+        """
+        Args:
+            clock: 元になるクロック
+        """
+        self._clock = clock
+        self._offset = 0  # 一時停止していた時間の合計 (ミリ秒、周期で折り返す)
+        self._paused_at = None  # 一時停止した時点のゲーム内時刻
+        # 循環インポートを避けるため、ここでインポートする
+        from games.timer_wheel import TimerWheel
+
+        self._wheel = TimerWheel(self)
+
+    def now(self) -> int:
+        if self._paused_at is not None:
+            return self._paused_at
+        return ticks_add(self._clock.now(), -self._offset)
+
+    def pause(self) -> None:
+        """ゲーム内時間を止める"""
+        if self._paused_at is None:
+            self._paused_at = self.now()
+
+    def resume(self) -> None:
+        """止めた時点の時刻からゲーム内時間を再開する"""
+        if self._paused_at is not None:
+            self._offset = (self._clock.now() - self._paused_at) & TICKS_MAX
+            self._paused_at = None
+
+    @property
+    def is_paused(self) -> bool:
+        return self._paused_at is not None
+
+    def timer(self, callback):
+        """ゲーム内時間の未登録のタイマー (Timer) を作成する (start() で登録する)"""
+        return self._wheel.timer(callback)
+
+    def call_later(self, delay: int, callback):
+        """ゲーム内時間でdelayミリ秒後に callback() を1回だけ呼び出すタイマーを登録する"""
+        return self._wheel.call_later(delay, callback)
+
+    def call_every(self, interval: int, callback):
+        """ゲーム内時間でintervalミリ秒ごとに callback() を呼び出すタイマーを登録する"""
+        return self._wheel.call_every(interval, callback)
+
+    def cancel_all(self) -> None:
+        """登録したタイマーをすべて取り消す"""
+        self._wheel.cancel_all()
+
+    def run_due(self) -> None:
+        """期限が来たタイマーのコールバックを呼び出す (一時停止中は何もしない)"""
+        if self._paused_at is None:
+            self._wheel.advance()
@@ -2,9 +2,344 @@ import board
 import busio
 import digitalio
 from adafruit_ht16k33.matrix import Matrix8x8x2
-from adafruit_ht16k33.segments import Seg7x4
+from adafruit_ht16k33.segments import NUMBERS, Seg7x4
 from adafruit_debouncer import Debouncer
 
+from games.clock import Clock
+from games.frame_cache import FrameCache
+from games.input_events import BUTTON_A, BUTTON_B, InputService
+from games.keypad_buttons import KEYPAD_AVAILABLE, KeypadButtons
+
+
+class ShadowBuffer:
+    """
+    HT16K33の表示RAMの送信済み内容 (シャドウバッファ)
+
+    最後にI2Cで送信したフレームを保持し、flush()では比較して変化した
+    アドレス範囲のみを転送します。フレームに変化がなければ転送自体を行いません。
+    """
+
+    RAM_SIZE = 16  # HT16K33の表示RAMサイズ (バイト)
+
+    def __init__(self, stats=None):
+        """
+        Args:
+            stats: flush()の所要時間の記録先 (Noneなら記録しない)
+        """
+        self._shadow = bytearray(self.RAM_SIZE)
+        self._tx_buffer = bytearray(self.RAM_SIZE + 1)
+        self._valid = False
+        self._stats = stats
+        self._profiler = None
+        self._profile_phase = 0
+        self.bytes_saved = 0  # 差分転送により削減できた転送バイト数
+
+    def set_profiler(self, profiler, phase: int) -> None:
+        """flush()の時間をフレームプロファイラの指定フェーズとして計測させる"""
+        self._profiler = profiler
+        self._profile_phase = phase
+
+    def invalidate(self) -> None:
+        """シャドウバッファを無効化し、次回のflush()でフレーム全体を転送させる"""
+        self._valid = False
+
+    def flush(self, buffer, i2c_dev) -> None:
+        """
+        表示バッファのうち変化したアドレス範囲のみを転送する
+
+        Args:
+            buffer: adafruit_ht16k33形式の表示バッファ ([0]はアドレスバイト、[1:17]が表示RAM)
+            i2c_dev: 転送先のI2CDevice
+        """
+        profiler = self._profiler
+        if profiler is not None:
+            previous = profiler.switch(self._profile_phase)
+
+        stats = self._stats
+        timer_ns = stats.timer_ns if stats is not None else None
+        if timer_ns is None:
+            self._flush(buffer, i2c_dev)
+        else:
+            start = timer_ns()
+            self._flush(buffer, i2c_dev)
+            stats.record_show(timer_ns() - start)
+
+        if profiler is not None:
+            profiler.switch(previous)
+
+    def _flush(self, buffer, i2c_dev) -> None:
+        shadow = self._shadow
+        full_size = self.RAM_SIZE + 1
+
+        if self._valid:
+            first = 0
+            while first < self.RAM_SIZE and buffer[first + 1] == shadow[first]:
+                first += 1
+            if first == self.RAM_SIZE:
+                # 前回送信時から変化なし: 転送しない
+                self.bytes_saved += full_size
+                return
+            last = self.RAM_SIZE - 1
+            while buffer[last + 1] == shadow[last]:
+                last -= 1
+        else:
+            first = 0
+            last = self.RAM_SIZE - 1
+
+        # HT16K33はアドレスポインタを自動インクリメントするため、
+        # 先頭アドレス + 変化範囲のデータだけを1回で書き込めばよい
+        tx = self._tx_buffer
+        tx[0] = first
+        for i in range(first, last + 1):
+            value = buffer[i + 1]
+            tx[i - first + 1] = value
+            shadow[i] = value
+        length = last - first + 2
+
+        with i2c_dev:
+            i2c_dev.write(tx, end=length)
+
+        self._valid = True
+        self.bytes_saved += full_size - length
+
+
+def _solid_frame(color: int) -> bytes:
+    """指定色で全面を塗りつぶした表示RAMイメージ (16バイト) を作成する"""
+    green = 0xFF if color & 0x02 else 0x00
+    red = 0xFF if color & 0x01 else 0x00
+    return bytes((green, red) * 8)
+
+
+# 全面塗りつぶし用の表示RAMイメージ (LED_OFF, LED_RED, LED_GREEN, LED_YELLOW の順)
+_SOLID_FRAMES = tuple(_solid_frame(color) for color in range(4))
+
+
+class ShadowMatrix8x8x2(Matrix8x8x2):
+    """
+    差分転送付きバイカラーLEDマトリクス
+
+    adafruit_ht16k33 の1ピクセル単位のAPIに加えて、表示RAMを直接操作する
+    一括描画APIを提供します。表示RAMは列xごとに2バイト (2x: 緑、2x+1: 赤) で
+    構成され、各バイトのビットyが行yのLEDに対応します。
+    """
+
+    def __init__(self, i2c, **kwargs):
+        # 親クラスの初期化中に show() が呼ばれる場合があるため先に用意する
+        self._shadow = ShadowBuffer(getattr(i2c, "stats", None))
+        super().__init__(i2c, **kwargs)
+        self._ram = memoryview(self._buffer)[1 : ShadowBuffer.RAM_SIZE + 1]
+
+    @property
+    def ram(self) -> memoryview:
+        """表示RAM (16バイト) への書き込み可能なビュー"""
+        return self._ram
+
+    @property
+    def bytes_saved(self) -> int:
+        """差分転送により削減できた転送バイト数"""
+        return self._shadow.bytes_saved
+
+    def invalidate(self) -> None:
+        """次回のshow()でフレーム全体を転送させる"""
+        self._shadow.invalidate()
+
+    def fill(self, color: int) -> None:
+        """画面全体を指定色で塗りつぶす (表示RAMへの1回のスライス代入)"""
+        self._buffer[1 : ShadowBuffer.RAM_SIZE + 1] = _SOLID_FRAMES[color & 0x03]
+        if self._auto_write:
+            self.show()
+
+    def blit(self, frame) -> None:
+        """
+        表示RAMイメージ (16バイト) をフレーム全体に一括で書き込む
+
+        Args:
+            frame: 表示RAMと同じ形式の16バイトのバッファ
+        """
+        self._ram[:] = frame
+        if self._auto_write:
+            self.show()
+
+    def set_column(self, x: int, color: int, mask: int = 0xFF) -> None:
+        """
+        列xのうちmaskでビットが立っている行をまとめて指定色にする
+
+        Args:
+            x: 列 (0-7)
+            color: 色 (LED_OFF/LED_RED/LED_GREEN/LED_YELLOW)
+            mask: 対象とする行のビットマスク (ビットyが行yに対応)
+        """
+        ram = self._ram
+        index = 2 * x
+        if color & 0x02:
+            ram[index] |= mask
+        else:
+            ram[index] &= ~mask & 0xFF
+        if color & 0x01:
+            ram[index + 1] |= mask
+        else:
+            ram[index + 1] &= ~mask & 0xFF
+        if self._auto_write:
+            self.show()
+
+    def set_row(self, y: int, color: int, mask: int = 0xFF) -> None:
+        """
+        行yのうちmaskでビットが立っている列をまとめて指定色にする
+
+        Args:
+            y: 行 (0-7)
+            color: 色 (LED_OFF/LED_RED/LED_GREEN/LED_YELLOW)
+            mask: 対象とする列のビットマスク (ビットxが列xに対応)
+        """
+        ram = self._ram
+        bit = 1 << y
+        green = bit if color & 0x02 else 0
+        red = bit if color & 0x01 else 0
+        keep = ~bit & 0xFF
+        for x in range(8):
+            if mask & (1 << x):
+                index = 2 * x
+                ram[index] = (ram[index] & keep) | green
+                ram[index + 1] = (ram[index + 1] & keep) | red
+        if self._auto_write:
+            self.show()
+
+    def show(self) -> None:
+        """変化したアドレス範囲のみをLEDマトリクスに転送する"""
+        self._shadow.flush(self._buffer, self.i2c_device[0])
+
+
+class ShadowSeg7x4(Seg7x4):
+    """差分転送付き7セグメントディスプレイ"""
+
+    def __init__(self, i2c, **kwargs):
+        # 親クラスの初期化中に show() が呼ばれる場合があるため先に用意する
+        self._shadow = ShadowBuffer(getattr(i2c, "stats", None))
+        super().__init__(i2c, **kwargs)
+
+    @property
+    def bytes_saved(self) -> int:
+        """差分転送により削減できた転送バイト数"""
+        return self._shadow.bytes_saved
+
+    def invalidate(self) -> None:
+        """次回のshow()で表示内容全体を転送させる"""
+        self._shadow.invalidate()
+
+    def show(self) -> None:
+        """変化した桁の範囲のみを7セグメントディスプレイに転送する"""
+        self._shadow.flush(self._buffer, self.i2c_device[0])
+
+
+class DisplayEffects:
+    """
+    HT16K33のハードウェア点滅・輝度制御
+
+    点滅はHT16K33の点滅レジスタ、輝度は16段階の調光レジスタで行うため、
+    点滅フレームの再描画や転送は不要です。フェードは update() の呼び出しごとに
+    輝度の段階が変わった時だけコマンドを1バイト送信します。
+    """
+
+    BLINK_OFF = 0
+    BLINK_2HZ = 1
+    BLINK_1HZ = 2
+    BLINK_HALF_HZ = 3
+
+    MAX_BRIGHTNESS = 15  # 調光レジスタの最大値 (0-15の16段階)
+
+    def __init__(self, display, clock: Clock = None):
+        """
+        Args:
+            display: HT16K33系ディスプレイ (ShadowMatrix8x8x2 / ShadowSeg7x4)
+            clock: フェード時間の計測に使うクロック (省略時は Clock)
+        """
+        self._display = display
+        self._clock = clock if clock is not None else Clock()
+        self._blink_rate = display.blink_rate
+        self._brightness = round(display.brightness * self.MAX_BRIGHTNESS)
+        self._fade_from = 0
+        self._fade_to = None  # フェード中でなければNone
+        self._fade_start = 0
+        self._fade_duration = 0
+
+    @property
+    def blink_rate(self) -> int:
+        """現在の点滅レート (BLINK_OFF/BLINK_2HZ/BLINK_1HZ/BLINK_HALF_HZ)"""
+        return self._blink_rate
+
+    @property
+    def brightness(self) -> int:
+        """現在の輝度 (0-15)"""
+        return self._brightness
+
+    @property
+    def is_fading(self) -> bool:
+        """フェード中かどうか"""
+        return self._fade_to is not None
+
+    def start_blink(self, rate: int = BLINK_2HZ) -> None:
+        """ハードウェア点滅を開始する (同じレートで点滅中なら何もしない)"""
+        if rate != self._blink_rate:
+            self._blink_rate = rate
+            self._display.blink_rate = rate
+
+    def stop_blink(self) -> None:
+        """ハードウェア点滅を停止する (点滅していなければ何もしない)"""
+        self.start_blink(self.BLINK_OFF)
+
+    def set_brightness(self, level: int) -> None:
+        """
+        輝度を設定する (フェード中なら中止する)
+
+        Args:
+            level: 輝度 (0-15)
+        """
+        self._fade_to = None
+        self._write_brightness(level)
+
+    def fade(self, level: int, duration: int) -> None:
+        """
+        現在の輝度から指定輝度までフェードを開始する
+
+        Args:
+            level: フェード後の輝度 (0-15)
+            duration: フェードにかける時間 (ミリ秒)
+        """
+        if duration <= 0:
+            self.set_brightness(level)
+            return
+        self._fade_from = self._brightness
+        self._fade_to = level
+        self._fade_start = self._clock.now()
+        self._fade_duration = duration
+
+    def update(self) -> None:
+        """フェードを進める (毎フレーム呼び出す)"""
+        if self._fade_to is None:
+            return
+        elapsed = self._clock.elapsed(self._fade_start)
+        duration = self._fade_duration
+        if elapsed >= duration:
+            self._write_brightness(self._fade_to)
+            self._fade_to = None
+            return
+        # 整数演算で四捨五入する
+        delta = self._fade_to - self._fade_from
+        self._write_brightness(
+            self._fade_from + (2 * delta * elapsed + duration) // (2 * duration)
+        )
+
+    def reset(self) -> None:
+        """点滅を停止し、輝度を最大に戻す"""
+        self.stop_blink()
+        self.set_brightness(self.MAX_BRIGHTNESS)
+
+    def _write_brightness(self, level: int) -> None:
+        level = max(0, min(self.MAX_BRIGHTNESS, level))
+        if level != self._brightness:
+            self._brightness = level
+            self._display.brightness = level / self.MAX_BRIGHTNESS
+
 
 class DeviceManager:
     """
@@ -12,36 +347,211 @@ class DeviceManager:
     LEDマトリクス、7セグメントディスプレイ、ボタンなどのデバイスを管理します。
     """
 
-    def __init__(self):
-        # LEDマトリクス初期化
-        self._i2c_0 = busio.I2C(board.GP17, board.GP16, frequency=400000)
-        self._matrix = Matrix8x8x2(self._i2c_0, auto_write=False)
+    def __init__(self, use_keypad: bool = True, bus_stats: bool = False):
+        """
+        Args:
+            use_keypad: ボタンを keypad モジュールでバックグラウンドスキャンする場合True
+                (keypad モジュールが無い環境では Debouncer を使う)
+            bus_stats: I2Cバスの転送量を集計する場合True
+                (Falseなら集計用のモジュールをインポートしない)
+        """
+        i2c_0 = busio.I2C(board.GP17, board.GP16, frequency=400000)
+        i2c_1 = busio.I2C(board.GP15, board.GP14)
+
+        # I2Cバスの転送量の集計 (起動時の初期化処理の転送は "boot" として数える)
+        self._matrix_bus_stats = None
+        self._seg_bus_stats = None
+        if bus_stats:
+            from games.bus_stats import BusStats, CountingI2C
+
+            self._matrix_bus_stats = BusStats("matrix")
+            self._seg_bus_stats = BusStats("seg")
+            self.set_bus_caller("boot")
+            i2c_0 = CountingI2C(i2c_0, self._matrix_bus_stats)
+            i2c_1 = CountingI2C(i2c_1, self._seg_bus_stats)
+
+        # LEDマトリクス初期化 (差分転送付き)
+        self._i2c_0 = i2c_0
+        self._matrix = ShadowMatrix8x8x2(self._i2c_0, auto_write=False)
 
-        # 7セグメントディスプレイ初期化
-        self._i2c_1 = busio.I2C(board.GP15, board.GP14)
-        self._seg = Seg7x4(self._i2c_1)
+        # 7セグメントディスプレイ初期化 (差分転送付き、show()は明示的に呼び出す)
+        self._i2c_1 = i2c_1
+        self._seg = ShadowSeg7x4(self._i2c_1, auto_write=False)
+        self._seg.show()  # 起動直後の表示内容をクリア
+
+        # 静的な全画面パターンの表示RAMイメージのキャッシュ (全ゲームで共有)
+        self._frame_cache = FrameCache()
+
+        # ハードウェア点滅・輝度制御
+        self._matrix_effects = DisplayEffects(self._matrix)
+        self._seg_effects = DisplayEffects(self._seg)
 
         # ボタン初期化
-        self._pin_a = digitalio.DigitalInOut(board.GP18)
-        self._pin_a.direction = digitalio.Direction.INPUT
-        self._pin_a.pull = digitalio.Pull.UP
-        self._btn_a = Debouncer(self._pin_a)
+        self._keypad = None
+        if use_keypad and KEYPAD_AVAILABLE:
+            # keypad.Keys がバックグラウンドでスキャンし、押下をイベントとして溜める
+            self._keypad = KeypadButtons((board.GP18, board.GP19))
+            self._btn_a, self._btn_b = self._keypad.buttons
+        else:
+            self._pin_a = digitalio.DigitalInOut(board.GP18)
+            self._pin_a.direction = digitalio.Direction.INPUT
+            self._pin_a.pull = digitalio.Pull.UP
+            self._btn_a = Debouncer(self._pin_a)
+
+            self._pin_b = digitalio.DigitalInOut(board.GP19)
+            self._pin_b.direction = digitalio.Direction.INPUT
+            self._pin_b.pull = digitalio.Pull.UP
+            self._btn_b = Debouncer(self._pin_b)
+
+        # ボタン (とゲーム選択のエンコーダー) の入力イベント。メインループが1ステップに1回 poll() する
+        self._input = InputService(self._btn_a, self._btn_b)
 
-        self._pin_b = digitalio.DigitalInOut(board.GP19)
-        self._pin_b.direction = digitalio.Direction.INPUT
-        self._pin_b.pull = digitalio.Pull.UP
-        self._btn_b = Debouncer(self._pin_b)
+        self._profiler = None
 
     @property
-    def matrix(self) -> Matrix8x8x2:
+    def profiler(self):
+        """フレームプロファイラ (enable_profiler() を呼ぶまではNone)"""
+        return self._profiler
+
+    def enable_profiler(self, profiler) -> None:
+        """
+        ボタンのデバウンス処理とディスプレイへのI2C転送をフレームプロファイラで計測する
+
+        ボタンは入力サービス (self.input) がラッパー経由で読み取るため、
+        ゲームの初期化前に呼び出せば全ゲームで計測されます。
+
+        Args:
+            profiler: FrameProfiler インスタンス
+        """
+        from games.frame_profiler import PHASE_MATRIX, PHASE_SEG, ProfiledButton
+
+        self._profiler = profiler
+        self._btn_a = ProfiledButton(self._btn_a, profiler)
+        self._btn_b = ProfiledButton(self._btn_b, profiler)
+        self._input.set_buttons(self._btn_a, self._btn_b)
+        self._input.set_profiler(profiler)
+        self._matrix._shadow.set_profiler(profiler, PHASE_MATRIX)
+        self._seg._shadow.set_profiler(profiler, PHASE_SEG)
+
+    def enable_input_recording(self, log) -> None:
+        """
+        ボタンのデバウンス後の変化を入力ログに記録する
+
+        enable_profiler() と同様に、ゲームの初期化前に呼び出してください。
+
+        Args:
+            log: 記録先の InputLog
+        """
+        from games.input_log import RecordingButton
+
+        self._btn_a = RecordingButton(self._btn_a, log, BUTTON_A)
+        self._btn_b = RecordingButton(self._btn_b, log, BUTTON_B)
+        self._input.set_buttons(self._btn_a, self._btn_b)
+
+    def enable_input_replay(self, player) -> None:
+        """
+        ボタンの状態を実際の入力の代わりに入力ログから再生する
+
+        enable_profiler() と同様に、ゲームの初期化前に呼び出してください。
+
+        Args:
+            player: 再生する InputPlayer
+        """
+        from games.input_log import ReplayButton
+
+        self._btn_a = ReplayButton(player, BUTTON_A)
+        self._btn_b = ReplayButton(player, BUTTON_B)
+        self._input.set_buttons(self._btn_a, self._btn_b)
+
+    @property
+    def matrix(self) -> ShadowMatrix8x8x2:
         """LEDマトリクスへのアクセス"""
         return self._matrix
 
     @property
-    def seg(self) -> Seg7x4:
+    def matrix_bytes_saved(self) -> int:
+        """差分転送により削減できたLEDマトリクスへのI2C転送バイト数"""
+        return self._matrix.bytes_saved
+
+    @property
+    def matrix_effects(self) -> DisplayEffects:
+        """LEDマトリクスのハードウェア点滅・輝度制御へのアクセス"""
+        return self._matrix_effects
+
+    @property
+    def seg_effects(self) -> DisplayEffects:
+        """7セグメントディスプレイのハードウェア点滅・輝度制御へのアクセス"""
+        return self._seg_effects
+
+    @property
+    def frame_cache(self) -> FrameCache:
+        """静的な全画面パターンの表示RAMイメージのキャッシュへのアクセス"""
+        return self._frame_cache
+
+    @property
+    def seg_bytes_saved(self) -> int:
+        """差分転送により削減できた7セグメントディスプレイへのI2C転送バイト数"""
+        return self._seg.bytes_saved
+
+    @property
+    def seg(self) -> ShadowSeg7x4:
         """7セグメントディスプレイへのアクセス"""
         return self._seg
 
+    @property
+    def matrix_bus_stats(self):
+        """LEDマトリクス側I2Cバス (_i2c_0) の転送量の集計 (集計しない場合はNone)"""
+        return self._matrix_bus_stats
+
+    @property
+    def seg_bus_stats(self):
+        """7セグメントディスプレイ側I2Cバス (_i2c_1) の転送量の集計 (集計しない場合はNone)"""
+        return self._seg_bus_stats
+
+    def set_bus_caller(self, caller: str) -> None:
+        """以降のI2C転送を集計する呼び出し元 (ゲーム名など) を切り替える"""
+        if self._matrix_bus_stats is None:
+            return
+        self._matrix_bus_stats.set_caller(caller)
+        self._seg_bus_stats.set_caller(caller)
+
+    def set_bus_timer(self, timer_ns) -> None:
+        """
+        show()の所要時間の計測に使う関数を設定する
+
+        Args:
+            timer_ns: ナノ秒単位の時刻を返す関数 (time.monotonic_ns など)。Noneなら計測しない
+        """
+        if self._matrix_bus_stats is None:
+            return
+        self._matrix_bus_stats.timer_ns = timer_ns
+        self._seg_bus_stats.timer_ns = timer_ns
+
+    def reset_bus_stats(self) -> None:
+        """I2Cバスの転送量の集計をクリアする"""
+        if self._matrix_bus_stats is None:
+            return
+        self._matrix_bus_stats.reset()
+        self._seg_bus_stats.reset()
+
+    def print_bus_stats(self) -> None:
+        """I2Cバスの転送量の集計をシリアルに出力する (REPLからも呼び出せる)"""
+        if self._matrix_bus_stats is None:
+            print("I2C bus stats: disabled")
+            return
+        print(self._matrix_bus_stats.report())
+        print(self._seg_bus_stats.report())
+
+    @property
+    def button_backend(self) -> str:
+        """ボタンの読み取り方式 ("keypad" または "debouncer")"""
+        return "keypad" if self._keypad is not None else "debouncer"
+
+    @property
+    def input(self) -> InputService:
+        """ボタンとエンコーダーの入力イベント (ゲームは input.events を参照する)"""
+        return self._input
+
     @property
     def btn_a(self) -> Debouncer:
         """Aボタンへのアクセス"""
@@ -52,18 +562,69 @@ class DeviceManager:
         """Bボタンへのアクセス"""
         return self._btn_b
 
+    def update_effects(self) -> None:
+        """輝度フェードを進める (メインループから毎フレーム呼び出す)"""
+        self._matrix_effects.update()
+        self._seg_effects.update()
+
+    def reset_effects(self) -> None:
+        """全ディスプレイの点滅を停止し、輝度を最大に戻す"""
+        self._matrix_effects.reset()
+        self._seg_effects.reset()
+
     def show_text(self, text: str = "") -> None:
-        """7セグメントディスプレイをクリアし、指定文字列を表示する（空文字ならクリアのみ）"""
+        """
+        7セグメントディスプレイをクリアし、指定文字列を表示する（空文字ならクリアのみ）
+
+        前回の表示内容と同じ場合はI2C転送を行わない。
+        """
         self._seg.fill(0)
         if text:
             self._seg.print(text)
         self._seg.show()
 
+    def show_number(self, value: int, min_digits: int = 1) -> None:
+        """
+        7セグメントディスプレイをクリアし、0以上の整数を右詰めで表示する
+
+        show_text(str(value)) と同じ表示になるが、文字列を作らないため
+        ヒープ確保が発生しない。4桁を超える値は下4桁を表示する。
+
+        Args:
+            value: 表示する整数
+            min_digits: 最低限表示する桁数 (足りない桁は0で埋める)
+        """
+        seg = self._seg
+        seg.fill(0)
+        for index in range(3, -1, -1):
+            seg.set_digit_raw(index, NUMBERS[value % 10])
+            value //= 10
+            min_digits -= 1
+            if value == 0 and min_digits <= 0:
+                break
+        seg.show()
+
+    def show_digits(self, text: str, start: int = 0) -> None:
+        """
+        7セグメントディスプレイの指定桁から1文字ずつ書き換える（他の桁は維持）
+
+        変化した桁の範囲のみがI2Cで転送される。
+
+        Args:
+            text: 表示する文字列 (1文字が1桁に対応)
+            start: 書き換えを開始する桁 (0=左端)
+        """
+        for i, char in enumerate(text):
+            self._seg[start + i] = char
+        self._seg.show()
+
     def show_border(self, color) -> None:
         """LEDマトリクスの外周1ドットを指定色で描画する（show()の呼び出しは呼び出し側に委ねる）"""
-        for x in range(self._matrix.columns):
-            self._matrix[x, 0] = color
-            self._matrix[x, self._matrix.rows - 1] = color
-        for y in range(self._matrix.rows):
-            self._matrix[0, y] = color
-            self._matrix[self._matrix.columns - 1, y] = color
+        matrix = self._matrix
+        last = matrix.columns - 1
+        # 上下端の行 (ビット0と最終ビット) と左右端の列を表示RAMに一括で書き込む
+        edge_rows = 0x01 | (1 << (matrix.rows - 1))
+        for x in range(1, last):
+            matrix.set_column(x, color, edge_rows)
+        matrix.set_column(0, color)
+        matrix.set_column(last, color)
@@ -1,12 +1,15 @@
-import random
-import time
 from games.game_interface import Game
+from games.input_events import BUTTON_A, BUTTON_B
 
 
 class FallingDot:
     """落下ドット管理クラス"""
 
     def __init__(self, x: int, y: int):
+        self.reset(x, y)
+
+    def reset(self, x: int, y: int):
+        """ドットを作り直す (生成のたびにオブジェクトを確保しないよう使い回す)"""
         self._x = x
         self._y = y
         self._is_visible = True
@@ -48,8 +51,8 @@ class FallingDotGame(Game):
     衝突したら停止。
     """
 
-    def __init__(self, devices):
-        super().__init__(devices)
+    def __init__(self, devices, clock=None, rng=None):
+        super().__init__(devices, clock, rng)
 
     def initialize(self):
         # ゲーム状態の初期化
@@ -64,115 +67,128 @@ class FallingDotGame(Game):
 
         # 落下ドット (1個のみ)
         self.dot = None
-        # ドット落下速度 (秒)
-        self.dot_speed = 0.5
+        # ドット落下間隔 (ミリ秒)
+        self.dot_speed = 500
         # 避けたドット数
         self.dot_count = 0
         self.spawn_dot()
 
-        # ドット落下タイマー
-        self.last_drop_time = time.monotonic()
+        # ドット落下タイマー (dot_speedミリ秒ごとに1マス落下)。再スタート時は前回の分を取り消す
+        self.clock.cancel_all()
+        self.drop_timer = self.call_every(self.dot_speed, self.drop_dot)
 
-        # ゲームオーバー時のリセット判定 (両ボタン同時押し検出用)
-        self._both_pressed_prev = False
+        # 次のフレームで画面全体を描画させる
+        self.invalidate()
 
     def spawn_dot(self):
         # 新しいドットを生成 (1個のみ)
-        self.dot = FallingDot(random.randint(0, self.matrix_width - 1), 0)
-        # 新規生成ごとに速度を1.1で割る (加速)
-        self.dot_speed /= 1.1
+        x = self.rng.randint(0, self.matrix_width - 1)
+        if self.dot is None:
+            self.dot = FallingDot(x, 0)
+        else:
+            self.dot.reset(x, 0)
+        # 新規生成ごとに落下間隔を1.1で割る (加速)。
+        # 整数演算で行い、クロックの分解能である1ミリ秒を下限とする
+        self.dot_speed = max(1, self.dot_speed * 10 // 11)
         # ゲーム開始直後はカウントしない
         if self.dot_count is not None:
             self.dot_count += 1
 
         # 7セグメントディスプレイをクリアして得点表示
-        self._devices.show_text(str(self.dot_count - 1))
+        self._devices.show_number(self.dot_count - 1)
 
-    def update(self):
+    def step(self, dt):
         # 一時停止中は更新処理をスキップ
         if self.is_paused:
             return
 
-        m = self.matrix
-
         if not self.is_running:
             if not self.score_shown:
                 self.score_shown = True
 
-                print(f"Game over. score = {self.dot_count - 1}\n")
-                # ゲームが終了している場合は赤枠を表示 (1回だけm.show)
-                self.show_error()
-                m.show()
-
-                # 衝突した瞬間に両ボタンが押されたままだった場合、
-                # 「両方押されている状態への遷移」が即成立して意図せず
-                # 即リセットされてしまうのを防ぐため、ゲームオーバーに
-                # 入った直後は一度両方離されるまでリセット判定を無効化する。
-                self._both_pressed_prev = True
+                self.log_event(f"Game over. score = {self.dot_count - 1}\n")
 
             # 以降は何も表示しないが、両ボタン同時押しで再スタート可能。
-            # fell同士 (押した瞬間) の一致で判定すると、両ボタンの押下が
-            # 同一フレームに揃わない限りリセットされずタイミングがシビアに
-            # なるため、代わりに「両方押されている」状態への遷移で判定する。
-            self.btn_a.update()
-            self.btn_b.update()
-            both_pressed = not self.btn_a.value and not self.btn_b.value
-            if both_pressed and not self._both_pressed_prev:
-                self._both_pressed_prev = both_pressed
+            # both_pressed は「両方押されている」状態への遷移で成立するため、
+            # 衝突した瞬間に両ボタンが押されたままだった場合は一度離すまで成立しない。
+            if self.input.both_pressed:
                 self.initialize()
-                return
-            self._both_pressed_prev = both_pressed
             return
 
-        # オブジェクトの位置更新
+        # オブジェクトの位置更新と衝突判定
         obj_location_changed = self.move_objects()
 
-        # 衝突判定 (表示中のドットのみ)
-        if self.dot and self.dot.is_visible:
-            for dx in range(2):
-                for dy in range(2):
-                    px = self.player_x + dx
-                    py = self.player_y + dy
-                    if px == self.dot.x and py == self.dot.y:
-                        self.is_running = False
+        # オブジェクトの位置が変わった場合 (またはゲームオーバーになった場合) のみ表示更新
+        if obj_location_changed or not self.is_running:
+            self.invalidate()
 
-        # オブジェクトの位置が変わった場合のみ表示更新
-        if obj_location_changed:
-            self.refresh()
+    def render(self):
+        # 一時停止中は表示を維持
+        if self.is_paused:
+            return
+
+        self.refresh()
+
+    def redraw(self):
+        # 得点表示と画面全体を描き直す
+        self._devices.show_number(self.dot_count - 1)
+        self.invalidate()
 
     def move_objects(self) -> bool:
-        """オブジェクトの位置を更新し、必要ならば表示を更新する"""
+        """オブジェクトの位置を更新して衝突判定を行い、位置が変わったかどうかを返す"""
 
         obj_location_changed = False
 
         # プレイヤー操作
-        self.btn_a.update()
-        if self.btn_a.fell:
+        if self.input.pressed(BUTTON_A):
             self.player_x = min(self.matrix_width - 2, self.player_x + 1)
             obj_location_changed = True
 
-        self.btn_b.update()
-        if self.btn_b.fell:
+        if self.input.pressed(BUTTON_B):
             self.player_x = max(0, self.player_x - 1)
             obj_location_changed = True
 
-        # dot_speed秒ごとにドット落下
-        now = time.monotonic()
-        if now - self.last_drop_time >= self.dot_speed:
-            self.last_drop_time = now
-            if self.dot and self.dot.is_visible:
-                self.dot.move(self.matrix_height)
-            # 画面外に出たら新規生成
-            if not self.dot.is_visible:
-                self.spawn_dot()
-            obj_location_changed = True
+        # プレイヤーの移動でドットに横から重なった場合の衝突判定
+        self.check_collision()
 
         # 移動したオブジェクトがあったかどうか返却する
         return obj_location_changed
 
+    def drop_dot(self):
+        """
+        ドットを1マス落下させて衝突判定を行う (drop_timer のコールバック)
+
+        dot_speedがステップ間隔より短くなった場合は、1回の tick() で経過した回数ぶん
+        呼び出されるため、1マスごとに衝突判定が行われる。
+        """
+        if not self.is_running:
+            # 衝突した後の落下は行わない
+            self.drop_timer.cancel()
+            return
+        if self.dot and self.dot.is_visible:
+            self.dot.move(self.matrix_height)
+        # 画面外に出たら新規生成
+        if not self.dot.is_visible:
+            self.spawn_dot()
+            self.drop_timer.interval = self.dot_speed
+        self.check_collision()
+        self.invalidate()
+
+    def check_collision(self):
+        """表示中のドットとプレイヤーの衝突判定 (衝突したらゲームオーバー)"""
+
+        if self.dot and self.dot.is_visible:
+            for dx in range(2):
+                for dy in range(2):
+                    px = self.player_x + dx
+                    py = self.player_y + dy
+                    if px == self.dot.x and py == self.dot.y:
+                        self.is_running = False
+
     def refresh(self):
-        """画面を更新してドットとプレイヤーを表示"""
+        """ドットとプレイヤーを描画する (転送は呼び出し側がまとめて行う)"""
 
+        # 座標のタプルを作らないよう、matrix[x, y] ではなく pixel() で描画する
         m = self.matrix
 
         # 画面をクリア
@@ -180,7 +196,7 @@ class FallingDotGame(Game):
 
         # ドット表示
         if self.dot and self.dot.is_visible:
-            m[self.dot.x, self.dot.y] = m.LED_YELLOW
+            m.pixel(self.dot.x, self.dot.y, m.LED_YELLOW)
 
         # プレイヤー表示 (2x2緑)
         for dx in range(2):
@@ -188,41 +204,17 @@ class FallingDotGame(Game):
                 px = self.player_x + dx
                 py = self.player_y + dy
                 if 0 <= px < self.matrix_width and 0 <= py < self.matrix_height:
-                    m[px, py] = m.LED_GREEN
+                    m.pixel(px, py, m.LED_GREEN)
 
-        # 表示更新
-        m.show()
+        # ゲームオーバー時は衝突した瞬間の画面に赤枠を重ねて表示
+        if not self.is_running:
+            self.show_error()
 
     def show_error(self):
         """ゲームオーバー時に赤枠を表示"""
 
         self._devices.show_border(self.matrix.LED_RED)
 
-    def pause(self):
-        """
-        ゲームを一時停止
-
-        ドットの落下とプレイヤーの動きを停止し、現在の表示状態を維持します。
-        """
-        super().pause()
-        # ドットの落下タイマーを保存して、再開時に継続できるようにする
-        if hasattr(self, "last_drop_time"):
-            self._pause_time = time.monotonic()
-        # LEDマトリクスと7セグメントディスプレイの表示は維持される
-
-    def resume(self):
-        """
-        ゲームを再開
-
-        ドットの落下とプレイヤーの動きを再開し、ゲーム状態を保持します。
-        """
-        super().resume()
-        # 一時停止時間を考慮してタイマーを調整
-        if hasattr(self, "_pause_time") and hasattr(self, "last_drop_time"):
-            pause_duration = time.monotonic() - self._pause_time
-            self.last_drop_time += pause_duration
-            delattr(self, "_pause_time")
-
     def finalize(self):
         self.matrix.fill(self.matrix.LED_OFF)
         self.matrix.show()
@@ -0,0 +1,82 @@
+import time
+
+from games.clock import Clock
+
+
+class FixedTimestep:
+    """
+    固定タイムステップのフレームスケジューラ
+
+    経過した実時間を蓄積し、1ステップ分の時間が貯まるごとにゲームロジックを
+    1ステップ進めます。処理落ちしたフレームでは遅れを取り戻すために複数ステップを
+    まとめて進め (上限あり)、描画はフレームごとに1回だけ行います。
+    これにより、描画が遅くてもゲームの進行速度は変わりません。
+    時間は Clock の整数ティック値 (ミリ秒) で蓄積するため、長時間動かしても誤差が溜まりません。
+    """
+
+    def __init__(self, fps: int, max_steps: int = 5, clock: Clock = None):
+        """
+        Args:
+            fps: 1秒あたりのステップ数
+            max_steps: 1フレームで進める最大ステップ数 (これを超えた遅れは切り捨てる)
+            clock: 時間計測に使うクロック (省略時は Clock)
+        """
+        self._clock = clock if clock is not None else Clock()
+        self.step_ms = 1000 // fps  # 1ステップの時間 (ミリ秒)
+        self.step_time = self.step_ms / 1000  # 1ステップの時間 (秒、Game.step()に渡す)
+        self.max_steps = max_steps
+        self._accumulator = 0
+        self._last_time = self._clock.now()
+
+        # 処理落ちの統計
+        self.frame_count = 0  # advance() を呼び出したフレーム数
+        self.overrun_count = 0  # 1フレームで複数ステップが必要になったフレーム数
+        self.dropped_steps = 0  # 上限を超えたため切り捨てたステップ数
+
+    def reset(self) -> None:
+        """蓄積時間をリセットし、現在時刻から計測をやり直す"""
+        self._accumulator = 0
+        self._last_time = self._clock.now()
+
+    def reset_stats(self) -> None:
+        """処理落ちの統計をリセットする"""
+        self.frame_count = 0
+        self.overrun_count = 0
+        self.dropped_steps = 0
+
+    def advance(self) -> int:
+        """
+        前回からの経過時間を蓄積し、このフレームで進めるステップ数を返す
+
+        Returns:
+            int: 進めるステップ数 (0 - max_steps)
+        """
+        now = self._clock.now()
+        self._accumulator += self._clock.diff(now, self._last_time)
+        self._last_time = now
+        self.frame_count += 1
+
+        steps = self._accumulator // self.step_ms
+        if steps > self.max_steps:
+            # 上限を超えた遅れは取り戻さずに切り捨てる (端数は次のフレームへ持ち越す)
+            self.dropped_steps += steps - self.max_steps
+            steps = self.max_steps
+            self._accumulator %= self.step_ms
+        else:
+            self._accumulator -= steps * self.step_ms
+
+        if steps > 1:
+            self.overrun_count += 1
+
+        return steps
+
+    def remaining_ms(self) -> int:
+        """次のステップの時刻までの残り時間 (ミリ秒、過ぎている場合は0以下)"""
+        elapsed = self._clock.elapsed(self._last_time)
+        return self.step_ms - self._accumulator - elapsed
+
+    def sleep(self) -> None:
+        """次のステップの時刻まで待機する"""
+        remaining = self.remaining_ms()
+        if remaining > 0:
+            time.sleep(remaining / 1000)
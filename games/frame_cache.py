@@ -0,0 +1,84 @@
+class FrameCache:
+    """
+    静的な全画面パターンの表示RAMイメージのキャッシュ
+
+    (座標パターン, 色) のレイヤーの組をキーとして、初回使用時に
+    HT16K33の表示RAMイメージ (16バイト) にコンパイルして保持します。
+    2回目以降は ShadowMatrix8x8x2.blit() で1回のスライス代入として描画できます。
+    保持数には上限があり、超えた場合は最も長く使われていないものから破棄します (LRU)。
+    """
+
+    RAM_SIZE = 16  # HT16K33の表示RAMサイズ (バイト)
+
+    def __init__(self, max_frames: int = 16):
+        """
+        フレームキャッシュを初期化
+
+        Args:
+            max_frames: キャッシュするフレーム数の上限
+        """
+        self.max_frames = max_frames
+        self._frames = {}
+        self._order = []  # 使用順 (先頭が最も長く使われていないキー)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, layers) -> bytes:
+        """
+        レイヤーの組に対応する表示RAMイメージを取得する (未登録ならコンパイルして登録)
+
+        Args:
+            layers: (座標パターン, 色) のタプルのタプル。座標パターンは (x, y) のタプル。
+                後ろのレイヤーほど手前に描画される。空なら全消灯。
+                キーとして使うため、呼び出し側で定数として作っておくこと。
+
+        Returns:
+            bytes: 表示RAMイメージ (16バイト)
+        """
+        frame = self._frames.get(layers)
+        if frame is not None:
+            self.hits += 1
+            if self._order[-1] != layers:
+                self._order.remove(layers)
+                self._order.append(layers)
+            return frame
+
+        self.misses += 1
+        frame = self.compile(layers)
+        if len(self._order) >= self.max_frames:
+            del self._frames[self._order.pop(0)]
+        self._frames[layers] = frame
+        self._order.append(layers)
+        return frame
+
+    def clear(self) -> None:
+        """キャッシュ済みのフレームをすべて破棄する"""
+        self._frames = {}
+        self._order = []
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    @classmethod
+    def compile(cls, layers) -> bytes:
+        """
+        レイヤーの組を表示RAMイメージにコンパイルする
+
+        表示RAMは列xごとに2バイト (2x: 緑、2x+1: 赤) で構成され、
+        各バイトのビットyが行yのLEDに対応する。画面外の座標は無視する。
+        """
+        frame = bytearray(cls.RAM_SIZE)
+        for pattern, color in layers:
+            for x, y in pattern:
+                if 0 <= x < 8 and 0 <= y < 8:
+                    bit = 1 << y
+                    index = 2 * x
+                    if color & 0x02:
+                        frame[index] |= bit
+                    else:
+                        frame[index] &= ~bit & 0xFF
+                    if color & 0x01:
+                        frame[index + 1] |= bit
+                    else:
+                        frame[index + 1] &= ~bit & 0xFF
+        return bytes(frame)
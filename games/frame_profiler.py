@@ -0,0 +1,187 @@
+import time
+from array import array
+
+# 計測するフェーズ (FrameProfiler.switch() に渡す番号)
+PHASE_ENCODER = 0  # ロータリーエンコーダーの読み取り
+PHASE_BUTTONS = 1  # ボタンのデバウンス処理
+PHASE_UPDATE = 2  # ゲームロジック (step)
+PHASE_RENDER = 3  # 描画 (render、I2C転送を除く)
+PHASE_MATRIX = 4  # LEDマトリクスへのI2C転送
+PHASE_SEG = 5  # 7セグメントディスプレイへのI2C転送
+PHASE_OTHER = 6  # 上記以外 (輝度フェード、報告の出力など)
+PHASE_GC = 7  # 待機時間に行うガベージコレクション (GcScheduler)
+PHASE_SLACK = 8  # 次のフレームまでの待機
+PHASE_NAMES = (
+    "encoder",
+    "buttons",
+    "update",
+    "render",
+    "matrix",
+    "seg",
+    "other",
+    "gc",
+    "slack",
+)
+
+_FRAME = len(PHASE_NAMES)  # 待機以外の合計 (1フレームの処理時間) の集計位置
+
+BIN_US = 100  # ヒストグラムの1区間の幅 (マイクロ秒)
+BINS = 256  # ヒストグラムの区間数 (最後の区間は 25.5ms 以上をまとめて数える)
+
+_INT32_MAX = 0x7FFFFFFF
+
+
+def _monotonic_us() -> int:
+    return time.monotonic_ns() // 1000
+
+
+class FrameProfiler:
+    """
+    メインループの1フレームをフェーズごとに分けて計測するプロファイラ
+
+    switch() で現在のフェーズを切り替えると、直前のフェーズに経過時間が加算されます。
+    入れ子の処理 (ゲームの step 中のボタン処理など) は、切り替え前のフェーズを
+    switch() の戻り値で受け取って戻すことで、内側の処理の時間を除いて集計されます。
+
+    end_frame() でフレームごとの所要時間をフェーズ別のヒストグラム (固定長の配列) に
+    加算するため、集計中にヒープ確保は発生しません。ただし CircuitPython の
+    time.monotonic_ns() は大きな整数を返すため、計測自体は一時的なヒープ確保を伴います。
+    """
+
+    def __init__(self, budget_us: int, timer_us=None):
+        """
+        Args:
+            budget_us: 1フレームの処理時間の目標 (マイクロ秒、これを超えたフレームを数える)
+            timer_us: マイクロ秒単位の時刻を返す関数 (省略時は time.monotonic_ns() から求める)
+        """
+        self.budget_us = budget_us
+        self._timer = timer_us if timer_us is not None else _monotonic_us
+        count = _FRAME + 1
+        self._histograms = [array("H", [0] * BINS) for _ in range(count)]
+        self._min = array("l", [_INT32_MAX] * count)
+        self._max = array("l", [0] * count)
+        self._sum = array("l", [0] * count)
+        self._current_frame = array("l", [0] * count)
+        self.reset()
+
+    def reset(self) -> None:
+        """集計をクリアし、計測中のフレームも現在時刻から始め直す"""
+        for histogram in self._histograms:
+            for i in range(BINS):
+                histogram[i] = 0
+        for i in range(_FRAME + 1):
+            self._min[i] = _INT32_MAX
+            self._max[i] = 0
+            self._sum[i] = 0
+            self._current_frame[i] = 0
+        self._phase = PHASE_OTHER
+        self._last = self._timer()
+        self.frames = 0
+        self.over_budget = 0
+
+    def switch(self, phase: int) -> int:
+        """
+        現在のフェーズを切り替える
+
+        Args:
+            phase: 以降の時間を加算するフェーズ (PHASE_*)
+
+        Returns:
+            int: 切り替え前のフェーズ (入れ子の処理の後で元に戻すために使う)
+        """
+        now = self._timer()
+        self._current_frame[self._phase] += now - self._last
+        self._last = now
+        previous = self._phase
+        self._phase = phase
+        return previous
+
+    def end_frame(self) -> None:
+        """現在のフレームの計測を終え、各フェーズの所要時間を集計に加える"""
+        self.switch(PHASE_OTHER)
+        current = self._current_frame
+        total = 0
+        for phase in range(_FRAME):
+            elapsed = current[phase]
+            if phase != PHASE_SLACK:
+                total += elapsed
+            self._record(phase, elapsed)
+            current[phase] = 0
+        self._record(_FRAME, total)
+        self.frames += 1
+        if total > self.budget_us:
+            self.over_budget += 1
+
+    def _record(self, index, elapsed):
+        bin_index = elapsed // BIN_US
+        if bin_index >= BINS:
+            bin_index = BINS - 1
+        self._histograms[index][bin_index] += 1
+        if elapsed < self._min[index]:
+            self._min[index] = elapsed
+        if elapsed > self._max[index]:
+            self._max[index] = elapsed
+        self._sum[index] += elapsed
+
+    def _p99(self, index):
+        """ヒストグラムから99パーセンタイル値 (区間の上端、マイクロ秒) を求める"""
+        histogram = self._histograms[index]
+        target = self.frames - self.frames // 100
+        count = 0
+        for i in range(BINS):
+            count += histogram[i]
+            if count >= target:
+                return (i + 1) * BIN_US
+        return BINS * BIN_US
+
+    def report(self, label: str = "") -> str:
+        """
+        集計結果を表示用の文字列にする (単位はミリ秒)
+
+        Args:
+            label: 見出しに付ける名前 (計測中のゲーム名など)
+        """
+        if self.frames == 0:
+            return f"Frame profile {label}: no frames"
+        lines = [
+            f"Frame profile {label}: {self.frames} frames,"
+            f" over {self.budget_us / 1000:.1f} ms: {self.over_budget}",
+            f"{'':<8}{'min':>7}{'mean':>7}{'max':>7}{'p99':>7}",
+        ]
+        for index, name in enumerate(PHASE_NAMES + ("frame",)):
+            lines.append(
+                f"{name:<8}{self._min[index] / 1000:>7.2f}"
+                f"{self._sum[index] / self.frames / 1000:>7.2f}"
+                f"{self._max[index] / 1000:>7.2f}"
+                f"{self._p99(index) / 1000:>7.1f}"
+            )
+        return "\n".join(lines)
+
+
+class ProfiledButton:
+    """
+    デバウンス処理の時間をボタン処理のフェーズとして計測する Debouncer のラッパー
+
+    ゲームが使う update() / value / fell / rose を元の Debouncer に委譲します。
+    """
+
+    def __init__(self, button, profiler: FrameProfiler):
+        self._button = button
+        self._profiler = profiler
+
+    def update(self) -> None:
+        previous = self._profiler.switch(PHASE_BUTTONS)
+        self._button.update()
+        self._profiler.switch(previous)
+
+    @property
+    def value(self) -> bool:
+        return self._button.value
+
+    @property
+    def fell(self) -> bool:
+        return self._button.fell
+
+    @property
+    def rose(self) -> bool:
+        return self._button.rose
@@ -1,3 +1,6 @@
+import random
+
+from games.clock import Clock, GameClock
 from games.device_manager import DeviceManager
 
 
@@ -5,23 +8,65 @@ class Game:
     """
     ゲームの基本インターフェース
     各ゲームはこのクラスを継承して実装する必要があります。
+
+    描画は「変化したときだけ」行います。ゲームは表示が変わる状態の変化があったときに
+    invalidate() を呼び出し、GameManager は needs_render() がTrueのフレームだけ
+    render() を呼び出して、LEDマトリクスへの転送 (matrix.show()) を1回だけ行います。
     """
 
-    def __init__(self, devices: DeviceManager):
+    def __init__(self, devices: DeviceManager, clock: Clock = None, rng=None):
+        """
+        Args:
+            devices: DeviceManager インスタンス
+            clock: ゲーム内の時間計測の元になるクロック (省略時は supervisor.ticks_ms を使う Clock)。
+                ゲームからは一時停止中に止まる GameClock (self.clock) として参照する
+            rng: ゲーム内で使う乱数生成器 (random() / randint() / choice() を持つもの。
+                省略時は random モジュール)
+        """
         self._devices = devices
+        self._clock = GameClock(clock if clock is not None else Clock())
+        self._rng = rng if rng is not None else random
         self._is_paused = False  # 一時停止状態の初期化
+        self._needs_render = True  # 前回の render() の後に表示が変化したかどうか
+        self._had_event = False  # 前回の take_event() の後に log_event() が呼び出されたかどうか
 
     @property
-    def matrix(self):
-        return self._devices.matrix
+    def clock(self) -> GameClock:
+        """ゲーム内時間のクロック (pause() で止まり、resume() で止まった時刻から再開する)"""
+        return self._clock
+
+    def call_later(self, delay: int, callback):
+        """
+        ゲーム内時間でdelayミリ秒後に callback() を1回だけ呼び出す (tick() の中で呼び出される)
+
+        Returns:
+            Timer: 登録したタイマー (cancel() で取り消せる)
+        """
+        return self._clock.call_later(delay, callback)
+
+    def call_every(self, interval: int, callback):
+        """
+        ゲーム内時間でintervalミリ秒ごとに callback() を呼び出す (tick() の中で呼び出される)
+
+        処理落ちで期限を過ぎた場合は、1回の tick() で経過した回数ぶん呼び出されます。
+
+        Returns:
+            Timer: 登録したタイマー (cancel() で取り消せる。interval を変更すると次の周期から反映される)
+        """
+        return self._clock.call_every(interval, callback)
 
     @property
-    def btn_a(self):
-        return self._devices.btn_a
+    def rng(self):
+        return self._rng
 
     @property
-    def btn_b(self):
-        return self._devices.btn_b
+    def matrix(self):
+        return self._devices.matrix
+
+    @property
+    def input(self):
+        """このステップの入力イベント (InputEvents、ボタンは BUTTON_A / BUTTON_B で指定する)"""
+        return self._devices.input.events
 
     @property
     def matrix_width(self):
@@ -31,12 +76,106 @@ class Game:
     def matrix_height(self):
         return self.matrix.rows
 
+    def invalidate(self):
+        """表示が変化したことを通知し、次のフレームで render() を呼び出させる"""
+        self._needs_render = True
+
+    def needs_render(self) -> bool:
+        """前回の render() の後に invalidate() が呼び出されたかどうか"""
+        return self._needs_render
+
+    def mark_rendered(self):
+        """render() を呼び出す前に GameManager が呼び出し、変化の通知をリセットする"""
+        self._needs_render = False
+
+    def log_event(self, message: str):
+        """
+        ステージ開始やゲームオーバーなどの状態遷移をシリアルに出力する
+
+        出力する文字列の作成はヒープを確保するため、このステップを含むフレームは
+        ヒープ確保量の計測 (AllocationTracker) の対象から外されます。
+        毎ステップ起こりうる出力には使わないでください。
+        """
+        self._had_event = True
+        print(message)
+
+    def take_event(self) -> bool:
+        """前回の呼び出しの後に log_event() が呼び出されたかどうかを返し、リセットする"""
+        had_event = self._had_event
+        self._had_event = False
+        return had_event
+
     def initialize(self):
         raise NotImplementedError("Subclasses should implement this method")
 
-    def update(self):
+    def step(self, dt):
+        """
+        ゲームロジックを1ステップ進める
+
+        メインループから固定タイムステップで呼び出されます。処理落ち時は
+        1フレームに複数回呼び出されるため、描画は行わずrender()に任せてください。
+        表示が変わる変化があった場合は invalidate() を呼び出してください。
+
+        Args:
+            dt (float): 1ステップの時間 (秒)
+        """
+        raise NotImplementedError("Subclasses should implement this method")
+
+    def tick(self, dt):
+        """
+        step() を呼び出してから、期限が来たタイマーのコールバックを呼び出す
+
+        メインループ (GameManager) はゲームを進めるときに step() ではなくこれを呼び出します。
+        タイマーはゲームごとのタイマーホイールで管理されるため、登録中のタイマーが
+        いくつあっても、1ステップの処理量は期限が来たタイマーの数にしか比例しません。
+        コールバックは step() の後に呼び出されるため、同じステップの入力を処理した後の
+        状態を前提にできます。
+
+        Args:
+            dt (float): 1ステップの時間 (秒)
+        """
+        self.step(dt)
+        self._clock.run_due()
+
+    def render(self):
+        """
+        現在のゲーム状態を描画する
+
+        needs_render() がTrueのフレームに1回だけ呼び出されます (ゲーム選択中は
+        呼び出されません)。処理落ち時は途中のステップの描画が省略されるため、
+        ゲーム状態を変更しないでください。LEDマトリクスへの転送は呼び出し側が
+        まとめて行うため、matrix.show() は呼び出さないでください
+        (7セグメントディスプレイは DeviceManager.show_number() などが転送します)。
+        """
         raise NotImplementedError("Subclasses should implement this method")
 
+    def update(self, dt):
+        """
+        1フレーム分の更新 (tick()を呼び出し、表示が変化していればrender()と転送を行う)
+
+        GameManager を介さずにゲームを実行する場合 (ホストのベンチマークなど) に使います。
+
+        Args:
+            dt (float): 1ステップの時間 (秒)
+        """
+        self.tick(dt)
+        if self._needs_render:
+            self._needs_render = False
+            self.render()
+            self.matrix.show()
+
+    def redraw(self):
+        """
+        LEDマトリクスと7セグメントディスプレイを現在のゲーム状態で描き直す
+
+        一時停止中に他の表示で上書きされた後 (ゲーム選択やプールからの復帰時) に
+        再開してから呼び出されます。デフォルト実装では invalidate() を呼び出し、
+        次のフレームの render() で描き直させます。render() が描画しない状態
+        (ゲームオーバー後など) があるゲームや、7セグメントディスプレイの表示を
+        持つゲームはオーバーライドしてください。
+        """
+        self.invalidate()
+
     def finalize(self):
         raise NotImplementedError("Subclasses should implement this method")
 
@@ -45,11 +184,13 @@ class Game:
         ゲームを一時停止
 
         ゲーム選択機能で使用されます。
-        デフォルト実装では一時停止状態フラグを設定し、LEDマトリクスの表示を維持します。
-        必要に応じてサブクラスでオーバーライドしてください。
+        デフォルト実装では一時停止状態フラグを設定してゲーム内時間 (self.clock) を止め、
+        LEDマトリクスの表示を維持します。ゲームの時刻はすべて self.clock で計測していれば
+        再開時の補正は不要です。必要に応じてサブクラスでオーバーライドしてください。
         """
-        # 一時停止状態フラグを設定
+        # 一時停止状態フラグを設定し、ゲーム内時間を止める
         self._is_paused = True
+        self._clock.pause()
 
         # LEDマトリクスの現在の表示状態を保存
         # 表示は維持されるため、特別な処理は不要
@@ -59,11 +200,12 @@ class Game:
         ゲームを再開
 
         ゲーム選択機能で使用されます。
-        デフォルト実装では一時停止状態フラグを解除し、ゲーム状態を保持します。
-        必要に応じてサブクラスでオーバーライドしてください。
+        デフォルト実装では一時停止状態フラグを解除してゲーム内時間を止めた時刻から再開し、
+        ゲーム状態を保持します。必要に応じてサブクラスでオーバーライドしてください。
         """
-        # 一時停止状態フラグを解除
+        # 一時停止状態フラグを解除し、ゲーム内時間を再開
         self._is_paused = False
+        self._clock.resume()
 
         # ゲーム状態は保持される
         # サブクラスで必要に応じて追加の復帰処理を実装
@@ -0,0 +1,102 @@
+import gc
+
+from games.clock import Clock
+
+
+class GcScheduler:
+    """
+    フレームの待機時間 (スラック) にガベージコレクションを行うスケジューラ
+
+    CircuitPython はヒープが一杯になった時点で自動的にGCを行うため、放っておくと
+    ゲームの更新処理の途中 (ジャンプ中やパドル移動中) に数ミリ秒の停止が入ります。
+    メインループが毎フレームの待機前に collect_if_due() を呼び出し、空きヒープが
+    min_free を下回っていて、残りの待機時間に直近のGCの所要時間が収まる場合に
+    gc.collect() を行うことで、ヒープが一杯になる前に待機時間の中で回収します。
+
+    空きヒープが min_free の半分を下回った場合は、待機時間が足りなくてもその場で
+    回収します (フレームは遅れますが、ゲームの更新処理の途中での停止は避けられます)。
+    gc.mem_free() が無い環境 (CircuitPython以外) では何もしません。
+    """
+
+    def __init__(
+        self,
+        min_free: int,
+        initial_cost_ms: int = 5,
+        margin_ms: int = 1,
+        clock: Clock = None,
+        mem_free=None,
+        collect=None,
+    ):
+        """
+        Args:
+            min_free: 空きヒープがこれを下回ったら待機時間にGCを行う (バイト)
+            initial_cost_ms: 最初に計測するまでのGCの所要時間の見積もり (ミリ秒)
+            margin_ms: 待機時間に残しておく余裕 (ミリ秒)
+            clock: 所要時間の計測に使うクロック (省略時は Clock)
+            mem_free: 空きヒープ量を返す関数 (省略時は gc.mem_free)
+            collect: GCを行う関数 (省略時は gc.collect)
+        """
+        self.min_free = min_free
+        self.margin_ms = margin_ms
+        self.cost_ms = initial_cost_ms  # GCの所要時間の見積もり (ミリ秒)
+        self._clock = clock if clock is not None else Clock()
+        self._mem_free = (
+            mem_free if mem_free is not None else getattr(gc, "mem_free", None)
+        )
+        self._collect = collect if collect is not None else gc.collect
+        self.reset_stats()
+
+    @property
+    def enabled(self) -> bool:
+        """空きヒープ量を取得できる (スケジュールできる) かどうか"""
+        return self._mem_free is not None
+
+    def reset_stats(self) -> None:
+        """報告用の集計をクリアする"""
+        self.collections = 0  # 待機時間内に収まったGCの回数
+        self.forced = 0  # 待機時間が足りないまま行ったGCの回数
+        self.total_ms = 0
+        self.max_ms = 0
+
+    def collect_if_due(self, slack_ms: int) -> bool:
+        """
+        必要であればGCを行う
+
+        Args:
+            slack_ms: 次のフレームまでの残りの待機時間 (ミリ秒)
+
+        Returns:
+            bool: GCを行った場合はTrue
+        """
+        if self._mem_free is None:
+            return False
+        fits = slack_ms >= self.cost_ms + self.margin_ms
+        free = self._mem_free()
+        if free >= self.min_free:
+            return False
+        if not fits and free >= self.min_free // 2:
+            # まだ余裕があるので、待機時間が十分にあるフレームまで待つ
+            return False
+
+        start = self._clock.now()
+        self._collect()
+        elapsed = self._clock.elapsed(start)
+
+        # 見積もりは急に遅くなった場合にすぐ追従し、速くなった場合はゆっくり下げる
+        self.cost_ms = max(elapsed, (self.cost_ms * 7 + elapsed) // 8)
+        if fits:
+            self.collections += 1
+        else:
+            self.forced += 1
+        self.total_ms += elapsed
+        if elapsed > self.max_ms:
+            self.max_ms = elapsed
+        return True
+
+    def report(self) -> str:
+        """集計結果を表示用の文字列にする"""
+        return (
+            f"GC: {self.collections} in slack, {self.forced} forced,"
+            f" total {self.total_ms} ms (max {self.max_ms} ms,"
+            f" estimate {self.cost_ms} ms)"
+        )
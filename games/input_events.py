@@ -0,0 +1,216 @@
+from games.clock import Clock
+
+BUTTON_A = 0
+BUTTON_B = 1
+
+# ボタンごとのイベントのビット (ボタン番号 * 4 だけ左シフトして使う)
+_PRESS = 0x01
+_RELEASE = 0x02
+_LONG = 0x04
+_REPEAT = 0x08
+_BUTTON_EVENTS = _PRESS | _RELEASE | _LONG | _REPEAT
+_BUTTON_SHIFT = 4
+_BOTH = 0x100
+
+
+class InputEvents:
+    """
+    1ステップ分の入力イベント
+
+    InputService.poll() がステップごとに内容を書き換えます (ヒープ確保を避けるため
+    同じオブジェクトを使い回します)。ゲームからは読み取り専用として扱ってください。
+    """
+
+    def __init__(self):
+        self._flags = 0
+        self._held = 0  # 押されているボタンのビット (ビットiがボタンi)
+        self._rotation = 0
+
+    def pressed(self, button: int) -> bool:
+        """このステップでボタンが押されたかどうか"""
+        return bool(self._flags & (_PRESS << (button * _BUTTON_SHIFT)))
+
+    def released(self, button: int) -> bool:
+        """このステップでボタンが離されたかどうか"""
+        return bool(self._flags & (_RELEASE << (button * _BUTTON_SHIFT)))
+
+    def held(self, button: int) -> bool:
+        """ボタンが押されたままかどうか"""
+        return bool(self._held & (1 << button))
+
+    def long_pressed(self, button: int) -> bool:
+        """このステップでボタンの長押しが成立したかどうか (押している間に1回だけ)"""
+        return bool(self._flags & (_LONG << (button * _BUTTON_SHIFT)))
+
+    def repeated(self, button: int) -> bool:
+        """このステップでボタンが押された、または押し続けによるオートリピートが発生したかどうか"""
+        return bool(self._flags & ((_PRESS | _REPEAT) << (button * _BUTTON_SHIFT)))
+
+    @property
+    def both_pressed(self) -> bool:
+        """このステップで両ボタンが押されている状態になったかどうか"""
+        return bool(self._flags & _BOTH)
+
+    @property
+    def rotation(self) -> int:
+        """このステップでのエンコーダーの回転量 (0=回転なし、正=時計回り、負=反時計回り)"""
+        return self._rotation
+
+
+class InputService:
+    """
+    ボタンとエンコーダーを1ステップに1回だけ読み取り、入力イベントを発行するクラス
+
+    メインループがゲームのステップの前に poll() を呼び出し、ゲームとゲーム選択は
+    events の内容だけを参照します。デバウンス処理をここに集約することで、
+    処理の経路によってボタンが1ステップに2回更新されたり、まったく更新されずに
+    押下を取りこぼしたりすることがなくなります。
+
+    両ボタン同時押し (both_pressed) は、fell同士 (押した瞬間) の一致ではなく
+    「両方押されている」状態への遷移で判定するため、押下が同一ステップに
+    揃わなくても成立します。
+    """
+
+    def __init__(
+        self,
+        btn_a,
+        btn_b,
+        clock: Clock = None,
+        long_press_ms: int = 800,
+        repeat_delay_ms: int = 400,
+        repeat_interval_ms: int = 100,
+    ):
+        """
+        Args:
+            btn_a, btn_b: ボタン (Debouncer と同じインターフェース)
+            clock: 長押し・オートリピートの時間計測に使うクロック (省略時は Clock)
+            long_press_ms: 長押しと判定するまでの時間 (ミリ秒)
+            repeat_delay_ms: 押してからオートリピートが始まるまでの時間 (ミリ秒)
+            repeat_interval_ms: オートリピートの間隔 (ミリ秒)
+        """
+        self._buttons = [btn_a, btn_b]
+        self._clock = clock if clock is not None else Clock()
+        self.long_press_ms = long_press_ms
+        self.repeat_delay_ms = repeat_delay_ms
+        self.repeat_interval_ms = repeat_interval_ms
+        self._encoder = None
+        self._profiler = None
+        self._profile_phase = 0
+        self._pressed_at = [0, 0]  # ボタンごとの押した時刻 (ティック値)
+        self._next_repeat = [0, 0]  # ボタンごとの次のオートリピートの時刻 (ティック値)
+        # ボタンごとの長押し判定が済んでいないかどうか (押した時点でTrue、判定後・離した時点でFalse)
+        self._long_pending = [False, False]
+        # ボタンごとのオートリピート中かどうか (起動前から押されていたボタンはリピートしない)
+        self._repeating = [False, False]
+        self._both_held = False
+        # 離すまでイベントを発行しないボタンのビット (consume() で設定、ビットiがボタンi)
+        self._consumed = 0
+        self._events = InputEvents()
+
+    @property
+    def events(self) -> InputEvents:
+        """直近の poll() で発行された入力イベント"""
+        return self._events
+
+    def set_buttons(self, btn_a, btn_b) -> None:
+        """読み取るボタンを差し替える (プロファイラ・入力の記録/再生用のラッパーなど)"""
+        self._buttons[0] = btn_a
+        self._buttons[1] = btn_b
+
+    def set_encoder(self, encoder_manager) -> None:
+        """回転量を読み取るエンコーダー (EncoderManager) を設定する"""
+        self._encoder = encoder_manager
+
+    def set_profiler(self, profiler) -> None:
+        """エンコーダーの読み取り時間を計測するフレームプロファイラを設定する"""
+        from games.frame_profiler import PHASE_ENCODER
+
+        self._profiler = profiler
+        self._profile_phase = PHASE_ENCODER
+
+    def consume(self, button: int) -> None:
+        """
+        押されているボタンの残りのイベントを、ボタンを離すまで発行しないようにする
+
+        ゲーム選択がボタンの押下で操作を終えてゲームに制御を戻す時に呼び出し、
+        同じ押下の離す・長押し・オートリピートがゲームの操作として扱われないようにします。
+        離すまでの間は held() もFalseになります。
+
+        Args:
+            button: ボタン番号 (BUTTON_A / BUTTON_B)
+        """
+        if self._events._held & (1 << button):
+            self._consumed |= 1 << button
+
+    def poll(self) -> None:
+        """ボタンとエンコーダーを読み取り、このステップの入力イベントを更新する"""
+        now = self._clock.now()
+        flags = 0
+        held = 0
+        for index in range(2):
+            button = self._buttons[index]
+            button.update()
+            shift = index * _BUTTON_SHIFT
+            # ボタンはプルアップのため、押している間は値がFalseになる
+            is_held = not button.value
+            # keypad のボタンは1ステップ内の押下と離すのを両方報告することがあるため、
+            # 長押し・オートリピートの状態はステップの終わりに押されているかどうかで決める
+            if button.fell:
+                flags |= _PRESS << shift
+                if is_held:
+                    self._pressed_at[index] = now
+                    self._next_repeat[index] = self._clock.add(
+                        now, self.repeat_delay_ms
+                    )
+                    self._long_pending[index] = True
+                    self._repeating[index] = True
+            if button.rose:
+                flags |= _RELEASE << shift
+                if not is_held:
+                    self._long_pending[index] = False
+                    self._repeating[index] = False
+
+            if is_held:
+                held |= 1 << index
+                if self._long_pending[index] and (
+                    self._clock.diff(now, self._pressed_at[index]) >= self.long_press_ms
+                ):
+                    flags |= _LONG << shift
+                    self._long_pending[index] = False
+                if self._repeating[index] and (
+                    self._clock.diff(now, self._next_repeat[index]) >= 0
+                ):
+                    flags |= _REPEAT << shift
+                    self._next_repeat[index] = self._clock.add(
+                        self._next_repeat[index], self.repeat_interval_ms
+                    )
+
+            # consume() されたボタンは、離すまでイベントを発行しない
+            if self._consumed & (1 << index):
+                flags &= ~(_BUTTON_EVENTS << shift)
+                if is_held:
+                    held &= ~(1 << index)
+                else:
+                    self._consumed &= ~(1 << index)
+
+        both_held = held == 0x03
+        if both_held and not self._both_held:
+            flags |= _BOTH
+        self._both_held = both_held
+
+        events = self._events
+        events._flags = flags
+        events._held = held
+        events._rotation = self._read_rotation()
+
+    def _read_rotation(self):
+        encoder = self._encoder
+        if encoder is None:
+            return 0
+        profiler = self._profiler
+        if profiler is None:
+            return encoder.check_rotation()
+        previous = profiler.switch(self._profile_phase)
+        rotation = encoder.check_rotation()
+        profiler.switch(previous)
+        return rotation
@@ -0,0 +1,317 @@
+import binascii
+
+# 入力ログのファイル形式:
+#   ヘッダ (12バイト): マジック "INPL"、バージョン、フラグ、予約 (2バイト)、
+#       ゲームの乱数のシード (32ビット、リトルエンディアン、FLAG_SEEDED の場合のみ有効)
+#   レコード (4バイト): ステップ番号 (24ビット、リトルエンディアン)、イベント (1バイト)
+# イベントの上位ビットが0ならボタンの変化 (ビット0: ボタン番号、ビット1: 押した=1 / 離した=0)、
+# 1ならエンコーダーの回転量 (下位7ビットの符号付き整数)。
+MAGIC = b"INPL"
+VERSION = 2
+HEADER_SIZE = 12
+RECORD_SIZE = 4
+FLAG_WRAPPED = 0x01  # リングバッファが一周して古いイベントが失われている
+FLAG_SEEDED = 0x02  # ヘッダにゲームの乱数のシードが記録されている
+
+_EVENT_PRESSED = 0x02
+_EVENT_ROTATION = 0x80
+_FRAME_MASK = 0xFFFFFF
+_MAX_DELTA = 63
+_MIN_DELTA = -64
+
+
+class InputLog:
+    """
+    ボタンのデバウンス後の変化とエンコーダーの回転量をステップ番号付きで記録するログ
+
+    固定長のリングバッファ (bytearray) に4バイトずつ記録するため、記録中に
+    ヒープ確保は発生しません。容量を超えると古いイベントから上書きされます。
+    ステップ番号はメインループが GameSelector.step() を呼ぶたびに end_frame() で進めます。
+    再生時にゲームの乱数列も同じにするため、記録時のシードをヘッダに保存します。
+    """
+
+    def __init__(self, capacity: int = 1024, seed: int = None):
+        """
+        Args:
+            capacity: 保持するイベント数の上限
+            seed: 記録中のゲームの乱数のシード (Noneなら記録しない。その場合は再生できない)
+        """
+        self.capacity = capacity
+        self.seed = seed
+        self._buffer = bytearray(capacity * RECORD_SIZE)
+        self._head = 0  # 次に書き込むレコードの位置
+        self.count = 0  # 保持しているイベント数
+        self.dropped = 0  # 上書きで失われたイベント数
+        self.frame = 0  # 現在のステップ番号
+
+    def end_frame(self) -> None:
+        """1ステップ分の記録を終え、ステップ番号を進める"""
+        self.frame += 1
+
+    def record_button(self, button: int, pressed: bool) -> None:
+        """ボタンの変化を記録する (button は BUTTON_A / BUTTON_B)"""
+        self._append(button | (_EVENT_PRESSED if pressed else 0))
+
+    def record_rotation(self, delta: int) -> None:
+        """エンコーダーの回転量を記録する (1レコードに収まらない回転量は分割する)"""
+        while delta != 0:
+            part = max(_MIN_DELTA, min(_MAX_DELTA, delta))
+            self._append(_EVENT_ROTATION | (part & 0x7F))
+            delta -= part
+
+    def _append(self, event):
+        buffer = self._buffer
+        offset = self._head * RECORD_SIZE
+        frame = self.frame & _FRAME_MASK
+        buffer[offset] = frame & 0xFF
+        buffer[offset + 1] = (frame >> 8) & 0xFF
+        buffer[offset + 2] = frame >> 16
+        buffer[offset + 3] = event
+        self._head += 1
+        if self._head == self.capacity:
+            self._head = 0
+        if self.count < self.capacity:
+            self.count += 1
+        else:
+            self.dropped += 1
+
+    def to_bytes(self) -> bytes:
+        """ヘッダ付きで、古いイベントから順に並べたログを返す"""
+        flags = FLAG_WRAPPED if self.dropped else 0
+        seed = 0
+        if self.seed is not None:
+            flags |= FLAG_SEEDED
+            seed = self.seed & 0xFFFFFFFF
+        header = MAGIC + bytes(
+            (
+                VERSION,
+                flags,
+                0,
+                0,
+                seed & 0xFF,
+                (seed >> 8) & 0xFF,
+                (seed >> 16) & 0xFF,
+                seed >> 24,
+            )
+        )
+        start = (self._head - self.count) % self.capacity * RECORD_SIZE
+        end = start + self.count * RECORD_SIZE
+        if end <= len(self._buffer):
+            records = self._buffer[start:end]
+        else:
+            records = self._buffer[start:] + self._buffer[: end - len(self._buffer)]
+        return header + bytes(records)
+
+    def save(self, path: str) -> None:
+        """
+        ログをファイルに保存する
+
+        CIRCUITPY ドライブが PC から書き込み可能な状態 (通常の状態) では
+        CircuitPython から書き込めないため、その場合は16進文字列でシリアルに出力します。
+        load_input_log() はどちらの形式も読み込めます。
+        """
+        data = self.to_bytes()
+        try:
+            with open(path, "wb") as f:
+                f.write(data)
+            print(f"Input log saved to {path} ({self.count} events)")
+        except OSError:
+            print(f"Input log: {binascii.hexlify(data).decode()}")
+
+
+def load_input_log(path: str) -> bytes:
+    """
+    保存した入力ログ (バイナリ、または InputLog.save() が出力した16進文字列) を読み込む
+
+    Returns:
+        bytes: ヘッダ付きのログ (InputPlayer に渡す)
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    if not data.startswith(MAGIC):
+        data = binascii.unhexlify(data.strip())
+    if not data.startswith(MAGIC) or data[4] != VERSION:
+        raise ValueError(f"Not an input log: {path}")
+    if data[5] & FLAG_WRAPPED:
+        print("Warning: input log wrapped, the oldest events are missing")
+    return data
+
+
+def input_log_seed(data: bytes):
+    """
+    入力ログのヘッダから記録時のゲームの乱数のシードを読み出す
+
+    Returns:
+        int or None: シード (記録されていなければNone)
+    """
+    if not data[5] & FLAG_SEEDED:
+        return None
+    return data[8] | (data[9] << 8) | (data[10] << 16) | (data[11] << 24)
+
+
+class InputPlayer:
+    """
+    入力ログを再生し、各ステップのボタンの状態とエンコーダーの位置を再現する
+
+    ReplayButton / ReplayEncoder がここから状態を読み出します。ステップ番号は
+    記録時と同じく、メインループが GameSelector.step() を呼ぶたびに end_frame() で進めます。
+    """
+
+    def __init__(self, data: bytes):
+        """
+        Args:
+            data: ヘッダ付きのログ (InputLog.to_bytes() / load_input_log() の戻り値)
+        """
+        self._data = data
+        self._offset = HEADER_SIZE
+        self.frame = 0
+        self.position = 0  # エンコーダーの位置 (回転量の累計)
+        self._pressed = [False, False]  # ボタンごとの押下状態
+        self._edges = 0  # 現在のステップのボタンの変化 (ボタンごとに2ビット: 押した、離した)
+        self._apply()
+
+    @property
+    def finished(self) -> bool:
+        """全イベントを再生し終えたかどうか"""
+        return self._offset >= len(self._data)
+
+    def is_pressed(self, button: int) -> bool:
+        """現在のステップでボタンが押されているかどうか"""
+        return self._pressed[button]
+
+    def pressed_in_frame(self, button: int) -> bool:
+        """現在のステップでボタンが押されたかどうか"""
+        return bool(self._edges & (1 << (button * 2)))
+
+    def released_in_frame(self, button: int) -> bool:
+        """現在のステップでボタンが離されたかどうか"""
+        return bool(self._edges & (2 << (button * 2)))
+
+    def end_frame(self) -> None:
+        """ステップ番号を進め、そのステップのイベントを反映する"""
+        self.frame += 1
+        self._edges = 0
+        self._apply()
+
+    def _apply(self):
+        data = self._data
+        frame = self.frame & _FRAME_MASK
+        while self._offset < len(data):
+            offset = self._offset
+            record_frame = data[offset] | (data[offset + 1] << 8) | (data[offset + 2] << 16)
+            if record_frame != frame:
+                break
+            event = data[offset + 3]
+            if event & _EVENT_ROTATION:
+                delta = event & 0x7F
+                if delta & 0x40:
+                    delta -= 0x80
+                self.position += delta
+            else:
+                button = event & 0x01
+                pressed = bool(event & _EVENT_PRESSED)
+                self._pressed[button] = pressed
+                self._edges |= (1 if pressed else 2) << (button * 2)
+            self._offset += RECORD_SIZE
+
+
+class RecordingButton:
+    """
+    デバウンス後の変化を InputLog に記録する Debouncer のラッパー
+
+    ゲームが使う update() / value / fell / rose を元の Debouncer に委譲します。
+    """
+
+    def __init__(self, button, log: InputLog, index: int):
+        self._button = button
+        self._log = log
+        self._index = index
+
+    def update(self) -> None:
+        button = self._button
+        button.update()
+        # ボタンはプルアップのため、押すと値がFalseになる (fell)
+        if button.fell and button.rose:
+            # 1ステップ内に押して離した (または離して押し直した) 場合は、
+            # 最後の状態が後になるよう両方を記録する
+            pressed = not button.value
+            self._log.record_button(self._index, not pressed)
+            self._log.record_button(self._index, pressed)
+        elif button.fell:
+            self._log.record_button(self._index, True)
+        elif button.rose:
+            self._log.record_button(self._index, False)
+
+    @property
+    def value(self) -> bool:
+        return self._button.value
+
+    @property
+    def fell(self) -> bool:
+        return self._button.fell
+
+    @property
+    def rose(self) -> bool:
+        return self._button.rose
+
+
+class ReplayButton:
+    """
+    入力ログの状態を Debouncer と同じインターフェースで返すボタン
+
+    Debouncer と同様に、値と変化 (fell / rose) は update() を呼んだ時点で更新されます。
+    1ステップ内に押して離した記録は、fell と rose の両方として再生されます。
+    """
+
+    def __init__(self, player: InputPlayer, index: int):
+        self._player = player
+        self._index = index
+        self._value = True
+        self._fell = False
+        self._rose = False
+
+    def update(self) -> None:
+        player = self._player
+        self._value = not player.is_pressed(self._index)
+        self._fell = player.pressed_in_frame(self._index)
+        self._rose = player.released_in_frame(self._index)
+
+    @property
+    def value(self) -> bool:
+        return self._value
+
+    @property
+    def fell(self) -> bool:
+        return self._fell
+
+    @property
+    def rose(self) -> bool:
+        return self._rose
+
+
+class RecordingEncoder:
+    """位置が読み出されるたびに前回からの回転量を InputLog に記録するエンコーダーのラッパー"""
+
+    def __init__(self, encoder, log: InputLog):
+        self._encoder = encoder
+        self._log = log
+        self._last = encoder.position
+
+    @property
+    def position(self) -> int:
+        position = self._encoder.position
+        if position != self._last:
+            self._log.record_rotation(position - self._last)
+            self._last = position
+        return position
+
+
+class ReplayEncoder:
+    """入力ログの回転量の累計を位置として返すエンコーダー"""
+
+    def __init__(self, player: InputPlayer):
+        self._player = player
+
+    @property
+    def position(self) -> int:
+        return self._player.position
@@ -1,6 +1,5 @@
-import random
-import time
 from games.game_interface import Game
+from games.input_events import BUTTON_A, BUTTON_B
 
 
 class Obstacle:
@@ -11,6 +10,10 @@ class Obstacle:
     TALL = "tall"  # プレイヤーの高さ全体を塞ぐ障害物 (しゃがみ+ジャンプの大ジャンプでのみ回避可)
 
     def __init__(self, kind: str, x: int, rows):
+        self.reset(kind, x, rows)
+
+    def reset(self, kind: str, x: int, rows):
+        """障害物を作り直す (生成のたびにオブジェクトを確保しないよう使い回す)"""
         self.kind = kind
         self.x = x
         self.rows = rows  # 占有するY座標のリスト
@@ -50,16 +53,16 @@ class JumpRunnerGame(Game):
     NORMAL_JUMP_MAX_OFFSET = 3
     # 大ジャンプ (しゃがみ中にA): プレイヤー全高の障害物もクリアできる高さ
     BIG_JUMP_MAX_OFFSET = 6
-    JUMP_DURATION = 0.45  # ジャンプ1回の所要時間 (秒、通常・大ジャンプ共通)
+    JUMP_DURATION = 450  # ジャンプ1回の所要時間 (ミリ秒、通常・大ジャンプ共通)
 
     JUMP_KIND_NORMAL = "normal"
     JUMP_KIND_BIG = "big"
 
-    # 障害物1マス移動あたりの間隔。初期値は「安全にジャンプで避けられる時間」より
+    # 障害物1マス移動あたりの間隔 (ミリ秒)。初期値は「安全にジャンプで避けられる時間」より
     # 短く設定し、加速してもジャンプの避けやすさが極端に損なわれないようにする。
-    INITIAL_OBSTACLE_INTERVAL = 0.25
-    MIN_OBSTACLE_INTERVAL = 0.12
-    SPEEDUP_FACTOR = 1.08
+    INITIAL_OBSTACLE_INTERVAL = 250
+    MIN_OBSTACLE_INTERVAL = 120
+    SPEEDUP_PERCENT = 108  # 障害物の生成ごとに間隔を 100/108 倍にする (整数演算で計算)
 
     # 障害物出現時にTALL(プレイヤー全高)が選ばれる確率。他は地上/空中で等分。
     TALL_OBSTACLE_PROBABILITY = 0.15
@@ -79,8 +82,8 @@ class JumpRunnerGame(Game):
     # 大ジャンプの上昇〜下降の間ずっと安全な区間を確保する。
     TALL_GAP_MARGIN = 2
 
-    def __init__(self, devices):
-        super().__init__(devices)
+    def __init__(self, devices, clock=None, rng=None):
+        super().__init__(devices, clock, rng)
 
     def initialize(self):
         # ゲーム状態の初期化
@@ -101,34 +104,45 @@ class JumpRunnerGame(Game):
         self.tall_rows = list(
             range(self.head_y - self.NORMAL_JUMP_MAX_OFFSET + 1, self.matrix_height)
         )
+        # 地上 / 空中の障害物が占有するY座標 (生成のたびにリストを作らないよう共有する)
+        self.ground_rows = [self.ground_y]
+        self.head_rows = [self.head_y]
 
-        # ゲームオーバー時のリセット判定 (両ボタン同時押し検出用)
-        self._both_pressed_prev = False
+        # プレイヤーが占有するY座標 (update_player_rows() が毎回書き換える)
+        self.player_rows = bytearray(2)
 
         # ジャンプ状態
         self.is_jumping = False
-        self.jump_start_time = 0.0
+        self.jump_start_time = 0
         self.jump_offset = 0
         self.jump_kind = self.JUMP_KIND_NORMAL
+        # 前回 invalidate() した時点のプレイヤーの姿勢 (jump_offset * 2 + しゃがみ中なら1)
+        self._pose = -1
 
         # 画面上部の壁 (wall_xがNoneなら非表示)。地上/空中の障害物とは独立に出現する。
-        # wall_patternは列ごとの深さのリストで、洞窟の天井のようなギザギザ形状を作る。
+        # wall_patternは列ごとの深さの配列で、洞窟の天井のようなギザギザ形状を作る。
         # wall_x は wall_pattern[0] が現在いる列 (以降 wall_pattern[j] は wall_x - j の列)。
+        # 壁が出現するたびに中身だけを書き換えて使い回す。
         self.wall_x = None
-        self.wall_pattern = None
+        self.wall_pattern = bytearray(self.WALL_PATTERN_WIDTH)
 
         # 障害物
         self.obstacle = None
         self.obstacle_interval = self.INITIAL_OBSTACLE_INTERVAL
         self.score = 0
-        self.last_move_time = time.monotonic()
+        # obstacle_intervalミリ秒ごとに1列スクロールするタイマー。再スタート時は前回の分を取り消す
+        self.clock.cancel_all()
+        self.move_timer = self.call_every(self.obstacle_interval, self.move_world)
         self.spawn_obstacle(initial=True)
 
         self.update_score_display()
 
+        # 次のフレームで画面全体を描画させる
+        self.invalidate()
+
     def spawn_obstacle(self, initial: bool = False):
         # 新しい障害物を生成 (地上 / 空中 / まれにプレイヤー全高)
-        r = random.random()
+        r = self.rng.random()
         if r < self.TALL_OBSTACLE_PROBABILITY:
             kind = Obstacle.TALL
             rows = self.tall_rows
@@ -138,24 +152,28 @@ class JumpRunnerGame(Game):
             1.0 - self.TALL_OBSTACLE_PROBABILITY
         ) / 2:
             kind = Obstacle.GROUND
-            rows = [self.ground_y]
+            rows = self.ground_rows
         else:
             kind = Obstacle.AIR
-            rows = [self.head_y]
+            rows = self.head_rows
 
-        self.obstacle = Obstacle(kind, self.matrix_width - 1, rows)
+        if self.obstacle is None:
+            self.obstacle = Obstacle(kind, self.matrix_width - 1, rows)
+        else:
+            self.obstacle.reset(kind, self.matrix_width - 1, rows)
 
         # 初期生成時は加速しない
         if not initial:
             self.obstacle_interval = max(
                 self.MIN_OBSTACLE_INTERVAL,
-                self.obstacle_interval / self.SPEEDUP_FACTOR,
+                self.obstacle_interval * 100 // self.SPEEDUP_PERCENT,
             )
+            self.move_timer.interval = self.obstacle_interval
 
     def update_score_display(self):
-        self._devices.show_text(str(self.score))
+        self._devices.show_number(self.score)
 
-    def update(self):
+    def step(self, dt):
         # 一時停止中は更新処理をスキップ
         if self.is_paused:
             return
@@ -163,62 +181,62 @@ class JumpRunnerGame(Game):
         if not self.is_running:
             if not self.score_shown:
                 self.score_shown = True
-                print(f"Game over. score = {self.score}\n")
-                self.show_game_over()
-
-                # 大ジャンプ (Bを押しながらA) の失敗で衝突した場合、
-                # 衝突した瞬間は両ボタンがまだ押されたままになっている。
-                # このままだと「両方押されている状態への遷移」が即成立して
-                # 意図せず即リセットされてしまうため、ゲームオーバーに
-                # 入った直後は一度両方離されるまでリセット判定を無効化する。
-                self._both_pressed_prev = True
+                self.log_event(f"Game over. score = {self.score}\n")
 
             # 以降は何も表示しないが、両ボタン同時押しで再スタート可能。
-            # fell同士 (押した瞬間) の一致で判定すると、両ボタンの押下が
-            # 同一フレームに揃わない限りリセットされずタイミングがシビアに
-            # なるため、代わりに「両方押されている」状態への遷移で判定する。
-            self.btn_a.update()
-            self.btn_b.update()
-            both_pressed = not self.btn_a.value and not self.btn_b.value
-            if both_pressed and not self._both_pressed_prev:
-                self._both_pressed_prev = both_pressed
+            # both_pressed は「両方押されている」状態への遷移で成立するため、
+            # 大ジャンプ (Bを押しながらA) の失敗で衝突した場合は一度離すまで成立しない。
+            if self.input.both_pressed:
                 self.initialize()
-                return
-            self._both_pressed_prev = both_pressed
             return
 
         self.handle_input()
         self.update_jump()
-        self.move_world()
+
+        # ジャンプの高さ・しゃがみが変わった場合だけ再描画する
+        # (スクロールは step() の後に move_timer のコールバック (move_world) で行い、
+        # ゲームオーバーになった場合も含めてそこで再描画させる)
+        pose = self.jump_offset * 2 + (1 if self.is_crouching() else 0)
+        if pose != self._pose:
+            self._pose = pose
+            self.invalidate()
+
+    def render(self):
+        # 一時停止中は表示を維持 (ゲームオーバー後は invalidate() されないため描画されない)
+        if self.is_paused:
+            return
+
         self.refresh()
 
-    def handle_input(self):
-        self.btn_a.update()
-        self.btn_b.update()
+    def redraw(self):
+        # 得点表示と画面全体を描き直す
+        self.update_score_display()
+        self.invalidate()
 
+    def handle_input(self):
         # 緑ボタン (A) でジャンプ開始 (ジャンプ中は不可)
         # このとき赤ボタン (B) を押していれば大ジャンプになる
-        if self.btn_a.fell and not self.is_jumping:
-            crouch_held = not self.btn_b.value
+        if self.input.pressed(BUTTON_A) and not self.is_jumping:
+            crouch_held = self.input.held(BUTTON_B)
             self.jump_kind = (
                 self.JUMP_KIND_BIG if crouch_held else self.JUMP_KIND_NORMAL
             )
             self.is_jumping = True
-            self.jump_start_time = time.monotonic()
+            self.jump_start_time = self.clock.now()
 
     def is_crouching(self) -> bool:
         # 赤ボタン (B) を押している間だけしゃがむ (ジャンプ中は不可)
-        return not self.is_jumping and not self.btn_b.value
+        return not self.is_jumping and self.input.held(BUTTON_B)
 
     def update_jump(self):
         if not self.is_jumping:
             self.jump_offset = 0
             return
 
-        elapsed = time.monotonic() - self.jump_start_time
-        frac = elapsed / self.JUMP_DURATION
+        elapsed = self.clock.elapsed(self.jump_start_time)
+        duration = self.JUMP_DURATION
 
-        if frac >= 1.0:
+        if elapsed >= duration:
             self.is_jumping = False
             self.jump_offset = 0
             return
@@ -229,17 +247,25 @@ class JumpRunnerGame(Game):
             else self.NORMAL_JUMP_MAX_OFFSET
         )
 
-        # 三角波でジャンプの上昇・下降を表現
-        if frac < 0.5:
-            self.jump_offset = round(max_offset * (frac / 0.5))
+        # 三角波でジャンプの上昇・下降を表現 (整数演算で四捨五入)
+        if 2 * elapsed < duration:
+            rising = elapsed
         else:
-            self.jump_offset = round(max_offset * ((1.0 - frac) / 0.5))
+            rising = duration - elapsed
+        self.jump_offset = (2 * max_offset * rising + duration // 2) // duration
 
     def move_world(self):
-        now = time.monotonic()
-        if now - self.last_move_time < self.obstacle_interval:
+        # move_timer のコールバック。処理落ち等でステップ間に複数回ぶんの時間が
+        # 経過していた場合は、1回の tick() でその回数ぶん呼び出されてスクロールと
+        # 衝突判定を繰り返し、途中で衝突したらタイマーを止める。
+        if not self.is_running:
+            self.move_timer.cancel()
             return
-        self.last_move_time = now
+        self.scroll_world()
+        self.invalidate()
+
+    def scroll_world(self):
+        """障害物と壁を1列スクロールし、プレイヤーの列に来たものと衝突判定する"""
 
         # 判定はプレイヤーの列に進んできた瞬間の1回だけ行う。
         # 障害物/壁は次に動くまでの間ずっと同じ列に留まるため、
@@ -281,51 +307,64 @@ class JumpRunnerGame(Game):
             self.wall_x -= 1
             if self.wall_x < 0:
                 self.wall_x = None
-                self.wall_pattern = None
             else:
                 # wall_pattern[j] は列 (wall_x - j) にいる。プレイヤーの列と
                 # 重なっている区画があれば、その深さぶんだけ判定する
                 # (TALLの逃げ場になっている列は除く)。
-                for j, depth in enumerate(self.wall_pattern):
-                    col = self.wall_x - j
-                    if col == self.PLAYER_X:
-                        if not self.is_tall_gap_at(col):
-                            self.check_collision(
-                                self.PLAYER_X, self.ceiling_rows[:depth]
-                            )
-                        break
-        elif random.random() < self.WALL_SPAWN_CHANCE:
+                j = self.wall_x - self.PLAYER_X
+                if 0 <= j < self.WALL_PATTERN_WIDTH and not self.is_tall_gap_at(
+                    self.PLAYER_X
+                ):
+                    self.check_collision(
+                        self.PLAYER_X, self.ceiling_rows, self.wall_pattern[j]
+                    )
+        elif self.rng.random() < self.WALL_SPAWN_CHANCE:
             # 画面右端のさらに外側からスタートすることで、他の障害物と同様に
             # 1列ずつ画面に入ってくるように見せる (先頭からいきなり
             # WALL_PATTERN_WIDTH列ぶん出現すると唐突に見えるため)。
             self.wall_x = self.matrix_width - 1 + (self.WALL_PATTERN_WIDTH - 1)
-            self.wall_pattern = [
-                random.randint(1, len(self.ceiling_rows))
-                for _ in range(self.WALL_PATTERN_WIDTH)
-            ]
+            pattern = self.wall_pattern
+            for j in range(self.WALL_PATTERN_WIDTH):
+                pattern[j] = self.rng.randint(1, len(self.ceiling_rows))
 
-    def get_player_pixels(self):
-        """現在のプレイヤーが占有するピクセル座標のリストを返す"""
+    def update_player_rows(self) -> int:
+        """
+        現在のプレイヤーが占有するY座標を player_rows に書き込む
+        (プレイヤーのX座標は常に PLAYER_X)
 
+        Returns:
+            int: player_rows のうち有効な要素数
+        """
+        rows = self.player_rows
         if self.is_crouching():
             # しゃがみ中は地面の1ピクセルのみ
-            return [(self.PLAYER_X, self.ground_y)]
+            rows[0] = self.ground_y
+            return 1
 
         offset = self.jump_offset
-        return [
-            (self.PLAYER_X, self.head_y - offset),
-            (self.PLAYER_X, self.ground_y - offset),
-        ]
-
-    def check_collision(self, x: int, rows):
-        player_pixels = self.get_player_pixels()
-        for y in rows:
-            if (x, y) in player_pixels:
-                self.is_running = False
-                return
+        rows[0] = self.head_y - offset
+        rows[1] = self.ground_y - offset
+        return 2
+
+    def check_collision(self, x: int, rows, count: int = None):
+        """
+        列xのY座標rows (先頭count個、省略時は全部) とプレイヤーが重なっていれば停止する
+        """
+        if x != self.PLAYER_X:
+            return
+        if count is None:
+            count = len(rows)
+        player_count = self.update_player_rows()
+        player_rows = self.player_rows
+        for i in range(count):
+            y = rows[i]
+            for k in range(player_count):
+                if player_rows[k] == y:
+                    self.is_running = False
+                    return
 
     def refresh(self):
-        """画面を更新して障害物とプレイヤーを表示"""
+        """障害物とプレイヤーを描画する (転送は呼び出し側がまとめて行う)"""
 
         m = self.matrix
         m.fill(m.LED_OFF)
@@ -334,53 +373,35 @@ class JumpRunnerGame(Game):
             # 頭の高さは黄色、それ以外(地面)は赤で表示。
             # TALLは地面(赤)と頭の高さ(黄)が両方点灯し、
             # 「ジャンプ(赤を回避)+しゃがみ(黄を回避)の両方が要る」ことを示す。
+            # (座標のタプルを作らないよう、matrix[x, y] ではなく pixel() で描画する)
             for y in self.obstacle.rows:
                 color = m.LED_YELLOW if y == self.head_y else m.LED_RED
-                m[self.obstacle.x, y] = color
+                m.pixel(self.obstacle.x, y, color)
 
         if self.wall_x is not None:
             # 洞窟の天井のように、列ごとに深さの違う「鍾乳石」を描画する。
             # TALLの逃げ場になっている列は穴として空けておく。
-            for j, depth in enumerate(self.wall_pattern):
+            ceiling_rows = self.ceiling_rows
+            for j in range(self.WALL_PATTERN_WIDTH):
                 x = self.wall_x - j
                 if 0 <= x < self.matrix_width and not self.is_tall_gap_at(x):
-                    for y in self.ceiling_rows[:depth]:
-                        m[x, y] = m.LED_RED
+                    for i in range(self.wall_pattern[j]):
+                        m.pixel(x, ceiling_rows[i], m.LED_RED)
 
-        for x, y in self.get_player_pixels():
-            if 0 <= x < self.matrix_width and 0 <= y < self.matrix_height:
-                m[x, y] = m.LED_GREEN
+        player_rows = self.player_rows
+        for k in range(self.update_player_rows()):
+            y = player_rows[k]
+            if y < self.matrix_height:
+                m.pixel(self.PLAYER_X, y, m.LED_GREEN)
 
-        m.show()
+        # ゲームオーバー時は衝突した瞬間の画面に赤枠を重ねて表示
+        if not self.is_running:
+            self.show_game_over()
 
     def show_game_over(self):
-        """ゲームオーバー時に赤枠を表示"""
+        """ゲームオーバー時に赤枠を表示（show()の呼び出しは呼び出し側に委ねる）"""
 
         self._devices.show_border(self.matrix.LED_RED)
-        self.matrix.show()
-
-    def pause(self):
-        """
-        ゲームを一時停止
-
-        障害物の移動とジャンプの経過時間を停止し、現在の表示状態を維持します。
-        """
-        super().pause()
-        self._pause_time = time.monotonic()
-
-    def resume(self):
-        """
-        ゲームを再開
-
-        一時停止していた時間を考慮して、障害物とジャンプのタイマーを調整します。
-        """
-        super().resume()
-        if hasattr(self, "_pause_time"):
-            pause_duration = time.monotonic() - self._pause_time
-            self.last_move_time += pause_duration
-            if self.is_jumping:
-                self.jump_start_time += pause_duration
-            delattr(self, "_pause_time")
 
     def finalize(self):
         self.matrix.fill(self.matrix.LED_OFF)
@@ -0,0 +1,107 @@
+try:
+    import keypad
+except ImportError:
+    # keypad モジュールの無い環境 (CircuitPython以外) では Debouncer を使う
+    keypad = None
+
+KEYPAD_AVAILABLE = keypad is not None
+
+
+class KeypadButton:
+    """
+    KeypadButtons が取り出したイベントを Debouncer と同じインターフェースで返すボタン
+
+    update() を呼ぶと、キューに溜まったイベントを (他のボタンの分もまとめて) 取り出し、
+    前回の update() 以降の変化を fell / rose に反映します。1ステップより短い押下は
+    fell と rose が同時に立ち、value は最後のイベントの後の状態になります。
+    """
+
+    def __init__(self, buttons):
+        self._buttons = buttons
+        self._value = True  # プルアップのため未押下でTrue
+        self._fell = False
+        self._rose = False
+        self._pending_value = True
+        self._pending_fell = False
+        self._pending_rose = False
+
+    def update(self) -> None:
+        self._buttons.drain()
+        self._value = self._pending_value
+        self._fell = self._pending_fell
+        self._rose = self._pending_rose
+        self._pending_fell = False
+        self._pending_rose = False
+
+    def _apply(self, pressed):
+        if pressed:
+            self._pending_fell = True
+        else:
+            self._pending_rose = True
+        self._pending_value = not pressed
+
+    @property
+    def value(self) -> bool:
+        return self._value
+
+    @property
+    def fell(self) -> bool:
+        return self._fell
+
+    @property
+    def rose(self) -> bool:
+        return self._rose
+
+
+class KeypadButtons:
+    """
+    keypad.Keys でボタンをバックグラウンドでスキャンするボタンの組
+
+    keypad.Keys はメインループとは独立にピンをスキャンしてデバウンスし、変化を
+    タイムスタンプ付きのイベントとしてキューに溜めます。ボタンの update() が呼ばれた
+    時点でキューのイベントをまとめて取り出すため、I2C転送などで1フレームが遅れても、
+    1フレームより短い押下でもイベントを取りこぼしません。Debouncer のように
+    2回の update() で確定させる必要がないため、押してから反応するまでの遅延も短くなります。
+
+    イベントは使い回しの keypad.Event に取り出すため、ヒープ確保は発生しません。
+    """
+
+    def __init__(self, pins, interval: float = 0.02, max_events: int = 16):
+        """
+        Args:
+            pins: ボタンのピン (board.GP18 など、プルアップで押すとLow)
+            interval: スキャン間隔 (秒、この間隔でデバウンスされる)
+            max_events: キューに溜めるイベント数の上限
+        """
+        if keypad is None:
+            raise RuntimeError("keypad module is not available")
+        self._keys = keypad.Keys(
+            pins,
+            value_when_pressed=False,
+            pull=True,
+            interval=interval,
+            max_events=max_events,
+        )
+        self._event = keypad.Event()
+        self.buttons = tuple(KeypadButton(self) for _ in pins)
+        self.overflows = 0  # キューがあふれてイベントを失った回数
+
+    def drain(self) -> None:
+        """キューに溜まったイベントをすべて取り出して各ボタンに反映する"""
+        events = self._keys.events
+        if events.overflowed:
+            # 失われたイベントがあるため、いったん全ボタンを離したことにして
+            # keypad に現在押されているボタンを押下イベントとして報告し直させる
+            self.overflows += 1
+            events.clear()
+            for button in self.buttons:
+                if not button._pending_value:
+                    button._apply(False)
+            self._keys.reset()
+        event = self._event
+        buttons = self.buttons
+        while events.get_into(event):
+            buttons[event.key_number]._apply(event.pressed)
+
+    def deinit(self) -> None:
+        self._keys.deinit()
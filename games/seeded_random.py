@@ -0,0 +1,77 @@
+class SeededRandom:
+    """
+    シード指定で再現可能な乱数生成器 (xorshift32)
+
+    CircuitPython の random モジュールはグローバルな状態しか持たないため、
+    ゲームごとに独立した乱数列を作れるよう random() / randint() / choice() と
+    同じ使い方ができる生成器を用意します。同じシードからは常に同じ乱数列になるため、
+    シミュレーターでのプレイを再現できます。
+
+    CircuitPython では 30ビットを超える整数はヒープに確保される (long int) ため、
+    32ビットの状態を上位・下位16ビットに分けて保持し、乱数の生成中に
+    大きな整数を作らないようにしています (乱数列は32ビットのまま計算した場合と同じ)。
+    """
+
+    _MASK = 0xFFFFFFFF
+    _SMALL_MOD_MAX = 0x4000  # これ以下の数で割った余りは小さい整数だけで計算できる
+
+    def __init__(self, seed: int = 1):
+        """
+        Args:
+            seed: 乱数のシード (32ビットに切り詰める。0は使えないため1に置き換える)
+        """
+        self.seed(seed)
+
+    def seed(self, seed: int) -> None:
+        """
+        乱数列を指定したシードから始め直す
+
+        xorshift32 は状態のビットが少ないと最初の数回の出力がほぼ0になるため、
+        シードをそのまま状態にすると 0, 1, 2... のような近いシードで序盤の乱数が
+        揃ってしまう。ハッシュ関数 (murmur3 の fmix32) で攪拌してから状態にする。
+        """
+        x = (seed + 0x9E3779B9) & self._MASK
+        x ^= x >> 16
+        x = (x * 0x85EBCA6B) & self._MASK
+        x ^= x >> 13
+        x = (x * 0xC2B2AE35) & self._MASK
+        x ^= x >> 16
+        x = x or 1
+        self._hi = x >> 16
+        self._lo = x & 0xFFFF
+
+    def _next(self) -> None:
+        """状態を xorshift32 (13, 17, 5) で1つ進める (16ビットずつに分けて計算する)"""
+        hi = self._hi
+        lo = self._lo
+        # x ^= x << 13
+        hi ^= ((hi << 13) | (lo >> 3)) & 0xFFFF
+        lo ^= (lo << 13) & 0xFFFF
+        # x ^= x >> 17
+        lo ^= hi >> 1
+        # x ^= x << 5
+        hi ^= ((hi << 5) | (lo >> 11)) & 0xFFFF
+        lo ^= (lo << 5) & 0xFFFF
+        self._hi = hi
+        self._lo = lo
+
+    def _next_mod(self, n: int) -> int:
+        """状態を1つ進め、32ビットの状態を n で割った余りを返す"""
+        self._next()
+        if n <= self._SMALL_MOD_MAX:
+            # (hi * 65536 + lo) % n を、30ビットを超えない範囲で計算する
+            return ((self._hi % n) * 0x10000 + self._lo) % n
+        return ((self._hi << 16) | self._lo) % n
+
+    def random(self) -> float:
+        """0.0以上1.0未満の乱数を返す"""
+        self._next()
+        return self._hi / 65536 + self._lo / 4294967296
+
+    def randint(self, a: int, b: int) -> int:
+        """a以上b以下の整数の乱数を返す"""
+        return a + self._next_mod(b - a + 1)
+
+    def choice(self, seq):
+        """シーケンスから要素を1つ選んで返す"""
+        return seq[self._next_mod(len(seq))]
@@ -1,4 +1,5 @@
 # ゲーム選択機能のパッケージ
+from .game_registry import GameEntry
 from .game_selector import GameSelector, GameSelectorMode
 
-__all__ = ["GameSelector", "GameSelectorMode"]
+__all__ = ["GameEntry", "GameSelector", "GameSelectorMode"]
@@ -1,20 +1,62 @@
+import gc
+
+from games.clock import Clock
+from games.seeded_random import SeededRandom
+
+from .game_registry import mem_free
+
+
 class GameManager:
     """
     ゲームのライフサイクル管理を担当するクラス
+
+    ゲームのモジュールは初期化が必要になった時点でインポートします。
+    切り替え前のゲームは一時停止したままプールに保持し (最大 pool_size 個、LRU)、
+    再び選択された時は作り直さずに再開します。空きヒープが min_free_heap を
+    下回った場合は、最も長く使われていないゲームから終了して破棄します。
+
+    全ゲームに同じクロックを渡し、シードが指定された場合はゲームごとに
+    シードから作った乱数生成器を渡すため、同じ入力から同じプレイを再現できます。
     """
 
-    def __init__(self, devices, game_list):
+    def __init__(
+        self,
+        devices,
+        game_list,
+        unload_modules=False,
+        pool_size=0,
+        min_free_heap=0,
+        clock=None,
+        seed=None,
+    ):
         """
         ゲームマネージャーの初期化
 
         Args:
             devices: デバイス管理オブジェクト
-            game_list (list): 利用可能なゲームクラスのリスト
+            game_list (list): 利用可能なゲームの登録情報 (GameEntry) のリスト
+            unload_modules (bool): ゲームを破棄した時にそのゲームのモジュールを
+                アンロードしてメモリを解放する場合True
+            pool_size (int): 一時停止したまま保持するゲームの最大数 (0ならプールしない)
+            min_free_heap (int): プールを維持する空きヒープ量の下限 (バイト)
+            clock: 全ゲームで使うクロック (省略時は Clock)
+            seed (int or None): ゲームの乱数のシード (Noneなら random モジュールを使う)
         """
         self.devices = devices
+        self.clock = clock if clock is not None else Clock()
+        self.seed = seed
         self.game_list = game_list
+        self.unload_modules = unload_modules
+        self.pool_size = pool_size
+        self.min_free_heap = min_free_heap
         self.current_game = None
         self.current_game_index = 0
+        # ゲームの step() / render() のヒープ確保量の計測 (AllocationTracker、Noneなら計測しない)
+        self.alloc_tracker = None
+
+        # 一時停止中のゲームのプール (ゲームインデックス -> インスタンス)
+        self._pool = {}
+        self._pool_order = []  # 使用順 (先頭が最も長く使われていないゲーム)
 
     def initialize_game(self, game_index=0):
         """
@@ -29,7 +71,9 @@ class GameManager:
         if not self._validate_game_index(game_index):
             return False
 
-        game = self._safe_initialize(self.game_list[game_index])
+        # 初期化時の表示を含め、以降のI2C転送をこのゲームの分として数える
+        self.devices.set_bus_caller(self.game_list[game_index].name)
+        game = self._safe_initialize(game_index)
         if game is not None:
             self.current_game = game
             self.current_game_index = game_index
@@ -40,6 +84,9 @@ class GameManager:
         """
         ゲームを変更
 
+        プールから取り出したゲームは一時停止したまま切り替えるため、
+        呼び出し側で resume_current_game() を呼び出して再開してください。
+
         Args:
             new_game_index (int): 新しいゲームのインデックス
 
@@ -49,25 +96,77 @@ class GameManager:
         if not self._validate_game_index(new_game_index):
             return False
 
-        # 現在のゲームを終了
-        self._finalize_current_game()
+        # 切り替え先がプールにあれば、現在のゲームをプールに入れる前に取り出しておく
+        # (プールの上限を超えた時に切り替え先が破棄されないようにするため)
+        pooled_game = self._take_pooled_game(new_game_index)
+
+        if self.current_game and new_game_index != self.current_game_index:
+            # 別のゲームに切り替える場合は、現在のゲームを一時停止したままプールに保持
+            self._park_current_game()
+        else:
+            # 同じゲームを選び直した場合は終了して最初からやり直す
+            self._finalize_current_game()
+
+        # プールに保持していたゲームなら作り直さずに使う (再開は呼び出し側で行う)
+        if pooled_game is not None:
+            self.current_game = pooled_game
+            self.current_game_index = new_game_index
+            self.devices.set_bus_caller(self.game_list[new_game_index].name)
+            print(f"Game resumed from pool: {self.game_list[new_game_index].name}")
+            return True
 
         # 新しいゲームを初期化
         if self.initialize_game(new_game_index):
-            print(f"Game changed to: {self.game_list[new_game_index].__name__}")
+            print(f"Game changed to: {self.game_list[new_game_index].name}")
             return True
         else:
             # 失敗した場合は利用可能なゲームにフォールバック
             self._fallback_to_working_game()
             return False
 
-    def update_current_game(self):
-        """現在のゲームを更新"""
+    def step_current_game(self, dt):
+        """
+        現在のゲームのロジックを1ステップ進める
+
+        Args:
+            dt (float): 1ステップの時間 (秒)
+        """
         if self.current_game:
+            tracker = self.alloc_tracker
+            if tracker is not None:
+                tracker.begin()
             try:
-                self.current_game.update()
+                self.current_game.tick(dt)
             except Exception as e:
                 print(f"Error updating current game: {e}")
+            if tracker is not None:
+                tracker.end()
+                # 状態遷移を出力したステップを含むフレームは定常状態として数えない
+                if self.current_game.take_event():
+                    tracker.skip_frame()
+
+    def render_current_game(self):
+        """
+        現在のゲームの表示が変化していれば描画し、LEDマトリクスに1回だけ転送する
+
+        Returns:
+            bool: 描画した場合True
+        """
+        game = self.current_game
+        if game is None or not game.needs_render():
+            return False
+        tracker = self.alloc_tracker
+        if tracker is not None:
+            tracker.begin()
+        try:
+            game.mark_rendered()
+            game.render()
+            self.devices.matrix.show()
+        except Exception as e:
+            print(f"Error rendering current game: {e}")
+        if tracker is not None:
+            tracker.end()
+        return True
 
     def pause_current_game(self):
         """現在のゲームを一時停止"""
@@ -78,48 +177,180 @@ class GameManager:
                 print(f"Error pausing current game: {e}")
 
     def resume_current_game(self):
-        """現在のゲームを再開"""
+        """現在のゲームを再開し、ゲーム選択中に上書きされた表示を描き直す"""
         if self.current_game and hasattr(self.current_game, "resume"):
             try:
                 self.current_game.resume()
+                self.current_game.redraw()
             except Exception as e:
                 print(f"Error resuming current game: {e}")
 
-    def _safe_initialize(self, game_class):
+    def _park_current_game(self):
+        """
+        現在のゲームを一時停止したままプールに保持する
+
+        プールの上限数を超えた場合や空きヒープが不足した場合は、
+        最も長く使われていないゲームから終了して破棄する。
+        """
+        game = self.current_game
+        index = self.current_game_index
+        self.current_game = None
+
+        if self.pool_size <= 0:
+            self._finalize_game(game, index)
+            return
+
+        try:
+            if not game.is_paused:
+                game.pause()
+        except Exception as e:
+            print(f"Error pausing game for pool: {e}")
+            self._finalize_game(game, index)
+            return
+        finally:
+            # ゲームが設定したハードウェア点滅・輝度を次のゲームに持ち越さない
+            self.devices.reset_effects()
+
+        self._pool[index] = game
+        self._pool_order.append(index)
+
+        # 上限数を超えた分、または空きヒープが下限を下回っている間は古いものから破棄
+        # (空きヒープの判定のためのGCは判定前に1回と、破棄した時だけ行う)
+        check_heap = self.min_free_heap > 0
+        if check_heap:
+            gc.collect()
+        while self._pool_order and (
+            len(self._pool_order) > self.pool_size or self._is_heap_low()
+        ):
+            self._evict_oldest()
+            if check_heap:
+                gc.collect()
+
+    def _take_pooled_game(self, game_index):
         """
-        安全なゲーム初期化
+        プールに保持しているゲームを取り出す
 
         Args:
-            game_class: 初期化するゲームクラス
+            game_index (int): 取り出すゲームのインデックス
+
+        Returns:
+            Game or None: 保持していたゲームインスタンス (無ければNone)
+        """
+        game = self._pool.pop(game_index, None)
+        if game is not None:
+            self._pool_order.remove(game_index)
+        return game
+
+    def _evict_oldest(self):
+        """プール内で最も長く使われていないゲームを終了して破棄する"""
+        index = self._pool_order.pop(0)
+        game = self._pool.pop(index)
+        print(f"Evicting pooled game: {self.game_list[index].name}")
+        self._finalize_game(game, index)
+
+    def _is_heap_low(self):
+        """空きヒープ量がプール維持の下限を下回っているかどうか (GCは呼び出し側で行う)"""
+        if self.min_free_heap <= 0:
+            return False
+        free = mem_free()
+        return free is not None and free < self.min_free_heap
+
+    def _safe_initialize(self, game_index):
+        """
+        安全なゲーム初期化 (モジュールが未インポートならここでインポートする)
+
+        Args:
+            game_index (int): 初期化するゲームのインデックス
 
         Returns:
             Game or None: 初期化されたゲームインスタンス
         """
+        entry = self.game_list[game_index]
         try:
-            game = game_class(self.devices)
+            if not entry.is_loaded:
+                gc.collect()
+                free_before = mem_free()
+                game_class = entry.load()
+                gc.collect()
+                print(
+                    f"Loaded game module: {entry.module_path}"
+                    f" (free heap: {free_before} -> {mem_free()} bytes)"
+                )
+            else:
+                game_class = entry.load()
+
+            game = game_class(self.devices, self.clock, self._create_rng(game_index))
             if game and hasattr(game, "initialize"):
                 game.initialize()
-                print(f"Successfully initialized game: {game_class.__name__}")
+                print(f"Successfully initialized game: {entry.name}")
                 return game
             else:
-                print(
-                    f"Error: Game class {game_class.__name__} does not have initialize method"
-                )
+                print(f"Error: Game class {entry.name} does not have initialize method")
                 return None
         except Exception as e:
-            print(f"Game initialization error for {game_class.__name__}: {e}")
+            print(f"Game initialization error for {entry.name}: {e}")
             return None
 
+    def _create_rng(self, game_index):
+        """
+        ゲームに渡す乱数生成器を作成する
+
+        シードが指定されている場合は、ゲームごとに異なる (が毎回同じ) 乱数列にする。
+
+        Args:
+            game_index (int): ゲームのインデックス
+
+        Returns:
+            SeededRandom or None: 乱数生成器 (シード未指定ならNone)
+        """
+        if self.seed is None:
+            return None
+        return SeededRandom(self.seed + game_index)
+
+    def _unload_game(self, game_index):
+        """
+        ゲームのモジュールをアンロードしてメモリを解放する
+
+        Args:
+            game_index (int): アンロードするゲームのインデックス
+        """
+        entry = self.game_list[game_index]
+        if not entry.is_loaded:
+            return
+        gc.collect()
+        free_before = mem_free()
+        entry.unload()  # アンロード後のGCは unload() の中で行われる
+        print(
+            f"Unloaded game module: {entry.module_path}"
+            f" (free heap: {free_before} -> {mem_free()} bytes)"
+        )
+
     def _finalize_current_game(self):
         """現在のゲームを終了処理"""
         if self.current_game:
-            try:
-                if hasattr(self.current_game, "finalize"):
-                    self.current_game.finalize()
-            except Exception as e:
-                print(f"Error finalizing current game: {e}")
-            finally:
-                self.current_game = None
+            game = self.current_game
+            self.current_game = None
+            self._finalize_game(game, None)
+
+    def _finalize_game(self, game, game_index):
+        """
+        ゲームを終了処理
+
+        Args:
+            game: 終了するゲームインスタンス
+            game_index (int or None): モジュールをアンロードする場合のゲームインデックス
+        """
+        try:
+            if hasattr(game, "finalize"):
+                game.finalize()
+        except Exception as e:
+            print(f"Error finalizing game: {e}")
+        finally:
+            # ゲームが設定したハードウェア点滅・輝度を次のゲームに持ち越さない
+            self.devices.reset_effects()
+
+        if self.unload_modules and game_index is not None:
+            self._unload_game(game_index)
 
     def _validate_game_index(self, index):
         """ゲームインデックスの妥当性をチェック"""
@@ -129,9 +360,15 @@ class GameManager:
         """利用可能なゲームにフォールバック"""
         print("Attempting to fallback to a working game...")
 
-        for i, game_class in enumerate(self.game_list):
+        for i, entry in enumerate(self.game_list):
+            pooled_game = self._take_pooled_game(i)
+            if pooled_game is not None:
+                self.current_game = pooled_game
+                self.current_game_index = i
+                print(f"Successfully fell back to game: {entry.name}")
+                return
             if self.initialize_game(i):
-                print(f"Successfully fell back to game: {game_class.__name__}")
+                print(f"Successfully fell back to game: {entry.name}")
                 return
 
         print("Error: All games failed to initialize")
@@ -140,6 +377,10 @@ class GameManager:
         """ゲーム数を取得"""
         return len(self.game_list)
 
+    def get_current_game_name(self):
+        """現在のゲームの名前"""
+        return self.game_list[self.current_game_index].name
+
     def get_current_game_index(self):
         """現在のゲームインデックスを取得"""
         return self.current_game_index
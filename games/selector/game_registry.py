@@ -0,0 +1,79 @@
+import gc
+import sys
+
+
+def mem_free():
+    """
+    現在の空きヒープ量 (バイト) を返す
+
+    GCは行わないため、回収済みの量を知りたい場合は先に gc.collect() を呼び出してください。
+    gc.mem_free() が無い環境 (CircuitPython以外) では None を返します。
+    """
+    if hasattr(gc, "mem_free"):
+        return gc.mem_free()
+    return None
+
+
+class GameEntry:
+    """
+    ゲームの登録情報
+
+    ゲームクラスをモジュールパスとクラス名で保持し、表示用の情報を添えて登録します。
+    モジュールは load() が呼ばれるまでインポートされないため、起動時に
+    全ゲームを読み込む必要がありません。
+    """
+
+    def __init__(self, module_path, class_name, name, description=""):
+        """
+        Args:
+            module_path (str): ゲームのモジュールパス (例: "games.falling_dot")
+            class_name (str): ゲームクラス名 (例: "FallingDotGame")
+            name (str): 表示用のゲーム名
+            description (str): ゲームの説明
+        """
+        self.module_path = module_path
+        self.class_name = class_name
+        self.name = name
+        self.description = description
+
+    @property
+    def is_loaded(self):
+        """モジュールがインポート済みかどうか"""
+        return self.module_path in sys.modules
+
+    def load(self):
+        """
+        モジュールをインポートしてゲームクラスを返す (インポート済みならそれを使う)
+
+        Returns:
+            type: ゲームクラス
+        """
+        if self.module_path not in sys.modules:
+            __import__(self.module_path)
+        return getattr(sys.modules[self.module_path], self.class_name)
+
+    def unload(self):
+        """
+        モジュールを sys.modules から取り除き、ガベージコレクションでメモリを解放する
+
+        ゲームのインスタンスなど、モジュール内のオブジェクトへの参照が残っている間は
+        メモリは解放されないため、ゲームを終了してから呼び出してください。
+        """
+        module = sys.modules.pop(self.module_path, None)
+        if module is None:
+            return
+
+        # 親パッケージの属性として残っている参照も取り除く
+        parent_path, _, child_name = self.module_path.rpartition(".")
+        parent = sys.modules.get(parent_path)
+        if parent is not None and getattr(parent, child_name, None) is module:
+            try:
+                delattr(parent, child_name)
+            except AttributeError:
+                pass
+
+        del module
+        gc.collect()
+
+    def __repr__(self):
+        return f"GameEntry({self.module_path}.{self.class_name})"
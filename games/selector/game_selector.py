@@ -1,3 +1,5 @@
+from games.input_events import BUTTON_A, BUTTON_B
+
 from .encoder_manager import EncoderManager
 from .game_manager import GameManager
 from .selection_state import SelectionState
@@ -24,56 +26,86 @@ class GameSelector:
     ゲーム変更・キャンセル機能を提供します。
     """
 
-    def __init__(self, devices, encoder, game_list):
+    def __init__(
+        self,
+        devices,
+        encoder,
+        game_list,
+        unload_modules=False,
+        pool_size=0,
+        min_free_heap=0,
+        clock=None,
+        seed=None,
+    ):
         """
         GameSelectorの初期化
 
         Args:
             devices: デバイス管理オブジェクト
             encoder: ロータリーエンコーダー
-            game_list (list): 利用可能なゲームクラスのリスト
+            game_list (list): 利用可能なゲームの登録情報 (GameEntry) のリスト
+            unload_modules (bool): ゲームを破棄した時にそのゲームのモジュールをアンロードする場合True
+            pool_size (int): 切り替え前のゲームを一時停止したまま保持する最大数 (0ならプールしない)
+            min_free_heap (int): プールを維持する空きヒープ量の下限 (バイト)
+            clock: 全ゲームで使うクロック (省略時は Clock)
+            seed (int or None): ゲームの乱数のシード (Noneなら random モジュールを使う)
         """
         self.devices = devices
         self.mode = GameSelectorMode.NORMAL_GAME_MODE
 
         # 各種マネージャーの初期化
         self.encoder_manager = EncoderManager(encoder)
-        self.game_manager = GameManager(devices, game_list)
+        # エンコーダーの回転量はボタンと一緒に入力サービスが1ステップに1回読み取る
+        devices.input.set_encoder(self.encoder_manager)
+        self.game_manager = GameManager(
+            devices,
+            game_list,
+            unload_modules,
+            pool_size,
+            min_free_heap,
+            clock,
+            seed,
+        )
         self.seg = devices.seg
         self.selection_state = SelectionState(len(game_list))
 
-    def initialize(self):
+    def initialize(self, initial_index=0):
         """
         ゲーム選択機能の初期化
 
         初期ゲームのインスタンス作成と初期化を行います。
         エンコーダーの初期位置も記録します。
+
+        Args:
+            initial_index (int): 最初に起動するゲームのインデックス
         """
         # 各マネージャーの初期化
         self.encoder_manager.initialize()
-        self.game_manager.initialize_game(0)
+        self.game_manager.initialize_game(initial_index)
 
         # 選択状態を現在のゲームに合わせる
         self.selection_state.set_selected_index(
             self.game_manager.get_current_game_index()
         )
 
-    def update(self):
+    def step(self, dt):
         """
-        メインループでの状態管理
+        メインループでの状態管理 (固定タイムステップで呼び出される)
 
         現在のモードに応じて適切な処理を実行します。
-        - 通常モード: ゲームの更新とエンコーダー監視
+        - 通常モード: ゲームのロジック更新とエンコーダー監視
         - 選択モード: エンコーダーとボタンの処理
+
+        Args:
+            dt (float): 1ステップの時間 (秒)
         """
 
         if self.mode == GameSelectorMode.NORMAL_GAME_MODE:
-            # 現在のゲームを更新
-            self.game_manager.update_current_game()
+            # 現在のゲームを1ステップ進める
+            self.game_manager.step_current_game(dt)
 
             # エンコーダーの回転を監視して選択モードに移行
-            rotation = self.encoder_manager.check_rotation()
-            if rotation != 0:
+            if self.devices.input.events.rotation != 0:
                 self.enter_selection_mode()
         elif self.mode == GameSelectorMode.GAME_SELECTION_MODE:
             # エンコーダーの回転処理
@@ -82,9 +114,29 @@ class GameSelector:
             # ボタン処理
             self._handle_button_input()
 
+    def render(self):
+        """
+        メインループでの描画 (1フレームに1回呼び出される)
+
+        通常モードでは、現在のゲームの表示が変化していれば描画します。
+        選択モードの表示は選択操作時に更新されるため、ゲームの描画は一切行いません。
+        """
+        if self.mode == GameSelectorMode.NORMAL_GAME_MODE:
+            self.game_manager.render_current_game()
+
+    def update(self, dt):
+        """
+        1フレーム分の更新 (step()とrender()を1回ずつ呼び出す)
+
+        Args:
+            dt (float): 1ステップの時間 (秒)
+        """
+        self.step(dt)
+        self.render()
+
     def _handle_encoder_rotation(self):
         """エンコーダーの回転によるゲーム選択処理"""
-        rotation = self.encoder_manager.check_rotation()
+        rotation = self.devices.input.events.rotation
 
         if rotation > 0:
             # 時計回り: 次のゲーム
@@ -98,12 +150,11 @@ class GameSelector:
     def _handle_button_input(self):
         """ボタン入力の処理"""
         try:
-            self.devices.btn_a.update()
-            self.devices.btn_b.update()
+            events = self.devices.input.events
 
-            if self.devices.btn_a.fell:
+            if events.pressed(BUTTON_A):
                 self.change_game()
-            elif self.devices.btn_b.fell:
+            elif events.pressed(BUTTON_B):
                 self.cancel_selection()
 
         except Exception as e:
@@ -121,6 +172,9 @@ class GameSelector:
         # モードを変更
         self.mode = GameSelectorMode.GAME_SELECTION_MODE
 
+        # 選択モード中のI2C転送はゲームではなくゲーム選択の分として数える
+        self.devices.set_bus_caller("selector")
+
         # 選択状態を現在のゲームに設定
         self.selection_state.set_selected_index(
             self.game_manager.get_current_game_index()
@@ -140,6 +194,7 @@ class GameSelector:
         self.mode = GameSelectorMode.NORMAL_GAME_MODE
 
         # ゲームを再開
+        self.devices.set_bus_caller(self.game_manager.get_current_game_name())
         self.game_manager.resume_current_game()
 
         print(
@@ -158,6 +213,8 @@ class GameSelector:
         # ゲームを変更
         if self.game_manager.change_game(selected_index):
             # 成功した場合は選択モードを終了
+            # (決定に使ったAボタンを離した操作が、再開したゲームに渡らないようにする)
+            self.devices.input.consume(BUTTON_A)
             self.exit_selection_mode()
         else:
             # 失敗した場合は選択を元に戻す
@@ -183,6 +240,9 @@ class GameSelector:
             f"Selection cancelled, returning to game index: {self.game_manager.get_current_game_index()}"
         )
 
+        # キャンセルに使ったBボタンを離した操作がゲームに渡らないようにする
+        self.devices.input.consume(BUTTON_B)
+
         # ゲーム選択モードを終了
         self.exit_selection_mode()
 
@@ -195,18 +255,5 @@ class GameSelector:
         """
         game_number = self.selection_state.get_selected_number()
 
-        self.seg.fill(False)
-
-        # --XX--形式で表示
-        self.seg[0] = "-"
-
-        if game_number < 10:
-            self.seg[1] = "0"
-            self.seg[2] = str(game_number)
-        else:
-            tens = game_number // 10
-            ones = game_number % 10
-            self.seg[1] = str(tens)
-            self.seg[2] = str(ones)
-
-        self.seg[3] = "-"
+        # --XX--形式で表示 (変化した桁のみ転送される)
+        self.devices.show_digits(f"-{game_number:02d}-")
@@ -0,0 +1,187 @@
+from games.clock import ticks_add, ticks_diff
+
+# Timer の状態
+_IDLE = 0
+_SCHEDULED = 1
+_FIRING = 2
+
+
+class Timer:
+    """
+    TimerWheel に登録する1回限り / 周期タイマー
+
+    TimerWheel.timer() で作成し、start() で何度でも登録し直せます。
+    ステージ開始のたびに作り直さず使い回せば、登録時にもヒープ確保は発生しません。
+    """
+
+    def __init__(self, wheel, callback):
+        self._wheel = wheel
+        self.callback = callback  # 期限が来たときに引数なしで呼び出す関数
+        # 周期 (ミリ秒、0なら1回限り)。コールバックの中で変更すると次の周期から反映される
+        self.interval = 0
+        self.due = 0  # 次に呼び出す時刻 (ティック値)
+        self._state = _IDLE
+        self._slot = 0  # 登録中のスロット番号
+
+    @property
+    def active(self) -> bool:
+        """登録中 (期限待ち、または周期タイマーのコールバック実行中) かどうか"""
+        return self._state != _IDLE
+
+    def start(self, delay: int, interval: int = 0) -> None:
+        """
+        delayミリ秒後に呼び出すよう登録する (登録中なら登録し直す)
+
+        Args:
+            delay: 最初に呼び出すまでの時間 (ミリ秒)
+            interval: 以降の呼び出し間隔 (ミリ秒、0なら1回限り)
+        """
+        self._wheel.schedule(self, delay, interval)
+
+    def cancel(self) -> None:
+        """登録を取り消す (コールバックの中から自身を取り消すこともできる)"""
+        self._wheel.cancel(self)
+
+
+class TimerWheel:
+    """
+    ハッシュ化タイマーホイール
+
+    期限の時刻を resolution ミリ秒単位の「目盛り」に分け、目盛り番号を slots で割った
+    余りのスロットにタイマーを登録します。advance() は前回から進んだ目盛りのスロット
+    だけを調べるため、1回あたりの処理量は登録中のタイマーの総数ではなく、
+    期限が来たタイマー (と同じスロットにある一周先のタイマー) の数に比例します。
+
+    ゲームごとの GameClock が1つずつ持ち、メインループが1ステップに1回
+    (Game.tick() から) advance() を呼び出します。
+    """
+
+    def __init__(self, clock, resolution: int = 10, slots: int = 32):
+        """
+        Args:
+            clock: 時刻の取得に使うクロック (ゲームでは一時停止中に止まる GameClock)
+            resolution: 1目盛りの時間 (ミリ秒)
+            slots: スロット数 (resolution * slots ミリ秒を超える期限は一周先として扱う)
+        """
+        self._clock = clock
+        self.resolution = resolution
+        self._slots = [[] for _ in range(slots)]
+        self._cursor = 0  # 現在の目盛りのスロット番号
+        self._cursor_time = clock.now()  # 現在の目盛りの開始時刻 (ティック値)
+        self._count = 0  # 登録中のタイマー数
+        self._removals = 0  # 取り消しの回数 (スロットの走査中の変更の検出用)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def timer(self, callback) -> Timer:
+        """未登録のタイマーを作成する (start() で登録する)"""
+        return Timer(self, callback)
+
+    def call_later(self, delay: int, callback) -> Timer:
+        """delayミリ秒後に callback() を1回だけ呼び出すタイマーを登録する"""
+        timer = Timer(self, callback)
+        self.schedule(timer, delay, 0)
+        return timer
+
+    def call_every(self, interval: int, callback) -> Timer:
+        """intervalミリ秒ごとに callback() を呼び出すタイマーを登録する"""
+        timer = Timer(self, callback)
+        self.schedule(timer, interval, interval)
+        return timer
+
+    def schedule(self, timer: Timer, delay: int, interval: int = 0) -> None:
+        """タイマーを現在時刻からdelayミリ秒後に登録する"""
+        if timer._state == _SCHEDULED:
+            self._remove(timer)
+        timer.interval = interval
+        timer.due = ticks_add(self._clock.now(), delay)
+        self._insert(timer)
+
+    def cancel(self, timer: Timer) -> None:
+        """タイマーの登録を取り消す"""
+        if timer._state == _SCHEDULED:
+            self._remove(timer)
+        timer._state = _IDLE
+
+    def cancel_all(self) -> None:
+        """全タイマーの登録を取り消す"""
+        for slot in self._slots:
+            for timer in slot:
+                timer._state = _IDLE
+            slot.clear()
+        self._count = 0
+        self._removals += 1
+
+    def advance(self) -> None:
+        """
+        現在時刻までに期限が来たタイマーのコールバックを呼び出す
+
+        周期タイマーは期限から interval ミリ秒後に登録し直すため、呼び出しが遅れても
+        周期はずれず、1回の advance() で複数周期ぶん呼び出されることもあります。
+        """
+        now = self._clock.now()
+        ticks = ticks_diff(now, self._cursor_time) // self.resolution
+        if self._count == 0:
+            # 登録が無ければスロットを調べずに目盛りだけ進める
+            if ticks > 0:
+                self._move_cursor(ticks)
+            return
+        slot_count = len(self._slots)
+        while True:
+            self._run_slot(self._slots[self._cursor], now)
+            if ticks <= 0:
+                return
+            self._cursor += 1
+            if self._cursor == slot_count:
+                self._cursor = 0
+            self._cursor_time = ticks_add(self._cursor_time, self.resolution)
+            ticks -= 1
+
+    def _move_cursor(self, ticks):
+        self._cursor = (self._cursor + ticks) % len(self._slots)
+        self._cursor_time = ticks_add(self._cursor_time, ticks * self.resolution)
+
+    def _run_slot(self, slot, now):
+        index = 0
+        while index < len(slot):
+            timer = slot[index]
+            if ticks_diff(now, timer.due) < 0:
+                # まだ期限が来ていない (同じ目盛りの後半、または一周先)
+                index += 1
+                continue
+            slot.pop(index)
+            self._count -= 1
+            removals = self._removals
+            self._fire(timer)
+            if self._removals != removals:
+                # コールバックがこのスロットのタイマーを取り消した場合は先頭から調べ直す
+                index = 0
+
+    def _fire(self, timer):
+        timer._state = _FIRING
+        timer.callback()
+        if timer._state != _FIRING:
+            # コールバックの中で取り消された、または登録し直された
+            return
+        if timer.interval > 0:
+            # 期限が過ぎたままなら、現在のスロットに入って同じ advance() の中で再び呼び出される
+            timer.due = ticks_add(timer.due, timer.interval)
+            self._insert(timer)
+        else:
+            timer._state = _IDLE
+
+    def _insert(self, timer):
+        offset = ticks_diff(timer.due, self._cursor_time)
+        index = self._cursor
+        if offset > 0:
+            index = (index + offset // self.resolution) % len(self._slots)
+        self._slots[index].append(timer)
+        timer._slot = index
+        timer._state = _SCHEDULED
+        self._count += 1
+
+    def _remove(self, timer):
+        self._slots[timer._slot].remove(timer)
+        self._count -= 1
+        self._removals += 1
@@ -0,0 +1 @@
+# PC (CPython) 上での動作確認・計測用ツールのパッケージ
@@ -0,0 +1,389 @@
+"""
+ゲームごとのフレーム処理のベンチマーク (ホストシミュレーター上で実行)
+
+code.py の GAME_LIST の各ゲームを、操作スクリプトで入力しながら update() を
+指定フレーム数だけ実行し、以下を計測してベースラインファイルと比較します:
+
+- update() 1回あたりの所要時間 (平均 / p99)
+- update() 1回あたりのヒープ確保量 (tracemalloc で計測したピーク増加量の平均)
+- 1フレームあたりの LEDマトリクス / 7セグメントディスプレイへの I2C 書き込み回数とバイト数
+
+所要時間はPC上の値なので実機の値とは異なりますが、同じマシン上での変更前後の比較に使えます。
+ベースラインより悪化したゲームがあると終了コード1で終了します。
+
+使い方 (リポジトリのルートで実行):
+    python -m host.benchmark                    # ベースラインと比較
+    python -m host.benchmark --update-baseline  # 現在の結果をベースラインとして保存
+    python -m host.benchmark --replay input.log # 記録した実際の操作を入力にする
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+from host import simulator
+
+BASELINE_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json"
+)
+
+DEFAULT_FRAMES = 3000
+DEFAULT_SEED = 0
+DEFAULT_REPEAT = 5  # 所要時間の計測回数 (最も速かった回の値を使う)
+
+# ベースラインからの悪化の許容範囲 (所要時間は計測の揺らぎが大きいため緩めにする)
+MEAN_TIME_TOLERANCE = 1.5  # 平均所要時間はベースラインの150%まで
+P99_TIME_TOLERANCE = 2.0  # p99所要時間はベースラインの200%まで
+ALLOC_TOLERANCE = 1.1  # ヒープ確保量はベースラインの110%まで
+ALLOC_SLACK_BYTES = 8  # ヒープ確保量の比較で無視する差 (バイト/フレーム)
+WRITE_SLACK = 0.01  # I2C書き込み回数・バイト数の比較で無視する差 (1フレームあたり)
+
+# 比較する項目: (キー, 許容倍率, 無視する差)
+_CHECKS = (
+    ("mean_us", MEAN_TIME_TOLERANCE, 0.0),
+    ("p99_us", P99_TIME_TOLERANCE, 0.0),
+    ("alloc_bytes", ALLOC_TOLERANCE, ALLOC_SLACK_BYTES),
+    ("matrix_writes", 1.0, WRITE_SLACK),
+    ("matrix_bytes", 1.0, WRITE_SLACK),
+    ("seg_writes", 1.0, WRITE_SLACK),
+    ("seg_bytes", 1.0, WRITE_SLACK),
+)
+
+
+def default_script(frames):
+    """
+    全ゲーム共通の操作スクリプトを作成する
+
+    50フレーム (1秒) ごとにAボタン、その途中でBボタンを押し、
+    200フレームごとに長押しと両ボタン同時押し (ゲームオーバーからの再スタート) を
+    混ぜて、各ゲームの主要な入力経路を通るようにする。
+    """
+    events = []
+    for frame in range(10, frames, 50):
+        events.append(f"A@{frame}")
+        events.append(f"B@{frame + 25}")
+        if frame % 200 == 10:
+            events.append(f"A@{frame + 35}:12")
+        elif frame % 200 == 110:
+            events.append(f"AB@{frame + 35}")
+    return ",".join(events)
+
+
+def percentile(sorted_values, percent):
+    """ソート済みの値からパーセンタイル値を返す"""
+    if not sorted_values:
+        return 0
+    index = (len(sorted_values) - 1) * percent // 100
+    return sorted_values[index]
+
+
+def _trace_overhead():
+    """tracemalloc でのヒープ確保量の計測処理自体が確保する量 (バイト) を返す"""
+    tracemalloc.reset_peak()
+    before = tracemalloc.get_traced_memory()[0]
+    return tracemalloc.get_traced_memory()[1] - before
+
+
+class GameBenchmark:
+    """
+    1つのゲームをシミュレーター上で実行して計測する
+
+    simulator.install() で作成したハードウェアを使い回し、ゲームごとに
+    フレーム番号を0に戻して同じ操作スクリプトを適用します。
+    """
+
+    def __init__(
+        self, hardware, fps, seed=DEFAULT_SEED, repeat=DEFAULT_REPEAT, replay=None
+    ):
+        """
+        Args:
+            replay (bytes or None): 操作スクリプトの代わりに再生する入力ログ
+        """
+        self.hardware = hardware
+        self.fps = fps
+        self.seed = seed
+        self.repeat = repeat
+        self.replay = replay
+        self._player = None
+
+    def _create_game(self, entry, game_index, overrides=None):
+        from games.clock import Clock
+        from games.input_log import InputPlayer
+        from games.seeded_random import SeededRandom
+        from host.sim_device_manager import SimDeviceManager
+
+        self.hardware.frame = 0
+        self.hardware.encoders.clear()
+        self.hardware.keys.clear()
+        devices = SimDeviceManager()
+        if self.replay is not None:
+            self._player = InputPlayer(self.replay)
+            devices.enable_input_replay(self._player)
+        game_class = entry.load()
+        for name in overrides or ():
+            if not hasattr(game_class, name):
+                raise AttributeError(f"{game_class.__name__} has no attribute {name!r}")
+        # GameManager と同じ規則でシードを決め、ゲームの実行内容を毎回同じにする
+        game = game_class(devices, Clock(), SeededRandom(self.seed + game_index))
+        # 調整用の定数を初期化前に上書きする (クラス定数もインスタンス属性として上書きする)
+        for name, value in (overrides or {}).items():
+            setattr(game, name, value)
+        if hasattr(game, "initialize"):
+            game.initialize()
+        return devices, game
+
+    def run_game(self, entry, game_index, frames, frame_hook, overrides=None):
+        """
+        ゲームを作成してframesフレーム実行し、各フレームでframe_hook(game, devices, dt)を呼び出す
+
+        frame_hook は game.update(dt) を呼び出す責任を持つ。
+        overrides (属性名 -> 値) を指定すると、ゲームの初期化前にその属性を上書きする。
+
+        Returns:
+            tuple: 1フレームあたりの (マトリクス書き込み回数, バイト数, 7セグ書き込み回数, バイト数)
+        """
+        dt = 1 / self.fps
+        # ゲームのログ出力は計測結果の表示の邪魔になるため捨てる
+        with contextlib.redirect_stdout(io.StringIO()):
+            devices, game = self._create_game(entry, game_index, overrides)
+            matrix_bus = devices.matrix_bus_stats
+            seg_bus = devices.seg_bus_stats
+            matrix_start = (matrix_bus.transactions, matrix_bus.bytes_written)
+            seg_start = (seg_bus.transactions, seg_bus.bytes_written)
+            try:
+                for _ in range(frames):
+                    # 実機のメインループと同じく、ステップの前に入力を1回だけ読み取る
+                    devices.input.poll()
+                    frame_hook(game, devices, dt)
+                    if self._player is not None:
+                        self._player.end_frame()
+                    devices.update_effects()
+                    # 実機の待機の代わりに仮想時刻を1フレーム分進める
+                    self.hardware.next_frame()
+            finally:
+                game.finalize()
+        return (
+            (matrix_bus.transactions - matrix_start[0]) / frames,
+            (matrix_bus.bytes_written - matrix_start[1]) / frames,
+            (seg_bus.transactions - seg_start[0]) / frames,
+            (seg_bus.bytes_written - seg_start[1]) / frames,
+        )
+
+    def measure(self, entry, game_index, frames):
+        """
+        ゲームを計測する
+
+        所要時間とヒープ確保量は、tracemalloc の負荷が所要時間に影響しないよう
+        同じシード・同じ操作で別々に実行して計測する。所要時間は repeat 回計測し、
+        他のプロセスの影響が最も少ない (最も速い) 回の値を使う。
+
+        Returns:
+            dict: 計測結果 (mean_us, p99_us, alloc_bytes, matrix_writes, ...)
+        """
+        mean_ns = p99_ns = None
+        for _ in range(self.repeat):
+            times = []
+
+            def timed_update(game, devices, dt):
+                start = time.perf_counter_ns()
+                game.update(dt)
+                times.append(time.perf_counter_ns() - start)
+
+            matrix_writes, matrix_bytes, seg_writes, seg_bytes = self.run_game(
+                entry, game_index, frames, timed_update
+            )
+            times.sort()
+            mean = sum(times) / len(times)
+            p99 = percentile(times, 99)
+            mean_ns = mean if mean_ns is None else min(mean_ns, mean)
+            p99_ns = p99 if p99_ns is None else min(p99_ns, p99)
+
+        allocated = [0]
+
+        def traced_update(game, devices, dt):
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            game.update(dt)
+            allocated[0] += tracemalloc.get_traced_memory()[1] - before
+
+        tracemalloc.start()
+        try:
+            # 計測処理自体のヒープ確保量 (get_traced_memory() の戻り値など) を差し引く
+            overhead = _trace_overhead()
+            self.run_game(entry, game_index, frames, traced_update)
+        finally:
+            tracemalloc.stop()
+
+        return {
+            "mean_us": round(mean_ns / 1000, 2),
+            "p99_us": round(p99_ns / 1000, 2),
+            "alloc_bytes": round(max(0, allocated[0] / frames - overhead), 2),
+            "matrix_writes": round(matrix_writes, 3),
+            "matrix_bytes": round(matrix_bytes, 3),
+            "seg_writes": round(seg_writes, 3),
+            "seg_bytes": round(seg_bytes, 3),
+        }
+
+
+def compare(result, baseline):
+    """
+    計測結果をベースラインと比較する
+
+    Returns:
+        list: 悪化した項目の説明 (悪化がなければ空)
+    """
+    regressions = []
+    for key, tolerance, slack in _CHECKS:
+        if key not in baseline:
+            continue
+        limit = baseline[key] * tolerance + slack
+        if result[key] > limit:
+            regressions.append(
+                f"{key} {result[key]} > {limit:.2f} (baseline {baseline[key]})"
+            )
+    return regressions
+
+
+def load_baseline(path):
+    """ベースラインファイルを読み込む (存在しなければ空の辞書)"""
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_baseline(path, results):
+    """計測結果をベースラインファイルに保存する"""
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def run(
+    frames=DEFAULT_FRAMES,
+    script=None,
+    seed=DEFAULT_SEED,
+    games=None,
+    repeat=DEFAULT_REPEAT,
+    replay_path=None,
+):
+    """
+    GAME_LIST の各ゲームを計測する
+
+    Args:
+        frames (int): 各ゲームを実行するフレーム数
+        script (str or None): 操作スクリプト (Noneなら default_script())
+        seed (int): ゲームの乱数のシード
+        games (list or None): 計測するゲームのモジュールパス (Noneなら全ゲーム)
+        repeat (int): 所要時間の計測回数
+        replay_path (str or None): 操作スクリプトの代わりに再生する入力ログ
+
+    Returns:
+        dict: モジュールパス -> 計測結果
+    """
+    if script is None:
+        script = default_script(frames)
+    hardware = simulator.install(script=script)
+
+    from host.run import load_code_module
+
+    code = load_code_module()
+    hardware.frame_ms = 1000 // code.FPS
+    replay = None
+    if replay_path:
+        from games.input_log import input_log_seed, load_input_log
+
+        replay = load_input_log(replay_path)
+        # 記録時と同じ乱数列にするため、入力ログのシードがあればそれを使う
+        replay_seed = input_log_seed(replay)
+        if replay_seed is not None:
+            seed = replay_seed
+    benchmark = GameBenchmark(hardware, code.FPS, seed, repeat, replay)
+
+    results = {}
+    for game_index, entry in enumerate(code.GAME_LIST):
+        if games and entry.module_path not in games:
+            continue
+        results[entry.module_path] = benchmark.measure(entry, game_index, frames)
+    return results
+
+
+def report(results, baseline):
+    """計測結果とベースラインとの比較を表示し、悪化したゲームの数を返す"""
+    print(
+        f"{'game':<22}{'mean[us]':>10}{'p99[us]':>10}{'alloc[B]':>10}"
+        f"{'matrix w/B':>14}{'seg w/B':>14}  status"
+    )
+    failures = 0
+    for module_path, result in results.items():
+        if module_path in baseline:
+            regressions = compare(result, baseline[module_path])
+            status = "FAIL" if regressions else "ok"
+        else:
+            regressions = []
+            status = "no baseline"
+        print(
+            f"{module_path:<22}{result['mean_us']:>10.1f}{result['p99_us']:>10.1f}"
+            f"{result['alloc_bytes']:>10.1f}"
+            f"{result['matrix_writes']:>7.2f}/{result['matrix_bytes']:<6.1f}"
+            f"{result['seg_writes']:>7.2f}/{result['seg_bytes']:<6.1f}  {status}"
+        )
+        for regression in regressions:
+            print(f"    {regression}")
+        if regressions:
+            failures += 1
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark each game on the host simulator"
+    )
+    parser.add_argument(
+        "--frames", type=int, default=DEFAULT_FRAMES, help="frames per game"
+    )
+    parser.add_argument("--script", default=None, help="input script")
+    parser.add_argument(
+        "--seed", type=int, default=DEFAULT_SEED, help="random seed for games"
+    )
+    parser.add_argument(
+        "--game", action="append", help="module path to benchmark (repeatable)"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=DEFAULT_REPEAT, help="timing runs per game"
+    )
+    parser.add_argument(
+        "--replay", default=None, help="replay the input log in FILE instead of --script"
+    )
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline file")
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="save the results as the new baseline",
+    )
+    args = parser.parse_args()
+
+    results = run(
+        args.frames, args.script, args.seed, args.game, args.repeat, args.replay
+    )
+    if args.update_baseline:
+        baseline = load_baseline(args.baseline)
+        baseline.update(results)
+        save_baseline(args.baseline, baseline)
+        report(results, {})
+        print(f"Baseline saved to {args.baseline}")
+        return
+
+    failures = report(results, load_baseline(args.baseline))
+    if failures:
+        print(f"{failures} game(s) regressed against the baseline")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""
+表示内容のチェックサムによる回帰テスト (ホストシミュレーター上で実行)
+
+code.py の GAME_LIST の各ゲームを、固定のシードと操作スクリプトで update() を
+指定フレーム数だけ実行し、毎フレームの LEDマトリクスと 7セグメントディスプレイの
+表示RAM (I2Cで転送済みの内容) の CRC32 を、保存済みのゴールデンファイルと比較します。
+描画処理を最適化した後も表示がフレーム単位で変わっていないことを確認するためのもので、
+食い違ったゲームがあると最初に食い違ったフレームを表示して終了コード1で終了します。
+
+ゴールデンファイルには、チェックサムが変わったフレームだけを (フレーム番号, チェックサム) の
+組で保存します。
+
+使い方 (リポジトリのルートで実行):
+    python -m host.golden           # ゴールデンファイルと比較
+    python -m host.golden --update  # 現在の表示内容をゴールデンファイルとして保存
+"""
+
+import argparse
+import json
+import os
+import sys
+import zlib
+
+from host import simulator
+from host.benchmark import DEFAULT_FRAMES, DEFAULT_SEED, GameBenchmark, default_script
+
+GOLDEN_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "golden_frames.json"
+)
+
+
+def frame_checksum(devices):
+    """LEDマトリクスと7セグメントディスプレイの表示RAMのCRC32を返す"""
+    checksum = zlib.crc32(devices.matrix_device.ram)
+    return zlib.crc32(devices.seg_device.ram, checksum)
+
+
+def record_checksums(benchmark, entry, game_index, frames):
+    """
+    ゲームを実行して、チェックサムが変わったフレームの一覧を返す
+
+    Returns:
+        list: [フレーム番号, チェックサム] のリスト (フレーム0は必ず含む)
+    """
+    changes = []
+
+    def hashed_update(game, devices, dt):
+        game.update(dt)
+        checksum = frame_checksum(devices)
+        if not changes or changes[-1][1] != checksum:
+            changes.append([benchmark.hardware.frame, checksum])
+
+    benchmark.run_game(entry, game_index, frames, hashed_update)
+    return changes
+
+
+def first_divergence(expected, actual):
+    """
+    2つのチェックサムの変化点の一覧を比べ、最初に食い違うフレームを返す
+
+    Returns:
+        tuple or None: (フレーム番号, 期待したチェックサム, 実際のチェックサム)、一致すればNone
+    """
+    if expected == actual:
+        return None
+    i = 0
+    while i < len(expected) and i < len(actual) and expected[i] == actual[i]:
+        i += 1
+    # 食い違った変化点のうち早い方のフレームで、それぞれのその時点のチェックサムを求める
+    frames = [changes[i][0] for changes in (expected, actual) if i < len(changes)]
+    frame = min(frames)
+    return frame, _checksum_at(expected, frame), _checksum_at(actual, frame)
+
+
+def _checksum_at(changes, frame):
+    checksum = None
+    for change_frame, change_checksum in changes:
+        if change_frame > frame:
+            break
+        checksum = change_checksum
+    return checksum
+
+
+def run(frames=DEFAULT_FRAMES, script=None, seed=DEFAULT_SEED, games=None):
+    """
+    GAME_LIST の各ゲームのチェックサムの変化点を記録する
+
+    Args:
+        frames (int): 各ゲームを実行するフレーム数
+        script (str or None): 操作スクリプト (Noneなら host.benchmark.default_script())
+        seed (int): ゲームの乱数のシード
+        games (list or None): 記録するゲームのモジュールパス (Noneなら全ゲーム)
+
+    Returns:
+        dict: モジュールパス -> チェックサムの変化点の一覧
+    """
+    if script is None:
+        script = default_script(frames)
+    hardware = simulator.install(script=script)
+
+    from host.run import load_code_module
+
+    code = load_code_module()
+    hardware.frame_ms = 1000 // code.FPS
+    benchmark = GameBenchmark(hardware, code.FPS, seed)
+
+    results = {}
+    for game_index, entry in enumerate(code.GAME_LIST):
+        if games and entry.module_path not in games:
+            continue
+        results[entry.module_path] = record_checksums(
+            benchmark, entry, game_index, frames
+        )
+    return results
+
+
+def load_golden(path):
+    """ゴールデンファイルを読み込む (存在しなければNone)"""
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_golden(path, golden):
+    """ゴールデンファイルを保存する (変化点は1行に1つ)"""
+    lines = ["{"]
+    for key in ("frames", "seed", "script"):
+        lines.append(f"  {json.dumps(key)}: {json.dumps(golden[key])},")
+    lines.append('  "games": {')
+    game_items = sorted(golden["games"].items())
+    for game_number, (module_path, changes) in enumerate(game_items):
+        lines.append(f"    {json.dumps(module_path)}: [")
+        for change_number, (frame, checksum) in enumerate(changes):
+            comma = "," if change_number < len(changes) - 1 else ""
+            lines.append(f"      [{frame}, {checksum}]{comma}")
+        comma = "," if game_number < len(game_items) - 1 else ""
+        lines.append(f"    ]{comma}")
+    lines.append("  }")
+    lines.append("}")
+    with open(path, "w") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def report(results, golden_games):
+    """比較結果を表示し、食い違ったゲームの数を返す"""
+    failures = 0
+    for module_path, changes in results.items():
+        if module_path not in golden_games:
+            print(f"{module_path:<22}no golden")
+            continue
+        divergence = first_divergence(golden_games[module_path], changes)
+        if divergence is None:
+            print(f"{module_path:<22}ok ({len(changes)} changes)")
+            continue
+        frame, expected, actual = divergence
+        print(
+            f"{module_path:<22}FAIL at frame {frame}:"
+            f" expected {expected:08x}, got {actual:08x}"
+        )
+        failures += 1
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare per-frame display checksums against the golden file"
+    )
+    parser.add_argument(
+        "--frames", type=int, default=DEFAULT_FRAMES, help="frames per game"
+    )
+    parser.add_argument("--script", default=None, help="input script")
+    parser.add_argument(
+        "--seed", type=int, default=DEFAULT_SEED, help="random seed for games"
+    )
+    parser.add_argument(
+        "--game", action="append", help="module path to check (repeatable)"
+    )
+    parser.add_argument("--golden", default=GOLDEN_PATH, help="golden file")
+    parser.add_argument(
+        "--update", action="store_true", help="save the results as the golden file"
+    )
+    args = parser.parse_args()
+
+    script = args.script if args.script is not None else default_script(args.frames)
+    golden = load_golden(args.golden)
+    same_settings = golden is not None and (
+        golden["frames"],
+        golden["seed"],
+        golden["script"],
+    ) == (args.frames, args.seed, script)
+    if golden is not None and not same_settings and not args.update:
+        print("Frames, seed or script differ from the golden file; use --update")
+        sys.exit(1)
+
+    results = run(args.frames, script, args.seed, args.game)
+    if args.update:
+        # 条件が変わった場合は、今回記録しなかったゲームの古い結果を残さない
+        games = golden["games"] if same_settings else {}
+        games.update(results)
+        golden = {
+            "frames": args.frames,
+            "seed": args.seed,
+            "script": script,
+            "games": games,
+        }
+        save_golden(args.golden, golden)
+        report(results, results)
+        print(f"Golden file saved to {args.golden}")
+        return
+
+    failures = report(results, golden["games"] if golden is not None else {})
+    if failures:
+        print(f"{failures} game(s) diverged from the golden file")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
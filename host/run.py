@@ -0,0 +1,144 @@
+"""
+code.py の main() をシミュレーター上で実行する
+
+使い方 (リポジトリのルートで実行):
+    python -m host.run --frames 3000 --script "A@100,+1@300,A@320" --dump 500
+
+--frames で指定したフレーム数に達するとメインループを終了し、最終的な表示内容と
+仮想時間・実時間を表示します。
+"""
+
+import argparse
+import importlib.util
+import os
+import time
+
+from host import simulator
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_code_module():
+    """リポジトリ直下の code.py をモジュールとして読み込む (標準ライブラリの code と区別するため)"""
+    spec = importlib.util.spec_from_file_location(
+        "code_main", os.path.join(REPO_ROOT, "code.py")
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def print_display(devices, label):
+    """LEDマトリクスと7セグメントディスプレイの表示内容を表示する"""
+    print(f"--- {label} [{devices.seg_text()}]")
+    print(devices.matrix_text())
+
+
+def run(
+    frames,
+    script="",
+    game_index=None,
+    dump_interval=0,
+    seed=0,
+    record_path=None,
+    replay_path=None,
+):
+    """
+    シミュレーター上で code.py の main() を実行する
+
+    Args:
+        frames (int): 実行するフレーム数
+        script (str): 操作スクリプト (host.simulator.InputScript の書式)
+        game_index (int or None): 起動するゲームのインデックス (Noneなら code.py の設定)
+        dump_interval (int): 表示内容を出力するフレーム間隔 (0なら最後だけ)
+        seed (int or None): ゲームの乱数のシード (同じシード・同じスクリプトなら同じ結果になる)
+        record_path (str or None): 入力ログを保存するファイル (Noneなら記録しない)
+        replay_path (str or None): 操作スクリプトの代わりに再生する入力ログ
+
+    Returns:
+        SimDeviceManager: 実行後のデバイス
+    """
+    hardware = simulator.install(script=script, max_frames=frames)
+
+    from host.sim_device_manager import SimDeviceManager
+    from host.sim_timestep import SimFixedTimestep
+
+    code = load_code_module()
+    hardware.frame_ms = 1000 // code.FPS
+    if game_index is not None:
+        code.GAME_INDEX = game_index
+    code.RANDOM_SEED = seed
+    if record_path:
+        code.INPUT_RECORD_EVENTS = frames * 4
+        code.INPUT_RECORD_FILE = record_path
+    if replay_path:
+        code.INPUT_REPLAY_FILE = replay_path
+
+    # main() が作成するデバイスをシミュレーター用に差し替える
+    created = []
+
+    # (I2Cバスの転送量はシミュレーターでは常に集計して最後に表示する)
+    def create_devices(use_keypad=True, bus_stats=False):
+        devices = SimDeviceManager(use_keypad)
+        created.append(devices)
+        return devices
+
+    code.DeviceManager = create_devices
+    # 仮想時刻はメインループの待機 (FixedTimestep.sleep()) で1フレーム分ずつ進める
+    code.FixedTimestep = SimFixedTimestep
+
+    if dump_interval > 0:
+
+        def dump(frame):
+            if frame > 0 and frame % dump_interval == 0:
+                print_display(created[0], f"frame {frame}")
+
+        hardware.frame_callbacks.append(dump)
+
+    start = time.perf_counter()
+    code.main()
+    wall_time = time.perf_counter() - start
+
+    devices = created[0]
+    virtual_time = hardware.frame * hardware.frame_ms / 1000
+    print_display(devices, f"frame {hardware.frame} (final)")
+    print(
+        f"Simulated {hardware.frame} frames ({virtual_time:.1f} s) in {wall_time:.2f} s"
+        f" ({virtual_time / wall_time if wall_time > 0 else 0:.0f}x real time)"
+    )
+    for stats in (devices.matrix_bus_stats, devices.seg_bus_stats):
+        print(
+            f"I2C {stats.name}: {stats.transactions} transactions,"
+            f" {stats.bytes_written} bytes"
+        )
+    devices.print_bus_stats()
+    return devices
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run code.py on the host simulator")
+    parser.add_argument("--frames", type=int, default=3000, help="frames to simulate")
+    parser.add_argument("--script", default="", help='input script, e.g. "A@100,+1@300"')
+    parser.add_argument("--game", type=int, default=None, help="initial game index")
+    parser.add_argument(
+        "--dump", type=int, default=0, help="print the display every N frames"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="random seed for games")
+    parser.add_argument("--record", default=None, help="save the input log to FILE")
+    parser.add_argument(
+        "--replay", default=None, help="replay the input log in FILE instead of --script"
+    )
+    args = parser.parse_args()
+    run(
+        args.frames,
+        args.script,
+        args.game,
+        args.dump,
+        args.seed,
+        args.record,
+        args.replay,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+シミュレーター用の DeviceManager
+
+host.simulator.install() でハードウェアモジュールを差し替えた後にインポートしてください。
+"""
+
+from games.device_manager import DeviceManager
+
+from host import simulator
+
+_HT16K33_ADDRESS = 0x70
+
+
+class SimDeviceManager(DeviceManager):
+    """
+    シミュレーター上で動作する DeviceManager
+
+    DeviceManager の初期化・描画処理はそのまま使い、LEDマトリクスと
+    7セグメントディスプレイの表示内容をメモリ上から読み出せるようにします。
+    仮想時刻はメインループの待機 (host.sim_timestep.SimFixedTimestep.sleep()) で進みます。
+
+    I2Cバスの転送量の集計 (matrix_bus_stats / seg_bus_stats) は実機と同じものを使い、
+    show()の所要時間にはバスの周波数から見積もった転送時間を記録します。
+    """
+
+    def __init__(self, use_keypad: bool = True):
+        self._hardware = simulator.hardware()
+        if self._hardware is None:
+            raise RuntimeError("host.simulator.install() must be called first")
+        super().__init__(use_keypad, bus_stats=True)
+        # show()の所要時間として、転送時間の見積もり (busy_ns) の増加分を記録する
+        self._matrix_bus_stats.timer_ns = self._bus_timer(self._i2c_0.bus)
+        self._seg_bus_stats.timer_ns = self._bus_timer(self._i2c_1.bus)
+        self._hardware.apply_inputs()
+
+    @staticmethod
+    def _bus_timer(bus):
+        return lambda: bus.busy_ns
+
+    @property
+    def hardware(self) -> simulator.SimHardware:
+        """シミュレーターの状態 (仮想時刻・フレーム番号・操作スクリプト)"""
+        return self._hardware
+
+    @property
+    def matrix_device(self) -> simulator.SimHT16K33:
+        """LEDマトリクス側のHT16K33 (I2Cで転送された表示RAM・点滅・輝度)"""
+        return self._i2c_0.bus.devices[_HT16K33_ADDRESS]
+
+    @property
+    def seg_device(self) -> simulator.SimHT16K33:
+        """7セグメントディスプレイ側のHT16K33"""
+        return self._i2c_1.bus.devices[_HT16K33_ADDRESS]
+
+    def matrix_text(self) -> str:
+        """LEDマトリクスの表示内容 (I2Cで転送済みのもの) を文字列で返す"""
+        return simulator.format_matrix(self.matrix_device.ram)
+
+    def seg_text(self) -> str:
+        """7セグメントディスプレイの表示内容 (I2Cで転送済みのもの) を文字列で返す"""
+        return simulator.format_segments(self.seg_device.ram)
@@ -0,0 +1,29 @@
+"""
+シミュレーター用の FixedTimestep
+
+host.simulator.install() でハードウェアモジュールを差し替えた後にインポートしてください。
+"""
+
+from games.fixed_timestep import FixedTimestep
+
+from host import simulator
+
+
+class SimFixedTimestep(FixedTimestep):
+    """
+    次のステップの時刻まで待機する代わりに、仮想時刻を1フレーム分進める FixedTimestep
+
+    メインループが1フレームに1回だけ呼び出す sleep() を仮想時刻を進める場所にすることで、
+    シミュレーターの時刻がメインループの他の処理 (ディスプレイ効果の更新など) の
+    呼び出し順や回数に左右されないようにします。
+    """
+
+    def __init__(self, fps: int, max_steps: int = 5, clock=None):
+        self._hardware = simulator.hardware()
+        if self._hardware is None:
+            raise RuntimeError("host.simulator.install() must be called first")
+        super().__init__(fps, max_steps, clock)
+
+    def sleep(self) -> None:
+        """仮想時刻を1フレーム分進め、次のフレームの入力を反映する"""
+        self._hardware.next_frame()
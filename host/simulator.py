@@ -0,0 +1,459 @@
+"""
+PC (CPython) 上でゲームを動かすためのヘッドレスシミュレーター
+
+CircuitPython 専用のハードウェアモジュール (board / busio / digitalio / keypad /
+rotaryio / supervisor) をメモリ上のシミュレーションに差し替え、DeviceManager と adafruit_ht16k33 /
+adafruit_debouncer のコードをそのまま動かします。
+
+- I2C バス上の HT16K33 は、転送されたバイト列を解釈して表示RAM・点滅・輝度を保持します。
+  転送にかかる時間はバスの周波数から見積もります
+- ボタン (GP18/GP19) とロータリーエンコーダーは、フレーム番号を指定したスクリプトで操作します。
+  keypad.Keys はフレームの入力を反映した時点でピンをスキャンしてイベントを溜めます
+- 時刻 (supervisor.ticks_ms) は仮想時刻で、1フレームごとに一定時間だけ進みます。
+  実際の待機は発生しないため、実時間よりはるかに速く実行できます
+
+使い方 (他のモジュールより先に install() を呼び出すこと):
+    from host import simulator
+    hardware = simulator.install(script="A@100,+1@200")
+    from games.device_manager import DeviceManager
+"""
+
+import sys
+import types
+
+# HT16K33 のコマンド
+_HT16K33_RAM_SIZE = 16
+_HT16K33_SYSTEM_SETUP = 0x20
+_HT16K33_DISPLAY_SETUP = 0x80
+_HT16K33_DIMMING = 0xE0
+
+# 7セグメントのパターンから文字への逆引き表 (adafruit_ht16k33.segments.NUMBERS と同じ並び)
+_SEGMENT_CHARS = "0123456789abCdEFGHIJ-L-noPqRStUv--y--"
+_SEGMENT_DIGIT_POSITIONS = (0, 2, 6, 8)  # 表示RAM上の各桁の位置
+_SEGMENT_COLON_POSITION = 4
+
+_MATRIX_CHARS = ".RGY"  # LED_OFF / LED_RED / LED_GREEN / LED_YELLOW
+
+
+class VirtualClock:
+    """シミュレーター用の仮想時刻 (ミリ秒)"""
+
+    def __init__(self, start_ms=0):
+        self.ms = start_ms
+
+    def ticks_ms(self):
+        return self.ms & ((1 << 29) - 1)
+
+    def advance(self, ms):
+        self.ms += ms
+
+
+class SimHT16K33:
+    """I2Cバス上のHT16K33 1台分 (表示RAM・点滅・輝度) のシミュレーション"""
+
+    def __init__(self):
+        self.ram = bytearray(_HT16K33_RAM_SIZE)
+        self.oscillator_on = False
+        self.display_on = False
+        self.blink_rate = 0
+        self.brightness = 15
+
+    def write(self, data):
+        """I2Cで受信したバイト列を解釈する"""
+        command = data[0]
+        if command < _HT16K33_RAM_SIZE:
+            # 表示RAMへの書き込み (アドレスは自動インクリメント)
+            for offset, value in enumerate(data[1:]):
+                self.ram[(command + offset) % _HT16K33_RAM_SIZE] = value
+        elif command & 0xF0 == _HT16K33_SYSTEM_SETUP:
+            self.oscillator_on = bool(command & 0x01)
+        elif command & 0xF0 == _HT16K33_DISPLAY_SETUP:
+            self.display_on = bool(command & 0x01)
+            self.blink_rate = (command >> 1) & 0x03
+        elif command & 0xF0 == _HT16K33_DIMMING:
+            self.brightness = command & 0x0F
+
+
+class SimI2C:
+    """
+    busio.I2C のシミュレーション
+
+    接続されたHT16K33への書き込みを解釈し、トランザクション数と転送バイト数を記録します。
+    バスの周波数から転送にかかる時間も見積もり、busy_ns に積算します。
+    """
+
+    def __init__(self, scl=None, sda=None, *, frequency=100000, addresses=(0x70,)):
+        self.scl = scl
+        self.sda = sda
+        self.frequency = frequency
+        self.devices = {address: SimHT16K33() for address in addresses}
+        self.transactions = 0
+        self.bytes_written = 0
+        self.busy_ns = 0  # 転送にかかった時間の見積もりの合計 (ナノ秒)
+        self._locked = False
+
+    def _transfer(self, nbytes):
+        """トランザクション1回分を記録する (アドレス + データの各バイトに9ビット、開始/停止条件に2ビット)"""
+        self.transactions += 1
+        self.bytes_written += nbytes
+        self.busy_ns += ((nbytes + 1) * 9 + 2) * 1000000000 // self.frequency
+
+    def try_lock(self):
+        if self._locked:
+            return False
+        self._locked = True
+        return True
+
+    def unlock(self):
+        self._locked = False
+
+    def scan(self):
+        return list(self.devices)
+
+    def writeto(self, address, buffer, *, start=0, end=None):
+        device = self.devices.get(address)
+        if device is None:
+            raise OSError(19, "No such device")
+        if end is None:
+            end = len(buffer)
+        data = bytes(buffer[start:end])
+        self._transfer(len(data))
+        if data:
+            device.write(data)
+
+    def readfrom_into(self, address, buffer, *, start=0, end=None):
+        if address not in self.devices:
+            raise OSError(19, "No such device")
+        self._transfer(0)
+
+    def deinit(self):
+        pass
+
+
+class SimPin:
+    """digitalio.DigitalInOut のシミュレーション (入力ピン、プルアップ時は未押下でTrue)"""
+
+    def __init__(self, pin=None):
+        self.pin = pin
+        self.direction = None
+        self.pull = None
+        self.value = True
+
+    def switch_to_input(self, pull=None):
+        self.pull = pull
+
+    def deinit(self):
+        pass
+
+
+class SimKeyEvent:
+    """keypad.Event のシミュレーション"""
+
+    def __init__(self, key_number=0, pressed=True, timestamp=None):
+        self.key_number = key_number
+        self.pressed = pressed
+        self.timestamp = timestamp
+
+    @property
+    def released(self):
+        return not self.pressed
+
+
+class SimEventQueue:
+    """keypad.EventQueue のシミュレーション"""
+
+    def __init__(self, max_events):
+        self._events = []  # (キー番号, 押下かどうか, タイムスタンプ)
+        self._max_events = max_events
+        self.overflowed = False
+
+    def get_into(self, event):
+        if not self._events:
+            return False
+        event.key_number, event.pressed, event.timestamp = self._events.pop(0)
+        return True
+
+    def clear(self):
+        self._events.clear()
+        self.overflowed = False
+
+    def __len__(self):
+        return len(self._events)
+
+    def put(self, key_number, pressed, timestamp):
+        if len(self._events) >= self._max_events:
+            self.overflowed = True
+            return
+        self._events.append((key_number, pressed, timestamp))
+
+
+class SimKeys:
+    """
+    keypad.Keys のシミュレーション
+
+    実機ではバックグラウンドでスキャンされますが、シミュレーターではフレームの入力を
+    ピンに反映した時点 (SimHardware.apply_inputs()) で scan() が呼ばれます。
+    """
+
+    def __init__(
+        self, hardware, pins, *, value_when_pressed, pull=True, interval=0.02, max_events=64
+    ):
+        # ピンは SimPin として登録し、操作スクリプトの入力が反映されるようにする
+        self._pins = [hardware.create_pin(pin) for pin in pins]
+        self._clock = hardware.clock
+        self._value_when_pressed = value_when_pressed
+        self._pressed = [False] * len(pins)
+        self.events = SimEventQueue(max_events)
+
+    @property
+    def key_count(self):
+        return len(self._pins)
+
+    def scan(self):
+        """ピンの状態を読み取り、変化をイベントとしてキューに追加する"""
+        for key_number, pin in enumerate(self._pins):
+            pressed = pin.value == self._value_when_pressed
+            if pressed != self._pressed[key_number]:
+                self._pressed[key_number] = pressed
+                self.events.put(key_number, pressed, self._clock.ticks_ms())
+
+    def reset(self):
+        """全キーを離した状態に戻す (押されているキーは次のスキャンで押下として報告される)"""
+        self._pressed = [False] * len(self._pins)
+        self.scan()
+
+    def deinit(self):
+        pass
+
+
+class SimEncoder:
+    """rotaryio.IncrementalEncoder のシミュレーション"""
+
+    def __init__(self, pin_a=None, pin_b=None, divisor=4):
+        self.pin_a = pin_a
+        self.pin_b = pin_b
+        self.divisor = divisor
+        self.position = 0
+
+    def deinit(self):
+        pass
+
+
+class InputScript:
+    """
+    ボタンとエンコーダーの操作スクリプト
+
+    カンマ区切りのイベントをフレーム番号付きで記述します:
+        A@100      100フレーム目からAボタンを押す (既定で5フレーム押し続ける)
+        B@150:40   150フレーム目からBボタンを40フレーム押し続ける
+        AB@200     200フレーム目からA/Bボタンを同時に押す
+        +1@300     300フレーム目にエンコーダーを時計回りに1クリック回す
+        -2@320     320フレーム目にエンコーダーを反時計回りに2クリック回す
+    """
+
+    DEFAULT_HOLD_FRAMES = 5
+
+    def __init__(self, text=""):
+        self._holds = []  # (開始フレーム, 終了フレーム, ボタン名)
+        self._rotations = {}  # フレーム番号 -> エンコーダーの回転量
+        for token in text.split(","):
+            token = token.strip()
+            if token:
+                self._parse(token)
+
+    def _parse(self, token):
+        action, _, timing = token.partition("@")
+        if not timing:
+            raise ValueError(f"Invalid script event: {token}")
+        frame_text, _, hold_text = timing.partition(":")
+        frame = int(frame_text)
+
+        if action[0] in "+-":
+            self._rotations[frame] = self._rotations.get(frame, 0) + int(action)
+            return
+
+        hold = int(hold_text) if hold_text else self.DEFAULT_HOLD_FRAMES
+        for button in action.upper():
+            if button not in "AB":
+                raise ValueError(f"Unknown button in script event: {token}")
+            self._holds.append((frame, frame + hold, button))
+
+    def is_pressed(self, button, frame):
+        """指定フレームでボタンが押されているかどうか"""
+        for start, end, name in self._holds:
+            if name == button and start <= frame < end:
+                return True
+        return False
+
+    def rotation(self, frame):
+        """指定フレームでのエンコーダーの回転量"""
+        return self._rotations.get(frame, 0)
+
+    @property
+    def last_frame(self):
+        """スクリプトの最後のイベントが終わるフレーム番号"""
+        frames = [end for _, end, _ in self._holds] + list(self._rotations)
+        return max(frames) if frames else 0
+
+
+class SimHardware:
+    """シミュレーター全体の状態 (仮想時刻・バス・ピン・エンコーダー・操作スクリプト)"""
+
+    def __init__(self, frame_ms=20, script="", max_frames=None):
+        """
+        Args:
+            frame_ms (int): 1フレームで進める仮想時間 (ミリ秒)
+            script (str): 操作スクリプト (InputScript の書式)
+            max_frames (int or None): このフレーム数に達したら KeyboardInterrupt で
+                メインループを終了させる (Noneなら終了しない)
+        """
+        self.clock = VirtualClock()
+        self.frame_ms = frame_ms
+        self.script = InputScript(script)
+        self.max_frames = max_frames
+        self.frame = 0
+        self.buses = []
+        self.pins = {}  # ピン名 -> SimPin
+        self.encoders = []
+        self.keys = []  # SimKeys
+        self.frame_callbacks = []  # 各フレームの終わりに呼び出す関数 (引数はフレーム番号)
+
+    def create_i2c(self, scl=None, sda=None, *, frequency=100000):
+        bus = SimI2C(scl, sda, frequency=frequency)
+        self.buses.append(bus)
+        return bus
+
+    def create_pin(self, pin):
+        sim_pin = SimPin(pin)
+        self.pins[pin] = sim_pin
+        return sim_pin
+
+    def create_keys(self, pins, **kwargs):
+        keys = SimKeys(self, pins, **kwargs)
+        self.keys.append(keys)
+        return keys
+
+    def create_encoder(self, pin_a, pin_b, divisor=4):
+        encoder = SimEncoder(pin_a, pin_b, divisor)
+        self.encoders.append(encoder)
+        return encoder
+
+    def apply_inputs(self):
+        """現在のフレームの操作スクリプトをピンとエンコーダーに反映する"""
+        for button, pin_name in (("A", "GP18"), ("B", "GP19")):
+            pin = self.pins.get(pin_name)
+            if pin is not None:
+                pin.value = not self.script.is_pressed(button, self.frame)
+        for keys in self.keys:
+            keys.scan()
+        rotation = self.script.rotation(self.frame)
+        if rotation:
+            for encoder in self.encoders:
+                encoder.position += rotation
+
+    def next_frame(self):
+        """仮想時刻を1フレーム分進め、次のフレームの入力を反映する"""
+        for callback in self.frame_callbacks:
+            callback(self.frame)
+        self.clock.advance(self.frame_ms)
+        self.frame += 1
+        self.apply_inputs()
+        if self.max_frames is not None and self.frame >= self.max_frames:
+            raise KeyboardInterrupt
+
+
+_hardware = None
+
+
+def hardware():
+    """install() で作成したシミュレーターの状態を返す"""
+    return _hardware
+
+
+def _module(name, **attributes):
+    module = types.ModuleType(name)
+    for key, value in attributes.items():
+        setattr(module, key, value)
+    return module
+
+
+def install(frame_ms=20, script="", max_frames=None):
+    """
+    CircuitPython のハードウェアモジュールをシミュレーションに差し替える
+
+    games / adafruit_* のモジュールをインポートする前に呼び出してください。
+
+    Args:
+        frame_ms (int): 1フレームで進める仮想時間 (ミリ秒)
+        script (str): 操作スクリプト (InputScript の書式)
+        max_frames (int or None): このフレーム数に達したらメインループを終了させる
+
+    Returns:
+        SimHardware: シミュレーターの状態
+    """
+    global _hardware
+    sim = SimHardware(frame_ms, script, max_frames)
+    _hardware = sim
+
+    pins = {f"GP{n}": f"GP{n}" for n in range(29)}
+    sys.modules["board"] = _module("board", **pins)
+    sys.modules["busio"] = _module("busio", I2C=sim.create_i2c)
+    sys.modules["digitalio"] = _module(
+        "digitalio",
+        DigitalInOut=sim.create_pin,
+        Direction=_module("Direction", INPUT="INPUT", OUTPUT="OUTPUT"),
+        Pull=_module("Pull", UP="UP", DOWN="DOWN"),
+    )
+    sys.modules["keypad"] = _module("keypad", Keys=sim.create_keys, Event=SimKeyEvent)
+    sys.modules["rotaryio"] = _module(
+        "rotaryio", IncrementalEncoder=sim.create_encoder
+    )
+    sys.modules["supervisor"] = _module("supervisor", ticks_ms=sim.clock.ticks_ms)
+    return sim
+
+
+def format_matrix(ram):
+    """LEDマトリクスの表示RAMを8行の文字列にする (. = 消灯, R/G/Y = 赤/緑/黄)"""
+    lines = []
+    for y in range(8):
+        bit = 1 << y
+        line = ""
+        for x in range(8):
+            green = 2 if ram[2 * x] & bit else 0
+            red = 1 if ram[2 * x + 1] & bit else 0
+            line += _MATRIX_CHARS[green | red]
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def format_segments(ram):
+    """7セグメントディスプレイの表示RAMを文字列にする (表示できないパターンは ?)"""
+    text = ""
+    for index, position in enumerate(_SEGMENT_DIGIT_POSITIONS):
+        if index == 2 and ram[_SEGMENT_COLON_POSITION] & 0x02:
+            text += ":"
+        pattern = ram[position]
+        segments = pattern & 0x7F
+        if segments == 0:
+            text += " "
+        else:
+            text += _segment_lookup().get(segments, "?")
+        if pattern & 0x80:
+            text += "."
+    return text
+
+
+_segment_table = None
+
+
+def _segment_lookup():
+    """7セグメントのパターン -> 文字 の表 (adafruit_ht16k33 は install() 後に読み込む)"""
+    global _segment_table
+    if _segment_table is None:
+        from adafruit_ht16k33.segments import NUMBERS
+
+        _segment_table = {}
+        # 同じパターンの文字は数字を優先する (5 と S など)
+        for index in reversed(range(len(NUMBERS))):
+            _segment_table[NUMBERS[index]] = _SEGMENT_CHARS[index]
+    return _segment_table
@@ -0,0 +1,309 @@
+"""
+複数のシードでゲームを並列にシミュレーションし、結果をCSVに集計する (ホストシミュレーター上で実行)
+
+ゲームの調整用の定数 (JumpRunnerGame.WALL_SPAWN_CHANCE など) を変えながら
+多数のプレイを実行するためのツールです。1回のプレイ (セッション) は、指定したゲームを
+ゲームオーバーになるか最大フレーム数に達するまで操作ポリシーの入力で実行し、
+得点・フレーム数・update() 1回あたりの所要時間を記録します。
+セッションは multiprocessing のプロセスプールで全CPUコアに分散して実行します。
+
+使い方 (リポジトリのルートで実行):
+    python -m host.sweep --game games.jump_runner --seeds 0:1000 --policy random \\
+        --set WALL_SPAWN_CHANCE=0.1,0.2,0.3 --out sweep.csv
+    python -m host.sweep --game games.jump_runner --seeds 0:1000 \
+        --set SPEEDUP_PERCENT=100,108,115 --set WALL_SPAWN_CHANCE=0.1,0.3
+
+--set を複数指定すると、値のすべての組み合わせ (グリッド) を実行します。
+--set の属性名はゲームクラスに定義されているものに限ります (無い名前はエラーになります)。
+"""
+
+import argparse
+import ast
+import csv
+import itertools
+import multiprocessing
+import random
+import sys
+import time
+
+from host import simulator
+from host.benchmark import GameBenchmark, percentile, default_script
+
+DEFAULT_FRAMES = 15000  # 1セッションの最大フレーム数 (5分)
+
+CSV_FIELDS = (
+    "game",
+    "seed",
+    "policy",
+    "overrides",
+    "score",
+    "frames",
+    "game_over",
+    "mean_us",
+    "p99_us",
+    "max_us",
+)
+
+
+def _random_script(frames, seed):
+    """0.2〜1.5秒おきにA/Bボタン (まれに同時押し) をランダムな長さで押す操作スクリプト"""
+    rng = random.Random(seed)
+    events = []
+    frame = rng.randint(10, 75)
+    while frame < frames:
+        button = rng.choice(("A", "A", "B", "B", "AB"))
+        events.append(f"{button}@{frame}:{rng.randint(2, 20)}")
+        frame += rng.randint(10, 75)
+    return ",".join(events)
+
+
+# 操作ポリシー: 名前 -> (フレーム数, シード) から操作スクリプトを作る関数
+POLICIES = {
+    "idle": lambda frames, seed: "",
+    "script": lambda frames, seed: default_script(frames),
+    "random": _random_script,
+}
+
+
+def session_score(game):
+    """ゲームごとの得点 (7セグメントディスプレイに表示する値) を返す (得点の無いゲームは0)"""
+    if hasattr(game, "score"):
+        return game.score
+    if hasattr(game, "max_stage_reached"):
+        return game.max_stage_reached
+    if hasattr(game, "dot_count"):
+        return game.dot_count - 1
+    return 0
+
+
+def is_game_over(game):
+    """ゲームオーバーになったかどうか (ゲームオーバーの無いゲームは常にFalse)"""
+    if getattr(game, "state", None) == "game_over":
+        return True
+    return getattr(game, "is_running", True) is False
+
+
+class _SessionOver(Exception):
+    """ゲームオーバーでセッションを打ち切る"""
+
+
+# ワーカープロセスごとの状態 (_init_worker で作成する)
+_worker = {}
+
+
+def _init_worker():
+    """
+    ワーカープロセスでシミュレーターとゲームの一覧を準備する
+
+    check_overrides() で準備済みの状態を fork で引き継いだ場合は何もしない
+    (作り直すと、インポート済みのゲームが古いシミュレーターを参照したままになるため)
+    """
+    if _worker:
+        return
+    hardware = simulator.install()
+
+    from host.run import load_code_module
+
+    code = load_code_module()
+    hardware.frame_ms = 1000 // code.FPS
+    _worker["hardware"] = hardware
+    _worker["fps"] = code.FPS
+    _worker["entries"] = {
+        entry.module_path: (index, entry) for index, entry in enumerate(code.GAME_LIST)
+    }
+
+
+def run_session(task):
+    """
+    1セッションを実行する (ワーカープロセスで呼び出される)
+
+    Args:
+        task (tuple): (ゲームのモジュールパス, シード, 操作ポリシー名, 上書きする属性, 最大フレーム数)
+
+    Returns:
+        dict: CSVの1行分の結果
+    """
+    module_path, seed, policy, overrides, frames = task
+    hardware = _worker["hardware"]
+    game_index, entry = _worker["entries"][module_path]
+    hardware.script = simulator.InputScript(POLICIES[policy](frames, seed))
+
+    times = []
+    state = {"game": None}
+
+    def timed_update(game, devices, dt):
+        start = time.perf_counter_ns()
+        game.update(dt)
+        times.append(time.perf_counter_ns() - start)
+        state["game"] = game
+        if is_game_over(game):
+            raise _SessionOver
+
+    # シードはGameManagerと同じく seed + ゲームのインデックスになる
+    benchmark = GameBenchmark(hardware, _worker["fps"], seed)
+    game_over = False
+    try:
+        benchmark.run_game(entry, game_index, frames, timed_update, overrides)
+    except _SessionOver:
+        game_over = True
+
+    times.sort()
+    return {
+        "game": module_path,
+        "seed": seed,
+        "policy": policy,
+        "overrides": ";".join(f"{k}={v!r}" for k, v in sorted(overrides.items())),
+        "score": session_score(state["game"]),
+        "frames": len(times),
+        "game_over": int(game_over),
+        "mean_us": round(sum(times) / len(times) / 1000, 2),
+        "p99_us": round(percentile(times, 99) / 1000, 2),
+        "max_us": round(times[-1] / 1000, 2),
+    }
+
+
+def parse_seeds(text):
+    """シードの指定 ("0:1000" なら 0〜999、"1,5,9" なら列挙) をリストにする"""
+    if ":" in text:
+        start, _, end = text.partition(":")
+        return list(range(int(start), int(end)))
+    return [int(seed) for seed in text.split(",")]
+
+
+def parse_overrides(settings):
+    """
+    --set の指定 ("NAME=v1,v2" のリスト) から、上書きする属性の全組み合わせを作る
+
+    Returns:
+        list: 属性名 -> 値 の辞書のリスト (--set が無ければ空の辞書1つ)
+    """
+    names = []
+    choices = []
+    for setting in settings or ():
+        name, _, values = setting.partition("=")
+        if not values:
+            raise ValueError(f"Invalid --set: {setting}")
+        names.append(name.strip())
+        choices.append([ast.literal_eval(value.strip()) for value in values.split(",")])
+    return [dict(zip(names, values)) for values in itertools.product(*choices)]
+
+
+def check_overrides(games, override_sets):
+    """
+    --set の属性名がすべてのゲームクラスに定義されているか確認する
+
+    定義されていない名前を上書きしてもゲームからは参照されず、
+    値を変えても結果が変わらないため、実行前にエラーにします。
+
+    Returns:
+        str or None: エラーメッセージ (問題が無ければNone)
+    """
+    _init_worker()
+    for module_path in games:
+        if module_path not in _worker["entries"]:
+            return f"unknown game: {module_path}"
+        game_class = _worker["entries"][module_path][1].load()
+        for name in override_sets[0]:
+            if not hasattr(game_class, name):
+                return f"{game_class.__name__} has no attribute {name!r} (--set {name}=...)"
+    return None
+
+
+def run(games, seeds, policy, override_sets, frames, jobs=None):
+    """
+    全セッションを並列に実行する
+
+    Args:
+        games (list): ゲームのモジュールパス
+        seeds (list): シード
+        policy (str): 操作ポリシー名 (POLICIES のキー)
+        override_sets (list): 上書きする属性の辞書のリスト
+        frames (int): 1セッションの最大フレーム数
+        jobs (int or None): ワーカープロセス数 (NoneならCPUコア数)
+
+    Yields:
+        dict: 終了したセッションの結果 (終了した順)
+    """
+    tasks = [
+        (module_path, seed, policy, overrides, frames)
+        for module_path in games
+        for overrides in override_sets
+        for seed in seeds
+    ]
+    with multiprocessing.Pool(jobs, initializer=_init_worker) as pool:
+        yield from pool.imap_unordered(run_session, tasks, chunksize=4)
+
+
+def summarize(rows):
+    """ゲームと上書きした属性の組み合わせごとの平均を表示する"""
+    groups = {}
+    for row in rows:
+        groups.setdefault((row["game"], row["overrides"]), []).append(row)
+    print(
+        f"{'game':<22}{'overrides':<32}{'runs':>6}{'score':>8}"
+        f"{'frames':>9}{'over%':>7}{'mean[us]':>10}"
+    )
+    for (game, overrides), group in sorted(groups.items()):
+        count = len(group)
+        print(
+            f"{game:<22}{overrides or '-':<32}{count:>6}"
+            f"{sum(row['score'] for row in group) / count:>8.2f}"
+            f"{sum(row['frames'] for row in group) / count:>9.0f}"
+            f"{100 * sum(row['game_over'] for row in group) / count:>7.1f}"
+            f"{sum(row['mean_us'] for row in group) / count:>10.1f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run many seeded game sessions in parallel and write a CSV"
+    )
+    parser.add_argument(
+        "--game", action="append", required=True, help="module path (repeatable)"
+    )
+    parser.add_argument(
+        "--seeds", default="0:100", help='seed range "START:END" or list "1,2,3"'
+    )
+    parser.add_argument(
+        "--policy", default="random", choices=sorted(POLICIES), help="input policy"
+    )
+    parser.add_argument(
+        "--set",
+        action="append",
+        help="override a game class attribute, e.g. SPEEDUP_PERCENT=100,110 (repeatable)",
+    )
+    parser.add_argument(
+        "--frames", type=int, default=DEFAULT_FRAMES, help="max frames per session"
+    )
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes")
+    parser.add_argument("--out", default="sweep.csv", help="output CSV file")
+    args = parser.parse_args()
+
+    seeds = parse_seeds(args.seeds)
+    override_sets = parse_overrides(args.set)
+    error = check_overrides(args.game, override_sets)
+    if error:
+        parser.error(error)
+    total = len(args.game) * len(seeds) * len(override_sets)
+
+    start = time.perf_counter()
+    rows = []
+    with open(args.out, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+        for row in run(
+            args.game, seeds, args.policy, override_sets, args.frames, args.jobs
+        ):
+            writer.writerow(row)
+            rows.append(row)
+            print(f"\r{len(rows)}/{total} sessions", end="", file=sys.stderr)
+    print(file=sys.stderr)
+
+    summarize(rows)
+    print(
+        f"{total} sessions in {time.perf_counter() - start:.1f} s, saved to {args.out}"
+    )
+
+
+if __name__ == "__main__":
+    main()